@@ -3,34 +3,48 @@
 """
 生成包含所有题目的JavaScript代码
 用于更新预览页面
+
+用法：
+    python generate_questions_js.py                       # 默认题库（v1，zh-CN）
+    python generate_questions_js.py --version v1 --locale en
 """
 
-from holland_test.questions import QUESTIONS
-
-def generate_questions_js():
-    """生成JavaScript题目数组"""
-    js_code = "        const allQuestions = [\n"
-    
-    for q in QUESTIONS:
-        # 转义JavaScript字符串中的特殊字符
-        text = q.text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
-        js_code += f'            {{id: {q.id}, text: "{text}", type: "{q.type}"}},\n'
-    
-    js_code += "        ];\n"
-    
-    return js_code
+import argparse
+import json
 
-if __name__ == "__main__":
-    print("// 自动生成的题目数据 - 共120题")
-    print(generate_questions_js())
-    print("\n// 题目类型映射")
-    print("        const questionTypes = {")
-    print('            "R": "现实型 (Realistic)",')
-    print('            "I": "研究型 (Investigative)",')
-    print('            "A": "艺术型 (Artistic)",')
-    print('            "S": "社会型 (Social)",')
-    print('            "E": "企业型 (Enterprising)",')
-    print('            "C": "常规型 (Conventional)"')
-    print("        };")
+from holland_test.questions import DEFAULT_BANK_VERSION, DEFAULT_LOCALE, load_question_bank
+
+
+def generate_questions_js(bank):
+    """生成JavaScript题目数组（字符串由 json.dumps 转义）"""
+    lines = ["        const allQuestions = ["]
+    for q in bank.questions:
+        lines.append(f"            {{id: {q.id}, text: {json.dumps(q.text, ensure_ascii=False)}, type: \"{q.type}\"}},")
+    lines.append("        ];")
+    return "\n".join(lines) + "\n"
 
 
+def generate_types_js(bank):
+    """生成JavaScript题目类型映射"""
+    lines = ["        const questionTypes = {"]
+    entries = [f"            \"{code}\": {json.dumps(bank.type_names[code], ensure_ascii=False)}"
+               for code in bank.type_codes]
+    lines.append(",\n".join(entries))
+    lines.append("        };")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成预览页面的题目数据")
+    parser.add_argument("--version", default=DEFAULT_BANK_VERSION, help="题库版本")
+    parser.add_argument("--locale", default=DEFAULT_LOCALE, help="题库语言")
+    args = parser.parse_args()
+
+    try:
+        bank = load_question_bank(args.version, args.locale)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"// 自动生成的题目数据 - 共{len(bank)}题（题库 {bank.label}/{bank.locale}，版本 {bank.version}）")
+    print(generate_questions_js(bank))
+    print("\n// 题目类型映射")
+    print(generate_types_js(bank))
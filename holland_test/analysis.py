@@ -1,280 +1,283 @@
 """霍兰德职业兴趣测试结果分析和职业建议 - 专业版"""
 
-from typing import Dict, List, Tuple
+import json
+import os
+from itertools import permutations
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
 
+from .hexagon import hexagon_distance, hexagon_distance_matrix
 from .questions import HOLLAND_TYPES
-from .scorer import TestResult
-
-# 职业建议库（更全面的职业列表）
-CAREER_SUGGESTIONS: Dict[str, List[str]] = {
-    "R": [
-        "机械工程师", "电气工程师", "土木工程师", "建筑工程师",
-        "汽车工程师", "航空工程师", "制造工程师", "工艺工程师",
-        "技术员", "机械师", "电工", "木匠", "焊工", "装配工",
-        "建筑师", "室内设计师", "景观设计师",
-        "农民", "园艺师", "养殖员", "飞行员", "驾驶员",
-        "消防员", "警察", "运动员", "健身教练",
-        "质量检验员", "设备维护工程师",
-    ],
-    "I": [
-        "科学家（物理、化学、生物、数学等）", "研究员", "研发工程师",
-        "数学家", "统计学家", "精算师", "数据科学家",
-        "医生", "药剂师", "生物学家", "化学家", "物理学家",
-        "计算机科学家", "软件工程师（研发方向）", "算法工程师",
-        "数据分析师", "商业分析师", "市场研究员",
-        "实验室技术员", "质量工程师",
-        "经济学家", "心理学家", "社会学家", "人类学家",
-        "工程师（研发方向）", "专利工程师",
-        "科研院所研究员", "大学教授（理工科）",
-    ],
-    "A": [
-        "艺术家", "画家", "雕塑家", "设计师（平面、UI、视觉等）",
-        "室内设计师", "服装设计师", "工业设计师", "产品设计师",
-        "音乐家", "作曲家", "音乐制作人", "DJ",
-        "作家", "编剧", "文案策划", "编辑",
-        "摄影师", "摄像师", "导演", "演员", "主持人",
-        "广告创意总监", "艺术指导", "创意总监",
-        "建筑师（设计方向）", "景观设计师",
-        "舞蹈家", "编舞", "艺术教师", "美术指导",
-        "插画师", "动画师", "游戏设计师",
-    ],
-    "S": [
-        "教师", "大学教授", "培训师", "教育顾问",
-        "心理咨询师", "心理治疗师", "职业生涯规划师",
-        "社会工作者", "社区工作者", "社工",
-        "医生", "护士", "康复师", "理疗师", "营养师",
-        "人力资源", "HR", "招聘专员", "员工关系专员",
-        "职业顾问", "就业指导师",
-        "宗教工作者", "牧师", "神父",
-        "志愿者协调员", "NGO工作者",
-        "销售（服务导向）", "客户服务", "客户经理",
-        "治疗师", "特殊教育教师",
-    ],
-    "E": [
-        "企业家", "创业者", "CEO", "总经理",
-        "经理", "部门经理", "区域经理", "项目经理",
-        "销售经理", "业务经理", "市场经理",
-        "市场营销", "品牌经理", "产品经理",
-        "律师", "法官", "检察官",
-        "政治家", "政府官员", "公务员（管理岗位）",
-        "金融分析师", "投资顾问", "基金经理",
-        "房地产经纪人", "保险经纪人",
-        "人力资源经理", "组织发展专员",
-        "业务开发", "BD经理",
-        "公关经理", "媒体关系专员",
-        "管理咨询师", "商业顾问",
-    ],
-    "C": [
-        "会计师", "审计师", "财务分析师", "成本会计师",
-        "税务专家", "税务顾问",
-        "银行职员", "信贷员", "风险控制专员",
-        "行政助理", "秘书", "文员",
-        "图书管理员", "档案管理员", "资料管理员",
-        "数据录入员", "统计员", "质量检查员",
-        "办公室经理", "行政经理",
-        "出纳", "收银员",
-        "物流管理员", "仓库管理员",
-        "系统管理员", "数据库管理员",
-        "法务专员", "合规专员",
-    ],
-}
+from .scorer import TYPE_CODES, TestResult
 
-# 类型特征详细描述
-TYPE_DESCRIPTIONS: Dict[str, Dict[str, str]] = {
-    "R": {
-        "name": "现实型 (Realistic)",
-        "characteristics": "实际、稳重、偏好具体的工作任务",
-        "likes": "使用工具、机器和设备，户外工作，动手操作",
-        "dislikes": "抽象的工作，与人频繁交往，理论分析",
-        "work_environment": "需要动手操作的环境，工厂、车间、户外",
-        "skills": "机械操作、工具使用、技术维修、实际解决问题的能力",
-        "values": "实用、稳定、可见的成果、技能掌握",
-    },
-    "I": {
-        "name": "研究型 (Investigative)",
-        "characteristics": "好奇、分析、独立、理性、严谨",
-        "likes": "观察、学习、研究、分析和解决问题，独立思考",
-        "dislikes": "销售或说服他人，重复性工作，社交活动",
-        "work_environment": "实验室、研究机构、学术环境、安静的工作空间",
-        "skills": "分析思维、逻辑推理、研究能力、数据处理、问题解决",
-        "values": "知识、真理、创新、学术成就、科学发现",
-    },
-    "A": {
-        "name": "艺术型 (Artistic)",
-        "characteristics": "创新、独立、情感丰富、富有想象力、敏感",
-        "likes": "自由表达、创作、艺术活动、独立工作",
-        "dislikes": "结构化的工作，严格遵循规则，重复性任务",
-        "work_environment": "灵活、创意导向的环境，工作室、创作空间",
-        "skills": "创作能力、艺术技巧、想象力、表达能力、审美能力",
-        "values": "自由、创意、自我表达、美感、独特性",
-    },
-    "S": {
-        "name": "社会型 (Social)",
-        "characteristics": "友善、合作、善解人意、乐于助人、有同理心",
-        "likes": "帮助他人、教学、照顾他人、团队合作",
-        "dislikes": "使用机器或工具，技术性工作，独自工作",
-        "work_environment": "需要人际交往的环境，学校、医院、社区",
-        "skills": "沟通能力、同理心、教学能力、咨询技巧、团队合作",
-        "values": "帮助他人、服务社会、人际关系、他人成长",
-    },
-    "E": {
-        "name": "企业型 (Enterprising)",
-        "characteristics": "自信、有野心、精力充沛、善于说服、有领导力",
-        "likes": "领导、影响他人、销售、管理、竞争",
-        "dislikes": "科学研究、细致的观察工作、重复性任务",
-        "work_environment": "需要领导和影响力的环境，办公室、会议室",
-        "skills": "领导能力、沟通说服、商业思维、组织管理、决策能力",
-        "values": "成功、权力、地位、经济利益、影响力",
-    },
-    "C": {
-        "name": "常规型 (Conventional)",
-        "characteristics": "细心、有条理、谨慎、服从、可靠",
-        "likes": "数据、记录、组织、遵循程序、稳定工作",
-        "dislikes": "不确定或非结构化的工作，创新挑战，风险",
-        "work_environment": "有序、稳定的办公室环境，标准化的工作流程",
-        "skills": "组织能力、数据处理、文件管理、细节关注、程序执行",
-        "values": "稳定、安全、秩序、准确性、可靠性",
-    },
-}
+# numpy 在首次调用批量剖面指标时导入（见 _require_numpy），只生成报告时不必承担其导入耗时
+np = None
 
-# 类型组合的职业倾向（常见组合）
-TYPE_COMBINATIONS: Dict[str, Dict[str, any]] = {
-    "RI": {
-        "name": "现实-研究型",
-        "description": "技术研究与实际应用相结合",
-        "careers": ["研发工程师", "技术专家", "产品开发", "质量工程师"],
-    },
-    "RA": {
-        "name": "现实-艺术型",
-        "description": "技术与创意相结合",
-        "careers": ["工业设计师", "建筑设计师", "产品设计师", "工艺美术师"],
-    },
-    "RS": {
-        "name": "现实-社会型",
-        "description": "技术服务于他人",
-        "careers": ["技术培训师", "康复师", "特殊教育教师", "技术支持"],
-    },
-    "RE": {
-        "name": "现实-企业型",
-        "description": "技术管理与商业结合",
-        "careers": ["技术经理", "项目经理", "生产经理", "工程承包商"],
-    },
-    "RC": {
-        "name": "现实-常规型",
-        "description": "技术操作与规范管理",
-        "careers": ["质量检验员", "设备管理员", "生产调度", "技术文档管理"],
-    },
-    "IA": {
-        "name": "研究-艺术型",
-        "description": "科学研究与创意表达",
-        "careers": ["科学作家", "科学可视化", "技术编辑", "用户体验研究员"],
-    },
-    "IS": {
-        "name": "研究-社会型",
-        "description": "科学研究服务于社会",
-        "careers": ["医生", "心理学研究员", "教育研究员", "公共卫生专家"],
-    },
-    "IE": {
-        "name": "研究-企业型",
-        "description": "研究与商业应用",
-        "careers": ["研发总监", "技术顾问", "专利代理", "技术创业"],
-    },
-    "IC": {
-        "name": "研究-常规型",
-        "description": "研究与数据管理",
-        "careers": ["数据分析师", "统计员", "质量工程师", "研究助理"],
-    },
-    "AS": {
-        "name": "艺术-社会型",
-        "description": "艺术创作服务于他人",
-        "careers": ["艺术教师", "艺术治疗师", "社区艺术工作者", "文化传播"],
-    },
-    "AE": {
-        "name": "艺术-企业型",
-        "description": "艺术与商业结合",
-        "careers": ["广告创意总监", "品牌经理", "艺术经纪人", "创意产业管理"],
-    },
-    "AC": {
-        "name": "艺术-常规型",
-        "description": "艺术与规范管理",
-        "careers": ["艺术管理", "博物馆管理员", "画廊管理员", "艺术档案管理"],
-    },
-    "SE": {
-        "name": "社会-企业型",
-        "description": "服务他人与领导管理",
-        "careers": ["人力资源经理", "培训总监", "组织发展", "非营利组织管理"],
-    },
-    "SC": {
-        "name": "社会-常规型",
-        "description": "服务与规范管理",
-        "careers": ["行政服务", "客户服务管理", "社会服务管理", "教育管理"],
-    },
-    "EC": {
-        "name": "企业-常规型",
-        "description": "商业管理与规范执行",
-        "careers": ["财务经理", "运营经理", "项目经理", "业务管理"],
-    },
-}
+# 职业建议库（CAREER_SUGGESTIONS）、类型特征描述（TYPE_DESCRIPTIONS）和常见类型组合（TYPE_COMBINATIONS）
+# 保存在 catalogs.json 中，首次访问时加载并在进程内缓存，导入本模块时不构建
+_CATALOG_PATH = os.path.join(os.path.dirname(__file__), "catalogs.json")
+_CATALOG_NAMES = ("CAREER_SUGGESTIONS", "TYPE_DESCRIPTIONS", "TYPE_COMBINATIONS")
+_CATALOGS: Optional[Dict[str, dict]] = None
+
+
+def _catalogs() -> Dict[str, dict]:
+    """加载数据文件中的全部目录（每个进程只加载一次）"""
+    global _CATALOGS
+    if _CATALOGS is None:
+        with open(_CATALOG_PATH, "r", encoding="utf-8") as f:
+            _CATALOGS = json.load(f)
+    return _CATALOGS
+
+
+def __getattr__(name: str):
+    # 模块属性 CAREER_SUGGESTIONS 等在首次访问时才从数据文件加载
+    if name in _CATALOG_NAMES:
+        return _catalogs()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_type_description(type_code: str) -> Dict[str, str]:
     """获取类型详细描述"""
-    return TYPE_DESCRIPTIONS.get(type_code, {})
+    return _catalogs()["TYPE_DESCRIPTIONS"].get(type_code, {})
 
 
 def get_career_suggestions(type_code: str) -> List[str]:
     """获取职业建议"""
-    return CAREER_SUGGESTIONS.get(type_code, [])
+    return _catalogs()["CAREER_SUGGESTIONS"].get(type_code, [])
 
 
-def analyze_career_tendency(result: TestResult) -> Dict[str, any]:
+def get_type_combination(combination: str) -> Optional[Dict[str, object]]:
+    """获取常见类型组合（两字母代码，如 "RI"）的名称、描述和职业，不在目录中时返回 None"""
+    return _catalogs()["TYPE_COMBINATIONS"].get(combination)
+
+
+class CareerRecommendations(NamedTuple):
+    """某一三字母类型代码的推荐职业列表（与报告中显示的条目一致）"""
+    primary: Tuple[str, ...]            # 主要类型的相关职业（前15项）
+    secondary: Tuple[str, ...]          # 次要类型的相关职业（前10项）
+    combined: Tuple[str, ...]           # 三个类型的职业合并去重后排序（前20项）
+    primary_secondary: Tuple[str, ...]  # 主要、次要类型的职业合并去重后排序（前10项）
+
+
+# 推荐职业表：三字母类型代码（共 6×5×4 = 120 种）-> CareerRecommendations，首次使用时整体构建
+_CAREER_TABLE: Optional[Mapping[str, CareerRecommendations]] = None
+
+
+def _build_career_recommendations(type_combination: str) -> CareerRecommendations:
+    """计算一个类型代码的推荐职业"""
+    primary, secondary, tertiary = type_combination
+    primary_careers = get_career_suggestions(primary)
+    secondary_careers = get_career_suggestions(secondary)
+    return CareerRecommendations(
+        primary=tuple(primary_careers[:15]),
+        secondary=tuple(secondary_careers[:10]),
+        combined=tuple(sorted({*primary_careers, *secondary_careers,
+                               *get_career_suggestions(tertiary)})[:20]),
+        primary_secondary=tuple(sorted({*primary_careers, *secondary_careers})[:10]),
+    )
+
+
+def get_career_table() -> Mapping[str, CareerRecommendations]:
+    """全部120种类型代码的推荐职业表（只读）"""
+    global _CAREER_TABLE
+    if _CAREER_TABLE is None:
+        _CAREER_TABLE = MappingProxyType({
+            "".join(code): _build_career_recommendations("".join(code))
+            for code in permutations(HOLLAND_TYPES, 3)
+        })
+    return _CAREER_TABLE
+
+
+def get_career_recommendations(type_combination: str) -> CareerRecommendations:
     """
-    分析职业倾向
+    查找类型代码的推荐职业（O(1)）
     
     Args:
-        result: 测试结果
+        type_combination: 三字母类型代码，如 "RIA"
         
     Returns:
-        职业倾向分析结果
+        推荐职业列表；含重复字母等不在表中的代码按需计算
     """
-    tendency = {
-        "dominant_type": result.primary_type,
-        "supporting_types": [result.secondary_type, result.tertiary_type],
-        "strength_level": {},
-        "work_style": "",
-        "team_preference": "",
-    }
-    
-    # 判断强度水平
-    for type_code, percentage in result.percentages.items():
-        if percentage >= 70:
-            tendency["strength_level"][type_code] = "很强"
-        elif percentage >= 50:
-            tendency["strength_level"][type_code] = "较强"
-        elif percentage >= 30:
-            tendency["strength_level"][type_code] = "中等"
-        else:
-            tendency["strength_level"][type_code] = "较弱"
+    recommendations = get_career_table().get(type_combination)
+    if recommendations is None:
+        recommendations = _build_career_recommendations(type_combination)
+    return recommendations
+
+
+# 各类型对应的行业领域
+INDUSTRY_MAPPING: Dict[str, List[str]] = {
+    "R": ["制造业", "建筑业", "交通运输", "能源", "农业", "技术服务业"],
+    "I": ["科研院所", "高等教育", "医药研发", "信息技术", "咨询研究"],
+    "A": ["文化创意", "广告传媒", "设计", "艺术", "娱乐", "出版"],
+    "S": ["教育", "医疗健康", "社会服务", "心理咨询", "人力资源"],
+    "E": ["商业管理", "金融投资", "销售贸易", "法律", "创业", "政府管理"],
+    "C": ["金融服务", "会计审计", "行政服务", "物流", "信息管理"],
+}
+
+# 百分比分档（≥70、≥50、≥30、其余）及对应的强度等级
+STRENGTH_LEVELS: Tuple[str, ...] = ("很强", "较强", "中等", "较弱")
+
+
+def percentage_band(percentage: float) -> int:
+    """百分比所在的分档：0 表示≥70，1 表示≥50，2 表示≥30，3 表示其余"""
+    if percentage >= 70:
+        return 0
+    elif percentage >= 50:
+        return 1
+    elif percentage >= 30:
+        return 2
+    return 3
+
+
+class AnalysisEntry(NamedTuple):
+    """某一 (主要类型, 次要类型, 主要类型百分比分档) 组合的预计算分析结果"""
+    work_style: str
+    team_preference: str
+    primary_positioning: str
+    suitable_industries: Tuple[str, ...]
+    career_level: str
+    immediate_actions: Tuple[str, ...]
+    skill_development: Tuple[str, ...]
+    career_path: Tuple[str, ...]
+    workplace_advice: Tuple[str, ...]
+
+
+# 分析结果查找表：(主要类型, 次要类型, 分档) -> AnalysisEntry，首次使用时填充
+_ANALYSIS_TABLE: Dict[Tuple[str, str, int], AnalysisEntry] = {}
+
+
+def _build_analysis_entry(primary: str, secondary: str, band: int) -> AnalysisEntry:
+    """计算一个组合的分析结果"""
+    primary_desc = _catalogs()["TYPE_DESCRIPTIONS"][primary]
     
     # 判断工作风格
-    if result.primary_type in ["R", "I", "A"]:
-        tendency["work_style"] = "更适合独立工作或小团队协作"
-    elif result.primary_type in ["S", "E"]:
-        tendency["work_style"] = "更适合团队合作和人际交往"
+    if primary in ["R", "I", "A"]:
+        work_style = "更适合独立工作或小团队协作"
+    elif primary in ["S", "E"]:
+        work_style = "更适合团队合作和人际交往"
     else:
-        tendency["work_style"] = "更适合规范化的工作环境"
+        work_style = "更适合规范化的工作环境"
     
     # 判断团队偏好
-    if result.primary_type == "S":
-        tendency["team_preference"] = "喜欢团队合作，擅长协调人际关系"
-    elif result.primary_type == "E":
-        tendency["team_preference"] = "喜欢领导团队，擅长管理和组织"
-    elif result.primary_type in ["R", "I"]:
-        tendency["team_preference"] = "可以独立工作，也能参与团队项目"
+    if primary == "S":
+        team_preference = "喜欢团队合作，擅长协调人际关系"
+    elif primary == "E":
+        team_preference = "喜欢领导团队，擅长管理和组织"
+    elif primary in ["R", "I"]:
+        team_preference = "可以独立工作，也能参与团队项目"
+    else:
+        team_preference = "更适合独立创作或规范化工作"
+    
+    # 适合的行业（去重并保持顺序；集合的迭代顺序随进程的哈希种子变化，会导致多进程输出不一致）
+    industries = []
+    for type_code in [primary, secondary]:
+        industries.extend(INDUSTRY_MAPPING.get(type_code, []))
+    
+    # 职业层级建议
+    if band == 0:
+        career_level = "非常适合该领域，可以考虑成为该领域的专家或高级专业人员"
+    elif band == 1:
+        career_level = "比较适合该领域，可以从基础岗位开始，逐步发展为专业人员"
+    else:
+        career_level = "可以考虑该领域，但建议结合其他兴趣类型寻找更适合的方向"
+    
+    # 职业路径建议
+    if band == 0:
+        career_path = (
+            "可以直接进入该领域，从基础岗位开始",
+            "在该领域深耕，成为专业人才",
+            "可以考虑在该领域内跨职能发展",
+            "长期目标可以是该领域的专家或高级管理人员",
+        )
     else:
-        tendency["team_preference"] = "更适合独立创作或规范化工作"
+        career_path = (
+            f"可以考虑以{primary}为主，结合{secondary}发展复合型能力",
+            "寻找结合多个兴趣类型的职业方向",
+            "可以先尝试该领域的工作，根据实际体验调整方向",
+            "保持开放心态，探索更多可能性",
+        )
     
-    return tendency
+    return AnalysisEntry(
+        work_style=work_style,
+        team_preference=team_preference,
+        primary_positioning=f"{primary_desc['name']} - {primary_desc['characteristics']}",
+        suitable_industries=tuple(dict.fromkeys(industries)),
+        career_level=career_level,
+        immediate_actions=(
+            f"深入了解{primary_desc['name']}相关的职业领域",
+            "收集该领域的职业信息，了解工作内容和发展前景",
+            "寻找该领域的实习或实践机会",
+            "与该领域的专业人士交流，了解实际工作情况",
+        ),
+        skill_development=(
+            f"重点培养{primary_desc['name']}相关的核心技能",
+            "通过课程、培训或实践提升专业技能",
+            "建立作品集或项目经验，展示相关能力",
+            "持续学习和更新该领域的知识和技能",
+        ),
+        career_path=career_path,
+        workplace_advice=(
+            f"寻找{primary_desc['work_environment']}的工作环境",
+            f"在工作中体现{primary_desc['values']}的价值观",
+            f"避免{primary_desc['dislikes']}为主的工作内容",
+            "找到适合的工作风格和节奏",
+        ),
+    )
+
+
+def get_analysis_entry(primary: str, secondary: str, band: int) -> AnalysisEntry:
+    """
+    查找预计算的分析结果（O(1)，未命中时计算并填入查找表）
+    
+    Args:
+        primary: 主要类型
+        secondary: 次要类型
+        band: 主要类型百分比的分档，见 percentage_band
+        
+    Returns:
+        分析结果
+    """
+    key = (primary, secondary, band)
+    entry = _ANALYSIS_TABLE.get(key)
+    if entry is None:
+        entry = _ANALYSIS_TABLE[key] = _build_analysis_entry(primary, secondary, band)
+    return entry
+
+
+def precompute_analysis_table():
+    """一次性填充全部组合的分析结果（适合在工作进程启动时调用）"""
+    for primary in HOLLAND_TYPES:
+        for secondary in HOLLAND_TYPES:
+            for band in range(len(STRENGTH_LEVELS)):
+                get_analysis_entry(primary, secondary, band)
+
+
+def _entry_for(result: TestResult) -> AnalysisEntry:
+    band = percentage_band(result.percentages[result.primary_type])
+    return get_analysis_entry(result.primary_type, result.secondary_type, band)
+
+
+def analyze_career_tendency(result: TestResult) -> Dict[str, any]:
+    """
+    分析职业倾向
+    
+    Args:
+        result: 测试结果
+        
+    Returns:
+        职业倾向分析结果
+    """
+    entry = _entry_for(result)
+    return {
+        "dominant_type": result.primary_type,
+        "supporting_types": [result.secondary_type, result.tertiary_type],
+        "strength_level": {
+            type_code: STRENGTH_LEVELS[percentage_band(percentage)]
+            for type_code, percentage in result.percentages.items()
+        },
+        "work_style": entry.work_style,
+        "team_preference": entry.team_preference,
+    }
 
 
 def analyze_career_positioning(result: TestResult) -> Dict[str, any]:
@@ -287,41 +290,13 @@ def analyze_career_positioning(result: TestResult) -> Dict[str, any]:
     Returns:
         职业定位分析结果
     """
-    positioning = {
-        "primary_positioning": "",
+    entry = _entry_for(result)
+    return {
+        "primary_positioning": entry.primary_positioning,
         "career_fields": [],
-        "suitable_industries": [],
-        "career_level": "",
-    }
-    
-    # 主要定位
-    primary_desc = TYPE_DESCRIPTIONS[result.primary_type]
-    positioning["primary_positioning"] = f"{primary_desc['name']} - {primary_desc['characteristics']}"
-    
-    # 适合的行业
-    industry_mapping = {
-        "R": ["制造业", "建筑业", "交通运输", "能源", "农业", "技术服务业"],
-        "I": ["科研院所", "高等教育", "医药研发", "信息技术", "咨询研究"],
-        "A": ["文化创意", "广告传媒", "设计", "艺术", "娱乐", "出版"],
-        "S": ["教育", "医疗健康", "社会服务", "心理咨询", "人力资源"],
-        "E": ["商业管理", "金融投资", "销售贸易", "法律", "创业", "政府管理"],
-        "C": ["金融服务", "会计审计", "行政服务", "物流", "信息管理"],
+        "suitable_industries": list(entry.suitable_industries),
+        "career_level": entry.career_level,
     }
-    
-    for type_code in [result.primary_type, result.secondary_type]:
-        positioning["suitable_industries"].extend(industry_mapping.get(type_code, []))
-    positioning["suitable_industries"] = list(set(positioning["suitable_industries"]))
-    
-    # 职业层级建议
-    primary_pct = result.percentages[result.primary_type]
-    if primary_pct >= 70:
-        positioning["career_level"] = "非常适合该领域，可以考虑成为该领域的专家或高级专业人员"
-    elif primary_pct >= 50:
-        positioning["career_level"] = "比较适合该领域，可以从基础岗位开始，逐步发展为专业人员"
-    else:
-        positioning["career_level"] = "可以考虑该领域，但建议结合其他兴趣类型寻找更适合的方向"
-    
-    return positioning
 
 
 def generate_career_guidance(result: TestResult) -> Dict[str, List[str]]:
@@ -334,54 +309,142 @@ def generate_career_guidance(result: TestResult) -> Dict[str, List[str]]:
     Returns:
         职业指导建议
     """
-    guidance = {
-        "immediate_actions": [],
-        "skill_development": [],
-        "career_path": [],
-        "workplace_advice": [],
+    entry = _entry_for(result)
+    return {
+        "immediate_actions": list(entry.immediate_actions),
+        "skill_development": list(entry.skill_development),
+        "career_path": list(entry.career_path),
+        "workplace_advice": list(entry.workplace_advice),
     }
+
+
+# ---------------------------------------------------------------------------
+# 剖面指标：一致性、区分度和适配度（congruence）
+#
+# - 一致性：主要类型与次要类型在霍兰德六边形上的距离，1 为相邻（高），2 为相隔（中），3 为相对（低）
+# - 区分度：最高与最低类型百分比之差（0-100），越大说明兴趣越集中
+# - 适配度：个人与环境（职业）三字母代码的 C 指数（Brown & Gore, 1994），
+#   C = 3·(3-d₁) + 2·(3-d₂) + (3-d₃)，取值 0-18
+#
+# 逐份版本供报告使用，批量版本对 (N, 6) 的得分矩阵整体计算，与逐份版本逐行一致。
+# ---------------------------------------------------------------------------
+
+# 六边形距离（1-3）-> 一致性等级
+CONSISTENCY_LEVELS: Mapping[int, str] = MappingProxyType({1: "高", 2: "中", 3: "低"})
+
+# 区分度分档（≥50、≥25、其余）及对应等级
+DIFFERENTIATION_LEVELS: Tuple[str, ...] = ("高", "中", "低")
+
+# C 指数中三个位置的权重
+_CONGRUENCE_WEIGHTS = (3, 2, 1)
+
+_TYPE_INDEX = {code: i for i, code in enumerate(TYPE_CODES)}
+
+
+class ProfileMetrics(NamedTuple):
+    """一份测试结果的剖面指标"""
+    consistency: int  # 主要与次要类型的六边形距离（1-3）
+    consistency_level: str
+    differentiation: float  # 最高与最低类型百分比之差
+    differentiation_level: str
+
+
+def differentiation_band(differentiation: float) -> int:
+    """区分度所在的分档：0 表示≥50，1 表示≥25，2 表示其余"""
+    if differentiation >= 50:
+        return 0
+    elif differentiation >= 25:
+        return 1
+    return 2
+
+
+def calculate_consistency(result: TestResult) -> int:
+    """一致性：主要类型与次要类型的六边形距离（1-3，越小越一致）"""
+    return hexagon_distance(result.primary_type, result.secondary_type)
+
+
+def calculate_differentiation(result: TestResult) -> float:
+    """区分度：最高与最低类型百分比之差"""
+    percentages = result.percentages.values()
+    return max(percentages) - min(percentages)
+
+
+def calculate_congruence(person_code: str, environment_code: str) -> int:
+    """
+    适配度：个人与环境三字母代码的 C 指数（0-18）
     
-    primary_desc = TYPE_DESCRIPTIONS[result.primary_type]
-    
-    # 立即行动建议
-    guidance["immediate_actions"] = [
-        f"深入了解{primary_desc['name']}相关的职业领域",
-        "收集该领域的职业信息，了解工作内容和发展前景",
-        "寻找该领域的实习或实践机会",
-        "与该领域的专业人士交流，了解实际工作情况",
-    ]
-    
-    # 技能发展建议
-    skills = primary_desc.get("skills", "").split("、")
-    guidance["skill_development"] = [
-        f"重点培养{primary_desc['name']}相关的核心技能",
-        "通过课程、培训或实践提升专业技能",
-        "建立作品集或项目经验，展示相关能力",
-        "持续学习和更新该领域的知识和技能",
-    ]
-    
-    # 职业路径建议
-    if result.percentages[result.primary_type] >= 70:
-        guidance["career_path"] = [
-            "可以直接进入该领域，从基础岗位开始",
-            "在该领域深耕，成为专业人才",
-            "可以考虑在该领域内跨职能发展",
-            "长期目标可以是该领域的专家或高级管理人员",
-        ]
-    else:
-        guidance["career_path"] = [
-            f"可以考虑以{result.primary_type}为主，结合{result.secondary_type}发展复合型能力",
-            "寻找结合多个兴趣类型的职业方向",
-            "可以先尝试该领域的工作，根据实际体验调整方向",
-            "保持开放心态，探索更多可能性",
-        ]
+    Args:
+        person_code: 个人的类型代码，如 "RIA"
+        environment_code: 环境（职业）的类型代码
+    """
+    return sum(weight * (3 - hexagon_distance(a, b))
+               for weight, a, b in zip(_CONGRUENCE_WEIGHTS, person_code, environment_code))
+
+
+def analyze_profile(result: TestResult) -> ProfileMetrics:
+    """计算一份测试结果的一致性和区分度"""
+    consistency = calculate_consistency(result)
+    differentiation = calculate_differentiation(result)
+    return ProfileMetrics(
+        consistency=consistency,
+        consistency_level=CONSISTENCY_LEVELS[consistency],
+        differentiation=differentiation,
+        differentiation_level=DIFFERENTIATION_LEVELS[differentiation_band(differentiation)],
+    )
+
+
+def consistency_batch(scores) -> "np.ndarray":
+    """
+    批量计算一致性
     
-    # 工作环境建议
-    guidance["workplace_advice"] = [
-        f"寻找{primary_desc['work_environment']}的工作环境",
-        f"在工作中体现{primary_desc['values']}的价值观",
-        f"避免{primary_desc['dislikes']}为主的工作内容",
-        "找到适合的工作风格和节奏",
-    ]
+    Args:
+        scores: (N, 6) 的得分或百分比矩阵（列顺序为 TYPE_CODES），
+            主要和次要类型按 score_batch 的规则确定（同分时按 TYPE_CODES 顺序）
+        
+    Returns:
+        (N,) 的六边形距离（1-3）
+    """
+    _require_numpy()
+    scores = np.asarray(scores)
+    top_two = np.argsort(-scores, axis=1, kind="stable")[:, :2]
+    # 六边形顺序与 TYPE_CODES 相同，类型下标可直接索引距离矩阵
+    return hexagon_distance_matrix()[top_two[:, 0], top_two[:, 1]]
+
+
+def differentiation_batch(percentages) -> "np.ndarray":
+    """批量计算区分度：(N, 6) 百分比矩阵每行最大值与最小值之差"""
+    _require_numpy()
+    percentages = np.asarray(percentages)
+    return percentages.max(axis=1) - percentages.min(axis=1)
+
+
+def congruence_batch(person_codes, environment_codes) -> "np.ndarray":
+    """
+    批量计算 C 指数
     
-    return guidance
+    Args:
+        person_codes: (..., 3) 的个人类型代码，元素为 TYPE_CODES 中的下标
+            （如 BatchResult.top_types）
+        environment_codes: 可与 person_codes 广播的 (..., 3) 环境类型代码
+        
+    Returns:
+        广播后形状的 C 指数（0-18）
+    """
+    _require_numpy()
+    distance = hexagon_distance_matrix()[np.asarray(person_codes), np.asarray(environment_codes)]
+    return (3 - distance) @ np.array(_CONGRUENCE_WEIGHTS)
+
+
+def type_code_indices(code: str) -> Tuple[int, ...]:
+    """类型代码（如 "RIA"）-> TYPE_CODES 中的下标，供 congruence_batch 使用"""
+    return tuple(_TYPE_INDEX[letter] for letter in code)
+
+
+def _require_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("批量计算剖面指标需要 numpy，请运行：pip install numpy") from None
+        np = numpy
@@ -0,0 +1,170 @@
+"""紧凑答案向量：将120道是/否答案压缩为15字节的位集合"""
+
+import base64
+from typing import Dict, Iterable, Optional
+
+from .questions import CATEGORIES, QUESTION_BANK
+
+# 位布局：第 j 位（最低位为第 0 位）对应题库中的第 j 道题，置 1 表示回答"是"。
+# 序列化为小端字节序，即第 0 个字节保存第 1-8 题，字节内低位在前，
+# 与 numpy.packbits(..., bitorder="little") 的布局一致。
+VECTOR_BITS = len(QUESTION_BANK)
+VECTOR_BYTES = (VECTOR_BITS + 7) // 8
+
+_ID_TO_BIT = QUESTION_BANK.index_of
+_FULL_MASK = (1 << VECTOR_BITS) - 1
+
+# 每种类型对应题目的位掩码，评分时与答案按位与后计数
+TYPE_MASKS: Dict[str, int] = {
+    type_code: sum(1 << _ID_TO_BIT[qid] for qid in ids)
+    for type_code, ids in QUESTION_BANK.ids_by_type.items()
+}
+
+# 每种类型每个维度对应题目的位掩码（类型 -> 维度 -> 掩码），计算子分数时使用
+CATEGORY_MASKS: Dict[str, Dict[str, int]] = {
+    type_code: {
+        category: sum(1 << _ID_TO_BIT[qid] for qid in ids if QUESTION_BANK.category_of[qid] == category)
+        for category in CATEGORIES
+    }
+    for type_code, ids in QUESTION_BANK.ids_by_type.items()
+}
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:  # pragma: no cover - 旧版本 Python 的兼容实现
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+class AnswerVector:
+    """120道题目答案的位集合表示（不可变）"""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, bits: int = 0):
+        if bits < 0 or bits > _FULL_MASK:
+            raise ValueError(f"答案位集合超出 {VECTOR_BITS} 位范围")
+        object.__setattr__(self, "_bits", bits)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AnswerVector 不可修改")
+
+    @property
+    def bits(self) -> int:
+        """原始位集合"""
+        return self._bits
+
+    @classmethod
+    def from_dict(cls, answers: Dict[int, bool]) -> "AnswerVector":
+        """从 {题目ID: 答案} 映射构建，未知题目ID将被忽略"""
+        bits = 0
+        for qid, ans in answers.items():
+            if ans:
+                bit = _ID_TO_BIT.get(qid)
+                if bit is not None:
+                    bits |= 1 << bit
+        return cls(bits)
+
+    @classmethod
+    def from_sequence(cls, answers: Iterable[bool]) -> "AnswerVector":
+        """按题库顺序从答案序列构建"""
+        bits = 0
+        count = 0
+        for j, ans in enumerate(answers):
+            if ans:
+                bits |= 1 << j
+            count = j + 1
+        if count != VECTOR_BITS:
+            raise ValueError(f"答案数量应为 {VECTOR_BITS}，实际为 {count}")
+        return cls(bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "AnswerVector":
+        """从15字节的序列化数据构建"""
+        if len(data) != VECTOR_BYTES:
+            raise ValueError(f"答案向量应为 {VECTOR_BYTES} 字节，实际为 {len(data)} 字节")
+        return cls(int.from_bytes(data, "little"))
+
+    @classmethod
+    def from_base64(cls, text: str) -> "AnswerVector":
+        """从 base64 字符串构建"""
+        return cls.from_bytes(base64.b64decode(text, validate=True))
+
+    def to_bytes(self) -> bytes:
+        """序列化为15字节"""
+        return self._bits.to_bytes(VECTOR_BYTES, "little")
+
+    def to_base64(self) -> str:
+        """序列化为 base64 字符串（20个字符）"""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    def to_dict(self) -> Dict[int, bool]:
+        """转换为 {题目ID: 答案} 映射"""
+        bits = self._bits
+        return {qid: bool(bits >> j & 1) for j, qid in enumerate(QUESTION_BANK.ids)}
+
+    def get(self, question_id: int) -> Optional[bool]:
+        """获取指定题目的答案，题目ID不存在时返回 None"""
+        bit = _ID_TO_BIT.get(question_id)
+        if bit is None:
+            return None
+        return bool(self._bits >> bit & 1)
+
+    def with_answer(self, question_id: int, answer: bool) -> "AnswerVector":
+        """返回修改了指定题目答案的新向量"""
+        bit = _ID_TO_BIT.get(question_id)
+        if bit is None:
+            raise KeyError(question_id)
+        if answer:
+            return AnswerVector(self._bits | 1 << bit)
+        return AnswerVector(self._bits & ~(1 << bit))
+
+    def count_yes(self) -> int:
+        """回答"是"的题目数量"""
+        return _popcount(self._bits)
+
+    def type_scores(self) -> Dict[str, int]:
+        """各类型得分：与每种类型的掩码按位与后计数"""
+        bits = self._bits
+        return {type_code: _popcount(bits & mask) for type_code, mask in TYPE_MASKS.items()}
+
+    def category_scores(self) -> Dict[str, Dict[str, int]]:
+        """类型×维度子分数：与每个类型、维度的掩码按位与后计数"""
+        bits = self._bits
+        return {
+            type_code: {category: _popcount(bits & mask) for category, mask in masks.items()}
+            for type_code, masks in CATEGORY_MASKS.items()
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AnswerVector):
+            return NotImplemented
+        return self._bits == other._bits
+
+    def __hash__(self) -> int:
+        return hash(self._bits)
+
+    def __repr__(self) -> str:
+        return f"AnswerVector({self.to_base64()!r})"
+
+    def __reduce__(self):
+        return (AnswerVector, (self._bits,))
+
+
+def pack_matrix(matrix):
+    """
+    将 (N, 120) 答案矩阵打包为 (N, 15) 的 uint8 矩阵
+
+    每一行的字节与 AnswerVector.to_bytes() 相同。
+    """
+    import numpy as np
+
+    return np.packbits(np.asarray(matrix) != 0, axis=1, bitorder="little")
+
+
+def unpack_matrix(packed):
+    """将 (N, 15) 的打包矩阵还原为 score_batch 所需的 (N, 120) uint8 矩阵"""
+    import numpy as np
+
+    packed = np.asarray(packed, dtype=np.uint8)
+    return np.unpackbits(packed, axis=1, count=VECTOR_BITS, bitorder="little")
@@ -0,0 +1,480 @@
+"""霍兰德职业兴趣测试批量评分工具
+
+以流式方式读取 JSONL 或 CSV 答案文件，逐行评分并写出结果，内存占用与文件大小无关。
+
+用法：
+    python -m holland_test.batch answers.jsonl -o results.jsonl
+    python -m holland_test.batch answers.csv -o results.jsonl --errors bad_rows.jsonl
+    python -m holland_test.batch answers.jsonl -o reports.jsonl --report professional --jobs 8
+    python -m holland_test.batch answers.jsonl -o results.jsonl --norms norms.json
+    python -m holland_test.batch answers.jsonl -o reports.jsonl --report professional --screen
+
+输入格式：
+    JSONL：每行一个对象，可包含 "id" 字段，答案放在以下任一字段中：
+        "answers"：{"题目ID": 答案} 映射，或按题目顺序排列的120个答案的列表
+        "vector"：AnswerVector 的 base64 字符串
+        可选的 "item_seconds"：按题目顺序排列的120个逐题用时（秒），供质量筛查使用
+    CSV：首行为表头，可包含 "id" 列，其余列名为题目ID（如 "1" 或 "Q1"）
+
+答案可使用与交互式测试相同的输入：Y/N、1/0、是/否、true/false 等。
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .analysis import get_career_table, precompute_analysis_table
+from .answer_vector import AnswerVector
+from .main import parse_answer
+from .questions import QUESTION_BANK, get_question_bank
+from .report_cache import configure_default_cache, get_default_cache
+from .scorer import TestResult, score_test
+
+# 一条待评分记录：(行号, 答卷ID, 原始文本, 答案向量或错误信息, 逐题用时或 None)
+Record = Tuple[int, Optional[str], str, object, Optional[List[float]]]
+
+_QUESTION_COLUMN = re.compile(r"^[Qq]?(\d+)$")
+
+
+class RowError(ValueError):
+    """无法解析的输入行"""
+
+
+@lru_cache(maxsize=1024)
+def parse_token(token: str) -> bool:
+    """
+    解析单个答案（结果缓存，避免大文件中重复解析相同的输入）
+
+    Raises:
+        RowError: 无法识别的答案
+    """
+    parsed = parse_answer(token)
+    if parsed is None:
+        raise RowError(f"无法识别的答案：{token!r}")
+    return parsed
+
+
+def _parse_value(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, str)):
+        return parse_token(str(value))
+    raise RowError(f"无法识别的答案：{value!r}")
+
+
+def answers_from_mapping(answers: Dict) -> AnswerVector:
+    """将 {题目ID: 答案} 映射转换为答案向量，要求覆盖全部题目"""
+    bits = 0
+    index_of = QUESTION_BANK.index_of
+    seen = 0
+    for key, value in answers.items():
+        try:
+            index = index_of[int(key)]
+        except (KeyError, ValueError):
+            raise RowError(f"未知的题目ID：{key!r}") from None
+        seen += 1
+        if _parse_value(value):
+            bits |= 1 << index
+    if seen != len(QUESTION_BANK):
+        raise RowError(f"答案数量应为 {len(QUESTION_BANK)}，实际为 {seen}")
+    return AnswerVector(bits)
+
+
+def answers_from_sequence(answers: Iterable) -> AnswerVector:
+    """将按题目顺序排列的答案序列转换为答案向量"""
+    try:
+        return AnswerVector.from_sequence(_parse_value(value) for value in answers)
+    except ValueError as e:
+        raise RowError(str(e)) from None
+
+
+def parse_record(obj) -> AnswerVector:
+    """
+    解析一个 JSON 答卷对象中的答案
+
+    Raises:
+        RowError: 对象格式不正确或答案无法识别
+    """
+    if not isinstance(obj, dict):
+        raise RowError("答卷应为一个 JSON 对象")
+    try:
+        if "vector" in obj:
+            return AnswerVector.from_base64(obj["vector"])
+        if isinstance(obj.get("answers"), dict):
+            return answers_from_mapping(obj["answers"])
+        if isinstance(obj.get("answers"), list):
+            return answers_from_sequence(obj["answers"])
+    except (ValueError, TypeError) as e:
+        raise RowError(str(e)) from None
+    raise RowError('缺少 "answers" 或 "vector" 字段')
+
+
+def parse_item_seconds(value) -> Optional[List[float]]:
+    """
+    解析逐题用时（按题目顺序排列的非负秒数），None 表示没有用时数据
+
+    Raises:
+        RowError: 数量不正确或包含非法数值
+    """
+    if value is None:
+        return None
+    if not isinstance(value, list) or len(value) != len(QUESTION_BANK):
+        raise RowError(f"item_seconds 应为 {len(QUESTION_BANK)} 个逐题用时的列表")
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) and v >= 0 for v in value):
+        raise RowError("item_seconds 应为非负数")
+    return [float(v) for v in value]
+
+
+def parse_jsonl_line(line_no: int, raw: str) -> Record:
+    """解析一行 JSONL 答案"""
+    record_id = None
+    try:
+        obj = json.loads(raw)
+        if not isinstance(obj, dict):
+            raise RowError("每行应为一个 JSON 对象")
+        record_id = obj.get("id")
+        vector = parse_record(obj)
+        item_seconds = parse_item_seconds(obj.get("item_seconds"))
+    except (ValueError, TypeError) as e:
+        return line_no, record_id, raw, RowError(str(e)), None
+    return line_no, record_id, raw, vector, item_seconds
+
+
+class CsvLayout(NamedTuple):
+    """CSV 表头布局"""
+    header: Tuple[str, ...]
+    id_column: Optional[int]
+    columns: Tuple[Tuple[int, int], ...]  # (列下标, 题目在题库中的下标)
+
+
+def read_csv_layout(header: List[str]) -> CsvLayout:
+    """
+    解析 CSV 表头
+
+    Raises:
+        RowError: 表头缺少题目列
+    """
+    id_column = None
+    columns = []
+    for col, name in enumerate(header):
+        name = name.strip().lstrip("\ufeff")
+        match = _QUESTION_COLUMN.match(name)
+        if name.lower() == "id":
+            id_column = col
+        elif match and int(match.group(1)) in QUESTION_BANK.index_of:
+            columns.append((col, QUESTION_BANK.index_of[int(match.group(1))]))
+    if len(columns) != len(QUESTION_BANK):
+        raise RowError(f"CSV 表头应包含 {len(QUESTION_BANK)} 个题目列，实际为 {len(columns)}")
+    return CsvLayout(tuple(header), id_column, tuple(columns))
+
+
+def parse_csv_row(layout: CsvLayout, line_no: int, row: List[str]) -> Record:
+    """按表头布局解析一行 CSV 答案"""
+    raw = ",".join(row)
+    id_column = layout.id_column
+    record_id = row[id_column] if id_column is not None and id_column < len(row) else None
+    try:
+        bits = 0
+        for col, index in layout.columns:
+            if col >= len(row) or not row[col].strip():
+                raise RowError(f"第 {layout.header[col]} 题缺少答案")
+            if parse_token(row[col]):
+                bits |= 1 << index
+    except RowError as e:
+        return line_no, record_id, raw, e, None
+    return line_no, record_id, raw, AnswerVector(bits), None
+
+
+def read_raw(stream, fmt: str) -> Tuple[Callable[[int, object], Record], Iterator[Tuple[int, object]]]:
+    """
+    读取原始行（不解析），解析工作交给 process_chunk，以便在工作进程中并行完成
+
+    Returns:
+        (解析函数, 生成 (行号, 原始行) 的迭代器)
+    """
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return parse_jsonl_line, iter(())
+        parser = partial(parse_csv_row, read_csv_layout(header))
+        return parser, ((reader.line_num, row) for row in reader if row)
+
+    lines = ((line_no, line.rstrip("\n")) for line_no, line in enumerate(stream, 1))
+    return parse_jsonl_line, ((line_no, raw) for line_no, raw in lines if raw.strip())
+
+
+def result_to_dict(record_id: Optional[str], result: TestResult) -> Dict:
+    """将测试结果转换为可写出的字典"""
+    row = {"id": record_id}
+    row.update(asdict(result))
+    return row
+
+
+def render_report(result: TestResult, report_kind: str, timestamp: str) -> str:
+    """生成指定类型的报告（得分相同的答卷共用进程内的报告缓存）"""
+    return get_default_cache().get_report(result, report_kind, timestamp)
+
+
+def process_chunk(parser, chunk: List[Tuple[int, object]], report_kind: str = "none",
+                  timestamp: str = "", screening=None) -> List[Tuple[bool, str]]:
+    """
+    解析、评分并序列化一批原始行
+
+    Args:
+        screening: 质量筛查阈值（screening.ScreeningThresholds），提供时先整批筛查，
+            结果中增加 "screening" 字段（被标记的原因代码列表），被标记的答卷不生成报告
+
+    Returns:
+        [(是否成功, 输出行)]，成功的行写入结果文件，失败的行写入错误文件
+    """
+    return _score_chunk(parser, chunk, report_kind, timestamp, screening=screening)
+
+
+def process_chunk_with_norms(parser, chunk: List[Tuple[int, object]], report_kind: str = "none",
+                             timestamp: str = "", screening=None):
+    """
+    与 process_chunk 相同，同时统计这批结果的人群常模
+
+    Returns:
+        ([(是否成功, 输出行)], PopulationNorms)，各批的常模由主进程合并
+    """
+    from .norms import PopulationNorms
+
+    norms = PopulationNorms()
+    return _score_chunk(parser, chunk, report_kind, timestamp, norms, screening), norms
+
+
+def screen_records(records: List[Record], thresholds) -> Dict[int, List[str]]:
+    """
+    整批筛查已解析的记录
+
+    Returns:
+        {记录在列表中的下标: 被标记的原因代码}，只包含被标记的记录
+    """
+    import numpy as np
+
+    from .answer_vector import VECTOR_BYTES, unpack_matrix
+    from .screening import screen
+
+    valid = [i for i, record in enumerate(records) if not isinstance(record[3], RowError)]
+    if not valid:
+        return {}
+    packed = np.frombuffer(b"".join(records[i][3].to_bytes() for i in valid), dtype=np.uint8)
+    matrix = unpack_matrix(packed.reshape(len(valid), VECTOR_BYTES))
+    item_seconds = None
+    if any(records[i][4] is not None for i in valid):
+        item_seconds = np.full(matrix.shape, np.nan)
+        for row, i in enumerate(valid):
+            if records[i][4] is not None:
+                item_seconds[row] = records[i][4]
+    result = screen(matrix, thresholds, item_seconds)
+    return {i: result.reasons(row) for row, i in enumerate(valid) if result.flags[row]}
+
+
+def _score_chunk(parser, chunk: List[Tuple[int, object]], report_kind: str, timestamp: str,
+                 norms=None, screening=None) -> List[Tuple[bool, str]]:
+    records = [parser(line_no, raw) for line_no, raw in chunk]
+    flagged = screen_records(records, screening) if screening is not None else {}
+    output = []
+    for i, (line_no, record_id, raw_text, value, _) in enumerate(records):
+        if isinstance(value, RowError):
+            output.append((False, json.dumps(
+                {"line": line_no, "id": record_id, "error": str(value), "raw": raw_text},
+                ensure_ascii=False,
+            )))
+            continue
+        result = score_test(value)
+        if norms is not None:
+            norms.update(result)
+        row = result_to_dict(record_id, result)
+        reasons = flagged.get(i)
+        if screening is not None:
+            row["screening"] = reasons or []
+        if report_kind != "none" and not reasons:
+            row["report"] = render_report(result, report_kind, timestamp)
+        output.append((True, json.dumps(row, ensure_ascii=False)))
+    return output
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[List]:
+    """将迭代器切分为固定大小的列表"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def detect_format(path: str) -> str:
+    """根据文件扩展名判断输入格式"""
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def warm_up(cache_size: int = 4096, cache_db: Optional[str] = None):
+    """构建评分和报告所需的预计算表和报告缓存（每个工作进程启动时调用一次）"""
+    get_question_bank()
+    precompute_analysis_table()
+    get_career_table()
+    configure_default_cache(maxsize=cache_size, db_path=cache_db)
+
+
+def map_chunks(parser, chunks: Iterable[List], report_kind: str, timestamp: str,
+               jobs: int, cache_size: int = 4096, cache_db: Optional[str] = None,
+               worker: Callable = process_chunk) -> Iterator:
+    """
+    按输入顺序处理各批数据
+
+    jobs > 1 时分发到进程池，同时在途的批次数量受限，保持内存占用恒定，
+    结果按提交顺序产出，输出顺序与输入一致。
+
+    Args:
+        worker: 处理一批数据的函数（process_chunk 或 process_chunk_with_norms）
+    """
+    if jobs <= 1:
+        warm_up(cache_size, cache_db)
+        for chunk in chunks:
+            yield worker(parser, chunk, report_kind, timestamp)
+        return
+
+    max_pending = jobs * 2
+    with ProcessPoolExecutor(max_workers=jobs, initializer=warm_up,
+                             initargs=(cache_size, cache_db)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(worker, parser, chunk, report_kind, timestamp))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run(input_path: str, output_path: str, errors_path: Optional[str], fmt: Optional[str],
+        jobs: int = 1, chunk_size: int = 1000, report_kind: str = "none",
+        cache_size: int = 4096, cache_db: Optional[str] = None,
+        norms_path: Optional[str] = None, screening=None) -> Tuple[int, int]:
+    """
+    执行批量评分
+
+    Args:
+        input_path: 答案文件，- 表示标准输入
+        output_path: 结果文件，- 表示标准输出
+        errors_path: 错误行文件，None 表示丢弃错误行
+        fmt: 输入格式（jsonl/csv），None 表示根据扩展名判断
+        jobs: 工作进程数，1 表示在当前进程中处理
+        chunk_size: 每批分发给工作进程的行数
+        report_kind: 随结果输出的报告类型（none/summary/professional）
+        cache_size: 每个进程内报告缓存的最大条目数
+        cache_db: 多进程共享的 SQLite 报告缓存路径
+        norms_path: 人群常模文件，提供时将本次的结果计入常模（文件已存在时在其基础上累加）
+        screening: 质量筛查阈值（screening.ScreeningThresholds），提供时在生成报告之前整批筛查
+
+    Returns:
+        (成功评分的行数, 错误行数)
+    """
+    fmt = fmt or detect_format(input_path)
+    timestamp = datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")
+    source = sys.stdin if input_path == "-" else open(input_path, "r", encoding="utf-8", newline="")
+    sink = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8")
+    bad_rows = open(errors_path, "w", encoding="utf-8") if errors_path else None
+
+    norms = None
+    if norms_path is not None:
+        from .norms import PopulationNorms
+
+        norms = PopulationNorms.load(norms_path) if os.path.exists(norms_path) else PopulationNorms()
+    worker = process_chunk if norms is None else process_chunk_with_norms
+    if screening is not None:
+        worker = partial(worker, screening=screening)
+
+    ok = bad = 0
+    try:
+        parser, raw_rows = read_raw(source, fmt)
+        chunks = iter_chunks(raw_rows, max(1, chunk_size))
+        for output in map_chunks(parser, chunks, report_kind, timestamp, jobs,
+                                 cache_size, cache_db, worker):
+            if norms is not None:
+                output, chunk_norms = output
+                norms.merge(chunk_norms)
+            for success, line in output:
+                if success:
+                    sink.write(line + "\n")
+                    ok += 1
+                else:
+                    bad += 1
+                    if bad_rows is not None:
+                        bad_rows.write(line + "\n")
+    finally:
+        for f in (source, sink, bad_rows):
+            if f is not None and f not in (sys.stdin, sys.stdout):
+                f.close()
+    if norms is not None:
+        norms.save(norms_path)
+    return ok, bad
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="霍兰德职业兴趣测试批量评分")
+    parser.add_argument("input", help="答案文件（JSONL 或 CSV），- 表示标准输入")
+    parser.add_argument("-o", "--output", default="-", help="结果文件（JSONL），默认输出到标准输出")
+    parser.add_argument("--errors", help="错误行文件（JSONL），默认为 <结果文件>.errors.jsonl")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="输入格式，默认根据扩展名判断")
+    parser.add_argument("--report", choices=["none", "summary", "professional"], default="none",
+                        help="随结果输出的报告类型，默认不输出报告")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="工作进程数，0 表示使用全部 CPU 核心，默认为 1")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="每批分发给工作进程的行数")
+    parser.add_argument("--cache-size", type=int, default=4096, help="每个进程内报告缓存的最大条目数")
+    parser.add_argument("--cache-db", help="多进程共享的 SQLite 报告缓存路径")
+    parser.add_argument("--norms", help="人群常模文件（JSON），将本次的结果计入常模")
+    parser.add_argument("--screen", action="store_true",
+                        help="生成报告之前筛查无效作答，被标记的答卷不生成报告")
+    parser.add_argument("--screen-config", help="筛查阈值文件（JSON），提供时自动启用筛查")
+    args = parser.parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    errors_path = args.errors
+    if errors_path is None and args.output != "-":
+        errors_path = args.output + ".errors.jsonl"
+
+    screening = None
+    if args.screen or args.screen_config:
+        from .screening import ScreeningThresholds
+
+        try:
+            screening = ScreeningThresholds.load(args.screen_config) if args.screen_config else ScreeningThresholds()
+        except (OSError, ValueError, TypeError) as e:
+            print(f"✗ 无法读取筛查阈值：{e}", file=sys.stderr)
+            return 1
+
+    start = time.perf_counter()
+    try:
+        ok, bad = run(args.input, args.output, errors_path, args.format,
+                      jobs=jobs, chunk_size=args.chunk_size, report_kind=args.report,
+                      cache_size=args.cache_size, cache_db=args.cache_db, norms_path=args.norms,
+                      screening=screening)
+    except RowError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    rate = (ok + bad) / elapsed if elapsed > 0 else 0.0
+    print(f"✓ 已评分 {ok} 行，错误 {bad} 行，耗时 {elapsed:.2f} 秒（{rate:,.0f} 行/秒）", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""霍兰德职业兴趣测试性能基准
+
+用法：
+    python -m holland_test.benchmark batch --rows 200000
+    python -m holland_test.benchmark scaling --rows 20000 --max-jobs 8
+    python -m holland_test.benchmark report --rows 5000
+    python -m holland_test.benchmark server --requests 20000 --clients 50
+    python -m holland_test.benchmark imports --module holland_test.main
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+from . import batch
+from .server import ScoringServer
+from .questions import QUESTION_BANK
+from .report_generator import generate_professional_report, generate_summary_report
+from .scorer import score_batch, score_test
+from .synthetic import RespondentSimulator
+
+
+# 冷启动导入 holland_test.main 的耗时预算（毫秒，取多次中最快），测试中检查
+IMPORT_BUDGET_MS = 40.0
+
+# 交互式测试启动时不应导入的模块（只在批量接口或生成报告时才需要）
+DEFERRED_IMPORTS = ("numpy", "holland_test.report_generator", "holland_test.adaptive")
+
+
+class ImportTiming(NamedTuple):
+    """一次冷启动导入的耗时（python -X importtime）"""
+    total_ms: float  # 目标模块的累计导入耗时
+    modules: Dict[str, float]  # 本次导入的每个模块 -> 累计耗时（毫秒）
+
+
+def measure_import_time(module: str = "holland_test.main", repeat: int = 5) -> ImportTiming:
+    """
+    在新的解释器进程中导入 module，返回 repeat 次中最快的一次
+
+    Raises:
+        RuntimeError: 导入失败
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=root, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"导入 {module} 失败：{proc.stderr.strip().splitlines()[-1:]}")
+        modules = {}
+        for line in proc.stderr.splitlines():
+            # 格式：import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = int(cumulative) / 1000
+        timing = ImportTiming(modules[module], modules)
+        if best is None or timing.total_ms < best.total_ms:
+            best = timing
+    return best
+
+
+def bench_imports(module: str, repeat: int, top: int) -> bool:
+    """冷启动导入耗时及耗时最多的模块，返回 holland_test.main 是否在预算内（其他模块只显示耗时）"""
+    timing = measure_import_time(module, repeat)
+    print(f"导入 {module}：{timing.total_ms:.1f} ms（取 {repeat} 次中最快）")
+    for name, ms in sorted(timing.modules.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {ms:8.2f} ms  {name}")
+    if module != "holland_test.main":
+        return True
+    print(f"预算：{IMPORT_BUDGET_MS:.0f} ms")
+    loaded = [name for name in DEFERRED_IMPORTS if name in timing.modules]
+    if loaded:
+        print(f"启动时导入了应延迟的模块：{', '.join(loaded)}")
+    return timing.total_ms <= IMPORT_BUDGET_MS and not loaded
+
+
+def _random_answers(rows: int, seed: int) -> np.ndarray:
+    """生成合成答案矩阵（按潜在剖面模拟，得分分布接近真实答卷）"""
+    return RespondentSimulator(seed=seed).generate(rows)
+
+
+def _matrix_to_dicts(matrix: np.ndarray):
+    """将答案矩阵转换为 score_test 所需的字典列表"""
+    ids = list(QUESTION_BANK.ids)
+    return [dict(zip(ids, map(bool, row))) for row in matrix.tolist()]
+
+
+def bench_batch(rows: int, loop_rows: int, seed: int):
+    """比较逐份 score_test 循环与 score_batch 的每份耗时"""
+    matrix = _random_answers(rows, seed)
+    loop_rows = min(loop_rows, rows)
+    dicts = _matrix_to_dicts(matrix[:loop_rows])
+
+    start = time.perf_counter()
+    loop_results = [score_test(answers) for answers in dicts]
+    loop_per_row = (time.perf_counter() - start) / loop_rows
+
+    start = time.perf_counter()
+    batch_result = score_batch(matrix)
+    batch_per_row = (time.perf_counter() - start) / rows
+
+    # 校验：抽样部分的结果必须与 score_test 完全一致
+    for row, expected in enumerate(loop_results):
+        assert batch_result.to_result(row) == expected, f"第 {row} 行结果不一致"
+
+    print(f"score_test 循环：{loop_rows} 份，每份 {loop_per_row * 1e6:.2f} µs")
+    print(f"score_batch   ：{rows} 份，每份 {batch_per_row * 1e6:.3f} µs")
+    print(f"加速比：{loop_per_row / batch_per_row:.1f}x")
+
+
+def bench_scaling(rows: int, max_jobs: int, chunk_size: int, report_kind: str, seed: int):
+    """批量评分（含报告生成）在 1 到 max_jobs 个进程下的吞吐量"""
+    matrix = _random_answers(rows, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "answers.jsonl")
+        output = os.path.join(tmp, "results.jsonl")
+        with open(source, "w", encoding="utf-8") as f:
+            for i, row in enumerate(matrix.tolist()):
+                f.write(json.dumps({"id": i, "answers": row}) + "\n")
+
+        baseline = None
+        print(f"{'进程数':<8} {'行/秒':>12} {'加速比':>8}")
+        for jobs in range(1, max_jobs + 1):
+            start = time.perf_counter()
+            batch.run(source, output, None, "jsonl", jobs=jobs,
+                      chunk_size=chunk_size, report_kind=report_kind)
+            rate = rows / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"{jobs:<8} {rate:>12,.0f} {rate / baseline:>7.2f}x")
+
+
+def bench_report(rows: int, repeat: int, seed: int):
+    """专业报告与简要报告的单份生成耗时（不使用缓存）"""
+    results = list(score_batch(_random_answers(rows, seed)).iter_results())
+    for name, func in (("专业报告", generate_professional_report), ("简要报告", generate_summary_report)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for result in results:
+                func(result)
+            best = min(best, (time.perf_counter() - start) / rows)
+        print(f"{name}：每份 {best * 1e6:.1f} µs（{rows} 份，取 {repeat} 次中最快）")
+
+
+async def _load_client(host: str, port: int, request: bytes, count: int, latencies: list):
+    """一个长连接客户端：顺序发送 count 个请求并记录每个请求的耗时"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            length = 0
+            status = await reader.readline()
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            assert status.split()[1] == b"200", status
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def _bench_server(requests: int, clients: int, batch_size: int, path: str,
+                        url: str, seed: int):
+    server = None
+    if url:
+        host, _, port = url.rpartition(":")
+        host, port = host.split("//")[-1], int(port)
+    else:
+        server = ScoringServer(max_concurrency=clients)
+        host, port = await server.start("127.0.0.1", 0)
+
+    sheets = [{"id": i, "answers": row} for i, row in enumerate(_random_answers(batch_size, seed).tolist())]
+    body = json.dumps(sheets if batch_size > 1 else sheets[0]).encode("utf-8")
+    request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+    latencies = []
+    per_client = requests // clients
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_client(host, port, request, per_client, latencies)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        await server.close()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{path}：{clients} 个长连接，共 {total} 个请求，每个请求 {batch_size} 份答卷")
+    print(f"吞吐量：{total / elapsed:,.0f} 请求/秒，{total * batch_size / elapsed:,.0f} 份/秒")
+    for q in (0.5, 0.9, 0.99):
+        print(f"p{int(q * 100)} 延迟：{latencies[min(total - 1, int(q * total))] * 1e3:.2f} ms")
+
+
+def bench_server(requests: int, clients: int, batch_size: int, path: str, url: str, seed: int):
+    """评分服务的本机压力测试（不指定 url 时在本进程内启动服务）"""
+    asyncio.run(_bench_server(requests, clients, batch_size, path, url, seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="霍兰德职业兴趣测试性能基准")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    batch_parser = sub.add_parser("batch", help="批量评分与逐份评分对比")
+    batch_parser.add_argument("--rows", type=int, default=200000, help="批量评分的答卷数")
+    batch_parser.add_argument("--loop-rows", type=int, default=20000, help="逐份评分的答卷数")
+    batch_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+
+    scaling_parser = sub.add_parser("scaling", help="多进程批量评分的扩展性")
+    scaling_parser.add_argument("--rows", type=int, default=20000, help="答卷数")
+    scaling_parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1, help="最大进程数")
+    scaling_parser.add_argument("--chunk-size", type=int, default=500, help="每批行数")
+    scaling_parser.add_argument("--report", choices=["none", "summary", "professional"],
+                                default="professional", help="报告类型")
+    scaling_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+
+    report_parser = sub.add_parser("report", help="单份报告生成耗时")
+    report_parser.add_argument("--rows", type=int, default=5000, help="报告数")
+    report_parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    report_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+
+    server_parser = sub.add_parser("server", help="评分服务压力测试")
+    server_parser.add_argument("--requests", type=int, default=20000, help="请求总数")
+    server_parser.add_argument("--clients", type=int, default=50, help="并发的长连接数")
+    server_parser.add_argument("--batch-size", type=int, default=1, help="每个请求的答卷数")
+    server_parser.add_argument("--path", choices=["/score", "/report", "/report?kind=summary"],
+                               default="/score", help="请求的接口")
+    server_parser.add_argument("--url", default="", help="已启动的服务地址，如 http://127.0.0.1:8765")
+    server_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+
+    imports_parser = sub.add_parser("imports", help="冷启动导入耗时（python -X importtime）")
+    imports_parser.add_argument("--module", default="holland_test.main", help="导入的模块")
+    imports_parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    imports_parser.add_argument("--top", type=int, default=15, help="显示耗时最多的模块数")
+
+    args = parser.parse_args()
+    if args.bench == "batch":
+        bench_batch(args.rows, args.loop_rows, args.seed)
+    elif args.bench == "scaling":
+        bench_scaling(args.rows, args.max_jobs, args.chunk_size, args.report, args.seed)
+    elif args.bench == "report":
+        bench_report(args.rows, args.repeat, args.seed)
+    elif args.bench == "server":
+        bench_server(args.requests, args.clients, args.batch_size, args.path, args.url, args.seed)
+    elif args.bench == "imports":
+        sys.exit(0 if bench_imports(args.module, args.repeat, args.top) else 1)
+
+
+if __name__ == "__main__":
+    main()
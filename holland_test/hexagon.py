@@ -0,0 +1,42 @@
+"""霍兰德六边形模型：类型在六边形上的排列与距离"""
+
+from typing import Tuple
+
+from .questions import HOLLAND_TYPES
+
+# 六边形上的类型顺序（R-I-A-S-E-C 依次相邻，C 与 R 相邻）
+HEXAGON_ORDER: Tuple[str, ...] = tuple(HOLLAND_TYPES.keys())
+
+_POSITION = {code: i for i, code in enumerate(HEXAGON_ORDER)}
+
+
+def _distance(i: int, j: int) -> int:
+    step = abs(i - j)
+    return min(step, len(HEXAGON_ORDER) - step)
+
+
+# 六边形距离矩阵（按 HEXAGON_ORDER 排列）：0 为同一类型，1 为相邻，2 为相隔，3 为相对
+HEXAGON_DISTANCE: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(_distance(i, j) for j in range(len(HEXAGON_ORDER)))
+    for i in range(len(HEXAGON_ORDER))
+)
+
+
+def hexagon_distance(type_a: str, type_b: str) -> int:
+    """两种类型在六边形上的距离（0-3）"""
+    return HEXAGON_DISTANCE[_POSITION[type_a]][_POSITION[type_b]]
+
+
+_DISTANCE_MATRIX = None
+
+
+def hexagon_distance_matrix():
+    """六边形距离矩阵的 numpy 版本（6×6，int8，只读，首次调用时构建）"""
+    global _DISTANCE_MATRIX
+    if _DISTANCE_MATRIX is None:
+        import numpy as np
+
+        matrix = np.array(HEXAGON_DISTANCE, dtype=np.int8)
+        matrix.setflags(write=False)
+        _DISTANCE_MATRIX = matrix
+    return _DISTANCE_MATRIX
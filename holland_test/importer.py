@@ -0,0 +1,309 @@
+"""问卷平台导出文件导入：将宽表（CSV/XLSX，每题一列）批量转换为答案矩阵
+
+导出文件的表头通过可配置的映射对应到题目ID，未配置映射时自动识别：
+
+- 列名为题目ID（如 "1"、"Q1"）
+- 列名与题目文本完全相同
+
+答案通过查找表归一化：整块原始值一次性映射为 0/1（C 层面的 dict 查找）后按映射取出题目列，
+查找表中没有的值才调用 parse_answer 识别并加入查找表，避免逐格解析。
+数据按块读取和转换，可直接输出 (N, 120) 的 0/1 矩阵或 (N, 15) 的 pack_matrix 压缩矩阵。
+
+读取 XLSX 需要 openpyxl（pip install openpyxl），CSV 只需要标准库。
+
+命令行：
+    python -m holland_test.importer export.xlsx -o answers.npy --packed --ids ids.txt
+    python -m holland_test.importer export.csv -o answers.npy --mapping mapping.json
+"""
+
+import argparse
+import csv
+import json
+import sys
+from dataclasses import dataclass, field
+from itertools import chain, islice, repeat
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import openpyxl
+except ImportError:  # 只导入 CSV 时不需要 openpyxl
+    openpyxl = None  # type: ignore
+
+from .answer_vector import VECTOR_BYTES, pack_matrix
+from .batch import _QUESTION_COLUMN
+from .main import parse_answer
+from .questions import QUESTION_BANK
+
+# 每块转换的行数
+BLOCK_ROWS = 65536
+
+# 查找表中表示无法识别的值
+_INVALID = -1
+
+# 常见导出值的初始查找表，其余取值首次出现时由 parse_answer 识别后加入
+_BASE_TOKENS = {
+    "是": 1, "否": 0, "Y": 1, "N": 0, "y": 1, "n": 0, "1": 1, "0": 0,
+    "Yes": 1, "No": 0, "yes": 1, "no": 0, "TRUE": 1, "FALSE": 0, "true": 1, "false": 0,
+    True: 1, False: 0, 1.0: 1, 0.0: 0,  # XLSX 中的布尔值和数值（1 与 True 的键相同）
+}
+
+
+@dataclass
+class ImportConfig:
+    """导入配置"""
+    columns: Optional[Dict[str, int]] = None  # 表头 -> 题目ID，None 表示自动识别
+    id_column: Optional[str] = "id"  # 答卷ID所在列的表头（不区分大小写），None 表示不读取ID
+    tokens: Dict[str, bool] = field(default_factory=dict)  # 额外的答案取值，如 {"非常同意": true}
+    sheet: Optional[str] = None  # XLSX 工作表名，None 表示第一个工作表
+
+    @classmethod
+    def load(cls, path: str) -> "ImportConfig":
+        """从 JSON 文件加载（字段与本类相同）"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        unknown = set(data) - {"columns", "id_column", "tokens", "sheet"}
+        if unknown:
+            raise ValueError(f"未知的导入配置项：{', '.join(sorted(unknown))}")
+        return cls(**data)
+
+
+class ImportLayout(NamedTuple):
+    """表头布局"""
+    header: Tuple[str, ...]
+    id_column: Optional[int]
+    columns: Tuple[int, ...]  # 第 j 道题（题库顺序）所在的列
+
+
+class ImportBlock(NamedTuple):
+    """一块导入结果"""
+    ids: List[Optional[str]]  # 有效答卷的ID（与矩阵的行对应）
+    answers: np.ndarray  # (行数, 120) 的 0/1 矩阵，或 (行数, 15) 的压缩矩阵
+    errors: List[Tuple[int, Optional[str], str]]  # (行号, 答卷ID, 错误信息)
+
+
+def _clean_header(name) -> str:
+    return "" if name is None else str(name).strip().lstrip("﻿")
+
+
+def read_layout(header: Iterable, config: Optional[ImportConfig] = None) -> ImportLayout:
+    """
+    按配置解析表头
+
+    Raises:
+        ValueError: 映射到的题目ID不在题库中，或缺少题目列
+    """
+    config = config or ImportConfig()
+    header = tuple(_clean_header(name) for name in header)
+    by_text = {q.text: q.id for q in QUESTION_BANK.questions}
+    id_name = config.id_column.lower() if config.id_column else None
+
+    id_column = None
+    found: Dict[int, int] = {}  # 题目ID -> 列
+    for col, name in enumerate(header):
+        if id_name is not None and name.lower() == id_name:
+            id_column = col
+            continue
+        if config.columns is not None:
+            qid = config.columns.get(name)
+        else:
+            match = _QUESTION_COLUMN.match(name)
+            qid = int(match.group(1)) if match else by_text.get(name)
+        if qid is None:
+            continue
+        if qid not in QUESTION_BANK.index_of:
+            raise ValueError(f"列 {name!r} 映射到未知的题目ID：{qid}")
+        if qid in found:
+            raise ValueError(f"题目 {qid} 对应多个列：{header[found[qid]]!r} 和 {name!r}")
+        found[qid] = col
+
+    missing = [qid for qid in QUESTION_BANK.ids if qid not in found]
+    if missing:
+        shown = ", ".join(map(str, missing[:10])) + (" ..." if len(missing) > 10 else "")
+        raise ValueError(f"表头缺少 {len(missing)} 道题目的列：{shown}")
+    return ImportLayout(header, id_column, tuple(found[qid] for qid in QUESTION_BANK.ids))
+
+
+class TokenTable:
+    """答案取值 -> 0/1 的查找表，未见过的取值首次出现时识别并缓存"""
+
+    def __init__(self, extra: Optional[Dict[str, bool]] = None):
+        self._table: Dict[object, int] = dict(_BASE_TOKENS)
+        for token, value in (extra or {}).items():
+            self._table[token] = self._table[token.strip()] = int(bool(value))
+
+    def _learn(self, token) -> int:
+        """识别查找表中没有的取值，无法识别时返回 _INVALID"""
+        if isinstance(token, str):
+            value = self._table.get(token.strip(), _INVALID)
+            if value == _INVALID:
+                parsed = parse_answer(token)
+                value = _INVALID if parsed is None else int(parsed)
+        elif isinstance(token, (int, float)) and token in (0, 1):
+            value = int(token)
+        else:
+            value = _INVALID
+        if token is not None and value != _INVALID:
+            self._table[token] = value
+        return value
+
+    def lookup(self, rows: List[Tuple], width: int, columns: Tuple[int, ...]) -> np.ndarray:
+        """
+        将一块行（每行 width 个取值）转换为 (行数, len(columns)) 的 int8 矩阵，无法识别的取值为 -1
+
+        整块按行主序一次查表后再取出题目列，比逐列转置后查表更快（访问顺序与行在内存中的顺序一致）
+        """
+        codes = np.fromiter(map(self._table.get, chain.from_iterable(rows), repeat(_INVALID)),
+                            dtype=np.int8, count=len(rows) * width).reshape(len(rows), width)[:, columns]
+        unknown = np.argwhere(codes == _INVALID)
+        if unknown.size:
+            learned: Dict[object, int] = {}
+            for row, j in unknown.tolist():
+                token = rows[row][columns[j]]
+                if token not in learned:
+                    learned[token] = self._learn(token)
+                codes[row, j] = learned[token]
+        return codes
+
+
+def convert_rows(rows: List[Tuple], layout: ImportLayout, table: TokenTable,
+                 first_line: int = 2, packed: bool = False,
+                 lines: Optional[Sequence[int]] = None) -> ImportBlock:
+    """
+    将一块原始行转换为答案矩阵
+
+    Args:
+        rows: 原始行（每行为各列取值的序列）
+        layout: 表头布局
+        table: 答案查找表
+        first_line: 第一行在文件中的行号（用于错误信息），lines 为 None 时其余行依次编号
+        packed: 是否输出压缩矩阵
+        lines: 各行在文件中的行号（文件中有空行等被跳过的行时由读取函数提供）
+    """
+    width = len(layout.header)
+    # 补齐短行、截去多余的列，使每行恰好 width 个取值
+    padded = [row if len(row) == width else (tuple(row) + (None,) * width)[:width] for row in rows]
+    matrix = table.lookup(padded, width, layout.columns)
+
+    if layout.id_column is None:
+        ids = [None] * len(rows)
+    else:
+        ids = [None if row[layout.id_column] is None else str(row[layout.id_column]) for row in padded]
+    invalid = (matrix == _INVALID).any(axis=1)
+    errors = []
+    for row in np.flatnonzero(invalid).tolist():
+        j = int(np.argmax(matrix[row] == _INVALID))
+        value = padded[row][layout.columns[j]]
+        problem = "缺少答案" if value is None or str(value).strip() == "" else f"的答案无法识别：{value!r}"
+        line = first_line + row if lines is None else lines[row]
+        errors.append((line, ids[row], f"第 {QUESTION_BANK.ids[j]} 题{problem}"))
+
+    valid = ~invalid
+    answers = matrix[valid].view(np.uint8)
+    return ImportBlock(
+        ids=[record_id for record_id, ok in zip(ids, valid.tolist()) if ok],
+        answers=pack_matrix(answers) if packed else answers,
+        errors=errors,
+    )
+
+
+def _csv_rows(path: str) -> Iterator[Tuple[int, Tuple]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        line = 1
+        for row in reader:
+            # 带引号的字段可以跨行，记录的起始行号是上一条记录结束后的下一行
+            if row:
+                yield line, tuple(row)
+            line = reader.line_num + 1
+
+
+def _xlsx_rows(path: str, sheet: Optional[str]) -> Iterator[Tuple[int, Tuple]]:
+    if openpyxl is None:
+        raise ImportError("读取 XLSX 需要 openpyxl，请运行：pip install openpyxl")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        for line, row in enumerate(worksheet.iter_rows(min_row=1, values_only=True), 1):
+            if any(value is not None for value in row):
+                yield line, row
+    finally:
+        workbook.close()
+
+
+def read_rows(path: str, config: Optional[ImportConfig] = None) -> Iterator[Tuple[int, Tuple]]:
+    """按文件扩展名读取非空的原始行，逐行返回 (行号, 各列取值)，第一行为表头"""
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        return _xlsx_rows(path, (config or ImportConfig()).sheet)
+    return _csv_rows(path)
+
+
+def iter_blocks(path: str, config: Optional[ImportConfig] = None, packed: bool = False,
+                block_rows: int = BLOCK_ROWS) -> Iterator[ImportBlock]:
+    """
+    逐块导入导出文件（内存占用取决于块大小）
+
+    Raises:
+        ValueError: 文件为空或表头不符合要求
+        ImportError: 读取 XLSX 但未安装 openpyxl
+    """
+    config = config or ImportConfig()
+    rows = read_rows(path, config)
+    first = next(rows, None)
+    if first is None:
+        raise ValueError(f"文件为空：{path}")
+    layout = read_layout(first[1], config)
+    table = TokenTable(config.tokens)
+    while True:
+        block = list(islice(rows, block_rows))
+        if not block:
+            return
+        lines, raw = zip(*block)
+        yield convert_rows(list(raw), layout, table, packed=packed, lines=lines)
+
+
+def import_answers(path: str, config: Optional[ImportConfig] = None, packed: bool = False) -> ImportBlock:
+    """导入整个导出文件，返回全部有效答卷的ID、答案矩阵和错误行"""
+    ids, chunks, errors = [], [], []
+    for block in iter_blocks(path, config, packed):
+        ids.extend(block.ids)
+        chunks.append(block.answers)
+        errors.extend(block.errors)
+    columns = VECTOR_BYTES if packed else len(QUESTION_BANK)
+    answers = np.concatenate(chunks) if chunks else np.zeros((0, columns), dtype=np.uint8)
+    return ImportBlock(ids, answers, errors)
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="导入问卷平台导出的答案文件（CSV/XLSX）")
+    parser.add_argument("input", help="导出文件（.csv 或 .xlsx）")
+    parser.add_argument("-o", "--output", required=True, help="答案矩阵文件（.npy）")
+    parser.add_argument("--packed", action="store_true", help="输出 (N, 15) 的压缩矩阵")
+    parser.add_argument("--mapping", help="导入配置文件（JSON：columns、id_column、tokens、sheet）")
+    parser.add_argument("--ids", help="答卷ID输出文件（每行一个，与矩阵的行对应）")
+    parser.add_argument("--errors", help="错误行文件（JSONL），默认只输出错误数")
+    args = parser.parse_args(argv)
+
+    try:
+        config = ImportConfig.load(args.mapping) if args.mapping else ImportConfig()
+        result = import_answers(args.input, config, args.packed)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+
+    np.save(args.output, result.answers)
+    if args.ids:
+        with open(args.ids, "w", encoding="utf-8") as f:
+            f.writelines(f"{'' if record_id is None else record_id}\n" for record_id in result.ids)
+    if args.errors:
+        with open(args.errors, "w", encoding="utf-8") as f:
+            for line_no, record_id, message in result.errors:
+                f.write(json.dumps({"line": line_no, "id": record_id, "error": message}, ensure_ascii=False) + "\n")
+    print(f"✓ 已导入 {len(result.ids)} 行，错误 {len(result.errors)} 行", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
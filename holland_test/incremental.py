@@ -0,0 +1,124 @@
+"""增量评分器：逐题更新得分，随时给出当前结果"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .answer_vector import AnswerVector
+from .questions import CATEGORIES, QUESTION_BANK
+from .scorer import TYPE_CODES, TestResult, calculate_percentages, determine_types
+
+
+class IncrementalScorer:
+    """
+    增量评分器
+
+    每次作答、修改或撤销只更新对应类型的计数（O(1)），
+    当前得分、百分比和前三类型可随时读取，无需重新评分。
+    任意时刻 result() 的返回值都与对已作答部分调用 score_test 的结果相同。
+    """
+
+    def __init__(self):
+        self._answers: Dict[int, bool] = {}
+        self._scores: Dict[str, int] = dict.fromkeys(TYPE_CODES, 0)
+        self._answered: Dict[str, int] = dict.fromkeys(TYPE_CODES, 0)
+        self._subscores: Dict[str, Dict[str, int]] = {code: dict.fromkeys(CATEGORIES, 0) for code in TYPE_CODES}
+        self._history: List[Tuple[int, Optional[bool]]] = []
+
+    def __len__(self) -> int:
+        """已作答的题目数"""
+        return len(self._answers)
+
+    def answer(self, question_id: int, answer: bool):
+        """
+        作答或修改某题的答案
+
+        Raises:
+            KeyError: 题目ID不在题库中
+        """
+        type_code = QUESTION_BANK.type_of[question_id]
+        previous = self._answers.get(question_id)
+        self._history.append((question_id, previous))
+        self._apply(question_id, type_code, previous, bool(answer))
+
+    def undo(self) -> Optional[int]:
+        """
+        撤销最近一次作答或修改
+
+        Returns:
+            被撤销的题目ID，没有可撤销的操作时返回 None
+        """
+        if not self._history:
+            return None
+        question_id, previous = self._history.pop()
+        type_code = QUESTION_BANK.type_of[question_id]
+        self._apply(question_id, type_code, self._answers.get(question_id), previous)
+        return question_id
+
+    def _apply(self, question_id: int, type_code: str, old: Optional[bool], new: Optional[bool]):
+        subscores = self._subscores[type_code]
+        category = QUESTION_BANK.category_of[question_id]
+        if old is not None:
+            self._scores[type_code] -= old
+            subscores[category] -= old
+            self._answered[type_code] -= 1
+        if new is None:
+            del self._answers[question_id]
+        else:
+            self._answers[question_id] = new
+            self._scores[type_code] += new
+            subscores[category] += new
+            self._answered[type_code] += 1
+
+    def get(self, question_id: int) -> Optional[bool]:
+        """获取某题当前的答案，未作答时返回 None"""
+        return self._answers.get(question_id)
+
+    @property
+    def scores(self) -> Dict[str, int]:
+        """当前各类型得分"""
+        return dict(self._scores)
+
+    @property
+    def subscores(self) -> Dict[str, Dict[str, int]]:
+        """当前类型×维度子分数"""
+        return {code: dict(row) for code, row in self._subscores.items()}
+
+    @property
+    def answered_counts(self) -> Dict[str, int]:
+        """各类型已作答的题目数"""
+        return dict(self._answered)
+
+    def percentages(self) -> Dict[str, float]:
+        """当前各类型百分比（以该类型全部题目数为分母，与 score_test 一致）"""
+        return calculate_percentages(self._scores, QUESTION_BANK.type_counts)
+
+    def answered_percentages(self) -> Dict[str, float]:
+        """各类型在已作答题目中回答"是"的比例（百分比），适合作为答题过程中的实时参考"""
+        return {
+            code: (self._scores[code] / answered * 100) if answered else 0.0
+            for code, answered in self._answered.items()
+        }
+
+    def top_types(self) -> Tuple[str, str, str]:
+        """当前的主要、次要和第三类型"""
+        return determine_types(self._scores)
+
+    def result(self) -> TestResult:
+        """当前的测试结果"""
+        primary, secondary, tertiary = self.top_types()
+        return TestResult(
+            scores=self.scores,
+            percentages=self.percentages(),
+            primary_type=primary,
+            secondary_type=secondary,
+            tertiary_type=tertiary,
+            type_combination=primary + secondary + tertiary,
+            subscores=self.subscores,
+        )
+
+    def answers(self) -> Dict[int, bool]:
+        """当前全部答案"""
+        return dict(self._answers)
+
+    def to_vector(self) -> AnswerVector:
+        """当前答案的紧凑表示（未作答的题目视为"否"）"""
+        return AnswerVector.from_dict(self._answers)
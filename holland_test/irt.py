@@ -0,0 +1,337 @@
+"""项目反应理论（IRT）：按类型量表标定 2PL 模型并估计潜在特质 θ
+
+每种类型的20道题构成一个单维量表，题目 j 回答"是"的概率为
+
+    P(是 | θ) = 1 / (1 + exp(-(a_j·θ + c_j)))，区分度 a_j，难度 b_j = -c_j / a_j
+
+θ 服从标准正态分布。标定使用 Bock-Aitkin EM（边际极大似然）：
+
+- 积分用 41 个等距求积点近似
+- E 步是答案模式矩阵与对数概率矩阵的矩阵乘法
+- M 步对全部题目同时做向量化的牛顿迭代
+- 相同的答案模式只计算一次（按出现次数加权），百万级答卷的计算量取决于不同模式的数量
+
+θ 的估计取后验均值（EAP），标准误为后验标准差：
+
+- 有逐题答案时按答案模式计算（theta_matrix）
+- 只有各类型得分时（如 TestResult）按 Lord-Wingersky 递推得到的"给定总分的后验"查表（theta_for_scores）
+
+题目参数与题库版本一同保存，加载时题库版本不一致即报错。
+
+命令行：
+    python -m holland_test.irt responses.npy -o irt_params.json
+"""
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .answer_vector import VECTOR_BYTES, unpack_matrix
+from .questions import QUESTION_BANK
+from .scorer import TYPE_CODES, TestResult
+
+QUADRATURE_POINTS = 41
+QUADRATURE_BOUND = 4.0
+
+# E 步和 θ 估计时每块处理的答案模式数
+CHUNK_ROWS = 65536
+
+# 区分度和难度的取值范围，防止完全分离（如全部答"是"或全部答"否"）的题目发散
+_MIN_DISCRIMINATION = 0.05
+_MAX_DISCRIMINATION = 8.0
+_MAX_DIFFICULTY = 2 * QUADRATURE_BOUND
+# 牛顿迭代中每步参数变化量的上限
+_MAX_STEP = 1.0
+
+
+def quadrature(points: int = QUADRATURE_POINTS, bound: float = QUADRATURE_BOUND) -> Tuple[np.ndarray, np.ndarray]:
+    """标准正态先验的等距求积点及归一化权重"""
+    nodes = np.linspace(-bound, bound, points)
+    weights = np.exp(-nodes ** 2 / 2)
+    return nodes, weights / weights.sum()
+
+
+def _scale_columns() -> Dict[str, np.ndarray]:
+    """类型 -> 该类型题目在题库中的下标"""
+    return {
+        code: np.array([QUESTION_BANK.index_of[qid] for qid in QUESTION_BANK.ids_by_type[code]])
+        for code in TYPE_CODES
+    }
+
+
+def _as_matrix(responses) -> np.ndarray:
+    responses = np.asarray(responses)
+    if responses.ndim == 2 and responses.shape[1] == VECTOR_BYTES and responses.dtype == np.uint8:
+        return unpack_matrix(responses)
+    if responses.ndim != 2 or responses.shape[1] != len(QUESTION_BANK):
+        raise ValueError(f"答案矩阵形状应为 (N, {len(QUESTION_BANK)})，实际为 {responses.shape}")
+    return responses
+
+
+def _log_probabilities(a: np.ndarray, c: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(题目数, 求积点数) 的 log P(是) 和 log P(否)"""
+    z = a[:, None] * nodes[None, :] + c[:, None]
+    return -np.logaddexp(0, -z), -np.logaddexp(0, z)
+
+
+def _posterior(patterns: np.ndarray, log_yes: np.ndarray, log_no: np.ndarray,
+               log_weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    各答案模式在求积点上的后验分布
+
+    Returns:
+        (后验, 边际对数似然)：(n, 求积点数) 和 (n,)
+    """
+    loglik = patterns @ (log_yes - log_no) + log_no.sum(axis=0) + log_weights
+    peak = loglik.max(axis=1, keepdims=True)
+    posterior = np.exp(loglik - peak)
+    marginal = posterior.sum(axis=1, keepdims=True)
+    posterior /= marginal
+    return posterior, (np.log(marginal) + peak)[:, 0]
+
+
+def _unique_patterns(responses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """将一个量表的答案矩阵合并为不同的答案模式及其出现次数"""
+    n_items = responses.shape[1]
+    bits = np.left_shift(np.int64(1), np.arange(n_items, dtype=np.int64))
+    keys, counts = np.unique(responses.astype(np.int64) @ bits, return_counts=True)
+    patterns = ((keys[:, None] & bits) != 0).astype(np.float64)
+    return patterns, counts.astype(np.float64)
+
+
+def calibrate_scale(responses, max_iter: int = 500, tol: float = 1e-6, newton_steps: int = 4,
+                    nodes: Optional[np.ndarray] = None,
+                    weights: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, float, int]:
+    """
+    标定一个量表的 2PL 参数
+
+    Args:
+        responses: (N, 题目数) 的 0/1 矩阵
+        max_iter: EM 最大迭代次数
+        tol: 对数似然的相对变化小于该值时停止
+
+    Returns:
+        (区分度 a, 难度 b, 边际对数似然, 迭代次数)
+    """
+    if nodes is None or weights is None:
+        nodes, weights = quadrature()
+    patterns, counts = _unique_patterns(np.asarray(responses))
+    total = counts.sum()
+    log_weights = np.log(weights)
+
+    endorsement = np.clip((patterns * counts[:, None]).sum(axis=0) / total, 0.01, 0.99)
+    a = np.ones(patterns.shape[1])
+    c = np.log(endorsement / (1 - endorsement)) * np.sqrt(1 + 0.34 ** 2)
+    previous = -np.inf
+    loglik = -np.inf
+
+    for iteration in range(1, max_iter + 1):
+        # E 步：各求积点上的期望人数 n_q 和期望"是"的人数 r_jq
+        log_yes, log_no = _log_probabilities(a, c, nodes)
+        expected_n = np.zeros(len(nodes))
+        expected_r = np.zeros((patterns.shape[1], len(nodes)))
+        loglik = 0.0
+        for start in range(0, len(counts), CHUNK_ROWS):
+            rows = slice(start, start + CHUNK_ROWS)
+            posterior, marginal = _posterior(patterns[rows], log_yes, log_no, log_weights)
+            posterior *= counts[rows, None]
+            expected_n += posterior.sum(axis=0)
+            expected_r += patterns[rows].T @ posterior
+            loglik += float(counts[rows] @ marginal)
+
+        # M 步：每道题独立的加权 logistic 回归，对全部题目同时做牛顿迭代
+        for _ in range(newton_steps):
+            p = 1 / (1 + np.exp(-(a[:, None] * nodes + c[:, None])))
+            residual = expected_r - expected_n * p
+            grad_a, grad_c = residual @ nodes, residual.sum(axis=1)
+            w = expected_n * p * (1 - p)
+            h_aa, h_ac, h_cc = w @ nodes ** 2, w @ nodes, w.sum(axis=1)
+            # 完全分离的题目 p(1-p) 下溢，海森矩阵退化，步长和参数都截断到有限范围内
+            det = np.maximum(h_aa * h_cc - h_ac ** 2, np.finfo(np.float64).tiny)
+            step_a = np.clip((h_cc * grad_a - h_ac * grad_c) / det, -_MAX_STEP, _MAX_STEP)
+            step_c = np.clip((h_aa * grad_c - h_ac * grad_a) / det, -_MAX_STEP, _MAX_STEP)
+            a = np.clip(a + step_a, _MIN_DISCRIMINATION, _MAX_DISCRIMINATION)
+            c = np.clip(c + step_c, -_MAX_DIFFICULTY * a, _MAX_DIFFICULTY * a)
+
+        if abs(loglik - previous) <= tol * abs(loglik):
+            break
+        previous = loglik
+
+    return a, -c / a, loglik, iteration
+
+
+@dataclass
+class IRTModel:
+    """标定后的 2PL 题目参数（按题库顺序排列）"""
+    discrimination: np.ndarray  # (题目数,) 区分度 a
+    difficulty: np.ndarray  # (题目数,) 难度 b
+    bank_version: str = QUESTION_BANK.version
+    n: int = 0  # 标定样本量
+    log_likelihood: Dict[str, float] = field(default_factory=dict)  # 类型 -> 边际对数似然
+    _tables: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict, repr=False, compare=False)
+
+    def _scale(self, columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """量表各题的斜率 a 和截距 c"""
+        a = self.discrimination[columns]
+        return a, -a * self.difficulty[columns]
+
+    def theta_matrix(self, responses) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        按逐题答案估计各类型的 θ（EAP）及标准误
+
+        Args:
+            responses: (N, 题目数) 的 0/1 矩阵或 (N, 15) 的压缩矩阵
+
+        Returns:
+            (θ, 标准误)：两个 (N, 6) 矩阵，列顺序为 TYPE_CODES
+        """
+        nodes, weights = quadrature()
+        log_weights = np.log(weights)
+        responses = np.asarray(responses)
+        theta = np.empty((responses.shape[0], len(TYPE_CODES)))
+        se = np.empty_like(theta)
+        scales = [(i, *self._scale(columns), columns) for i, columns in enumerate(_scale_columns().values())]
+        for start in range(0, responses.shape[0], CHUNK_ROWS):
+            rows = slice(start, start + CHUNK_ROWS)
+            chunk = _as_matrix(responses[rows]).astype(np.float64)
+            for i, a, c, columns in scales:
+                log_yes, log_no = _log_probabilities(a, c, nodes)
+                posterior, _ = _posterior(chunk[:, columns], log_yes, log_no, log_weights)
+                mean = posterior @ nodes
+                theta[rows, i] = mean
+                se[rows, i] = np.sqrt(np.maximum(posterior @ nodes ** 2 - mean ** 2, 0))
+        return theta, se
+
+    def summed_score_table(self, code: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        给定类型总分时 θ 的后验均值和标准差（Lord-Wingersky 递推）
+
+        Returns:
+            (θ, 标准误)：两个长度为 题目数+1 的数组，下标为总分
+        """
+        table = self._tables.get(code)
+        if table is None:
+            nodes, weights = quadrature()
+            a, c = self._scale(_scale_columns()[code])
+            p = 1 / (1 + np.exp(-(a[:, None] * nodes + c[:, None])))
+            # distribution[s, q]：θ 取第 q 个求积点时总分为 s 的概率
+            distribution = np.zeros((len(a) + 1, len(nodes)))
+            distribution[0] = 1.0
+            for j in range(len(a)):
+                distribution[1:j + 2] = distribution[1:j + 2] * (1 - p[j]) + distribution[:j + 1] * p[j]
+                distribution[0] *= 1 - p[j]
+            posterior = distribution * weights
+            posterior /= posterior.sum(axis=1, keepdims=True)
+            mean = posterior @ nodes
+            table = (mean, np.sqrt(np.maximum(posterior @ nodes ** 2 - mean ** 2, 0)))
+            self._tables[code] = table
+        return table
+
+    def theta_for_scores(self, scores) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        按各类型得分估计 θ 及标准误（查表，O(1)）
+
+        Args:
+            scores: (N, 6) 的得分矩阵（如 BatchResult.scores），列顺序为 TYPE_CODES
+
+        Returns:
+            (θ, 标准误)：两个 (N, 6) 矩阵
+        """
+        scores = np.asarray(scores, dtype=np.intp)
+        theta = np.empty(scores.shape)
+        se = np.empty(scores.shape)
+        for i, code in enumerate(TYPE_CODES):
+            mean, sd = self.summed_score_table(code)
+            theta[:, i], se[:, i] = mean[scores[:, i]], sd[scores[:, i]]
+        return theta, se
+
+    def theta_for_result(self, result: TestResult) -> Dict[str, Tuple[float, float]]:
+        """测试结果各类型的 (θ, 标准误)"""
+        estimates = {}
+        for code in TYPE_CODES:
+            mean, sd = self.summed_score_table(code)
+            estimates[code] = (float(mean[result.scores[code]]), float(sd[result.scores[code]]))
+        return estimates
+
+    def to_dict(self) -> Dict:
+        return {
+            "model": "2PL",
+            "bank_version": self.bank_version,
+            "n": self.n,
+            "log_likelihood": self.log_likelihood,
+            "items": [
+                {"id": qid, "type": t, "a": float(a), "b": float(b)}
+                for qid, t, a, b in zip(QUESTION_BANK.ids, QUESTION_BANK.types,
+                                        self.discrimination.tolist(), self.difficulty.tolist())
+            ],
+        }
+
+    def save(self, path: str):
+        """保存题目参数（JSON，含题库版本）"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, path: str) -> "IRTModel":
+        """
+        加载题目参数
+
+        Raises:
+            ValueError: 参数文件的题库版本与当前题库不一致
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("bank_version") != QUESTION_BANK.version:
+            raise ValueError(f"IRT 参数的题库版本 {data.get('bank_version')} 与当前题库 {QUESTION_BANK.version} 不一致")
+        items = {item["id"]: item for item in data["items"]}
+        return cls(
+            discrimination=np.array([items[qid]["a"] for qid in QUESTION_BANK.ids]),
+            difficulty=np.array([items[qid]["b"] for qid in QUESTION_BANK.ids]),
+            bank_version=data["bank_version"],
+            n=data.get("n", 0),
+            log_likelihood=data.get("log_likelihood", {}),
+        )
+
+
+def calibrate(responses, max_iter: int = 500, tol: float = 1e-6) -> IRTModel:
+    """
+    按类型分别标定全部题目的 2PL 参数
+
+    Args:
+        responses: (N, 题目数) 的 0/1 矩阵或 (N, 15) 的压缩矩阵
+
+    Returns:
+        标定后的模型
+    """
+    matrix = _as_matrix(responses)
+    discrimination = np.empty(len(QUESTION_BANK))
+    difficulty = np.empty(len(QUESTION_BANK))
+    log_likelihood = {}
+    nodes, weights = quadrature()
+    for code, columns in _scale_columns().items():
+        a, b, loglik, _ = calibrate_scale(matrix[:, columns], max_iter, tol, nodes=nodes, weights=weights)
+        discrimination[columns], difficulty[columns] = a, b
+        log_likelihood[code] = loglik
+    return IRTModel(discrimination, difficulty, n=int(matrix.shape[0]), log_likelihood=log_likelihood)
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="霍兰德职业兴趣测试 2PL IRT 标定")
+    parser.add_argument("responses", help="答案矩阵文件（.npy，(N, 120) 的 0/1 矩阵或 (N, 15) 的压缩矩阵）")
+    parser.add_argument("-o", "--output", default=f"irt_{QUESTION_BANK.version}.json", help="题目参数文件")
+    parser.add_argument("--max-iter", type=int, default=500, help="EM 最大迭代次数")
+    args = parser.parse_args(argv)
+
+    model = calibrate(np.load(args.responses, mmap_mode="r"), max_iter=args.max_iter)
+    model.save(args.output)
+    print(f"已标定 {model.n} 份答卷，题目参数已保存到 {args.output}")
+    for code in TYPE_CODES:
+        print(f"  {code}: 对数似然 {model.log_likelihood[code]:,.1f}")
+
+
+if __name__ == "__main__":
+    main()
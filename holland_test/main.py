@@ -1,19 +1,24 @@
 """霍兰德职业兴趣测试主程序 - 专业版"""
 
+import argparse
 import sys
 import io
 from datetime import datetime
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 # 设置UTF-8编码输出（解决Windows控制台编码问题）
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
-from .questions import get_all_questions
-from .report_generator import generate_professional_report, generate_summary_report
+# 自适应测试和报告生成模块在用到时才导入，缩短启动到显示欢迎信息的时间
+from .incremental import IncrementalScorer
+from .questions import HOLLAND_TYPES, get_all_questions
 from .scorer import score_test
 
+if TYPE_CHECKING:
+    from .adaptive import AdaptiveTest
+
 
 def print_welcome():
     """打印欢迎信息"""
@@ -37,6 +42,7 @@ def print_welcome():
     print("【答题方式】")
     print("• 输入 Y 或 y 或 1 或 是 表示\"是\"")
     print("• 输入 N 或 n 或 0 或 否 表示\"否\"")
+    print("• 输入 B 或 b 返回上一题修改答案")
     print("• 输入 Q 或 q 可以随时退出测试")
     print()
     print("=" * 80)
@@ -68,24 +74,46 @@ def parse_answer(answer: str) -> Optional[bool]:
     return None
 
 
-def get_answer(question_num: int, total: int) -> Optional[bool]:
-    """获取用户答案，确保输入有效"""
+# 返回上一题的输入
+BACK_COMMANDS = ['b', 'back', '上一题']
+
+# get_answer 的返回值：用户要求返回上一题
+GO_BACK = "back"
+
+
+def get_answer(question_num: int, total: int):
+    """
+    获取用户答案，确保输入有效
+    
+    Returns:
+        True/False 表示答案，None 表示退出，GO_BACK 表示返回上一题
+    """
     while True:
-        answer_input = input(f"[{question_num}/{total}] 请输入您的答案 (Y/N 或 Q退出): ").strip()
+        answer_input = input(f"[{question_num}/{total}] 请输入您的答案 (Y/N，B返回上一题，Q退出): ").strip()
         parsed = parse_answer(answer_input)
         
         if parsed is None:
             if answer_input.lower() in ['q', 'quit', 'exit', '退出']:
                 return None  # 用户要求退出
-            print("无效输入！请输入 Y(是) 或 N(否) 或 Q(退出)")
+            if answer_input.lower() in BACK_COMMANDS:
+                return GO_BACK
+            print("无效输入！请输入 Y(是) 或 N(否) 或 B(上一题) 或 Q(退出)")
             continue
         
         return parsed
 
 
+def print_standings(scorer: IncrementalScorer):
+    """显示当前的实时排名（基于已作答题目）"""
+    percentages = scorer.answered_percentages()
+    top = scorer.top_types()
+    standings = "，".join(f"{HOLLAND_TYPES[t]} {percentages[t]:.0f}%" for t in top)
+    print(f"当前领先：{standings}")
+
+
 def conduct_test() -> Optional[Dict[int, bool]]:
     """进行测试，收集答案"""
-    answers = {}
+    scorer = IncrementalScorer()
     questions = get_all_questions()
     total = len(questions)
     
@@ -99,26 +127,90 @@ def conduct_test() -> Optional[Dict[int, bool]]:
     print("-" * 80)
     print()
     
-    for i, question in enumerate(questions, 1):
+    index = 0
+    while index < total:
+        question = questions[index]
+        i = index + 1
         print(f"题目 {i}/{total}")
         print(f"{question.text}")
+        if scorer.get(question.id) is not None:
+            print(f"（当前答案：{'是' if scorer.get(question.id) else '否'}）")
         print()
         
         answer = get_answer(i, total)
         
+        if answer is GO_BACK:
+            if index == 0:
+                print("已经是第一题了。\n")
+            else:
+                index -= 1
+            continue
+        
         if answer is None:  # 用户要求退出
             confirm = input("确定要退出测试吗？未完成的进度将丢失 (Y/N): ").strip().lower()
             if confirm in ['y', 'yes', '是']:
                 return None
+            index += 1
             continue
         
-        answers[question.id] = answer
+        scorer.answer(question.id, answer)
+        index += 1
         
-        # 每10题显示一次进度
+        # 每10题显示一次进度和实时排名
         if i % 10 == 0:
-            print(f"\n已完成 {i}/{total} 题 ({i/total*100:.1f}%)，继续加油！\n")
+            print(f"\n已完成 {i}/{total} 题 ({i/total*100:.1f}%)，继续加油！")
+            print_standings(scorer)
+            print()
     
-    return answers
+    return scorer.answers()
+
+
+def conduct_adaptive_test(confidence: Optional[float] = None) -> Optional["AdaptiveTest"]:
+    """进行自适应测试：前三类型排序稳定后提前结束（confidence 为 None 时使用默认置信度）"""
+    from .adaptive import DEFAULT_CONFIDENCE, AdaptiveTest
+
+    test = AdaptiveTest(confidence=DEFAULT_CONFIDENCE if confidence is None else confidence)
+    total = len(get_all_questions())
+    
+    print("\n" + "=" * 80)
+    print("开始测试（自适应模式）...")
+    print("=" * 80)
+    print()
+    print("系统将根据您的回答选择题目，结果足够稳定时会提前结束。")
+    print()
+    print("-" * 80)
+    print()
+    
+    question = test.next_question()
+    while question is not None:
+        i = len(test) + 1
+        print(f"题目 {i}（最多 {total} 题）")
+        print(f"{question.text}")
+        print()
+        
+        answer = get_answer(i, total)
+        
+        if answer is GO_BACK:
+            print("自适应模式不支持返回上一题。\n")
+            continue
+        
+        if answer is None:  # 用户要求退出
+            confirm = input("确定要退出测试吗？未完成的进度将丢失 (Y/N): ").strip().lower()
+            if confirm in ['y', 'yes', '是']:
+                return None
+            continue
+        
+        test.answer(question.id, answer)
+        
+        if len(test) % 10 == 0:
+            print(f"\n已完成 {len(test)} 题，结果稳定度 {test.confidence() * 100:.0f}%")
+            print_standings(test.scorer)
+            print()
+        
+        question = test.next_question()
+    
+    print(f"\n共作答 {len(test)} 题，结果稳定度 {test.confidence() * 100:.0f}%。")
+    return test
 
 
 def save_result(report: str, filename: str = None):
@@ -137,8 +229,14 @@ def save_result(report: str, filename: str = None):
         return None
 
 
-def main():
+def main(argv=None):
     """主函数"""
+    parser = argparse.ArgumentParser(description="霍兰德职业兴趣测试")
+    parser.add_argument("--adaptive", action="store_true", help="自适应模式：结果稳定后提前结束")
+    parser.add_argument("--confidence", type=float, default=None,
+                        help="自适应模式结束测试的置信度（默认 0.95）")
+    args = parser.parse_args(argv)
+    
     print_welcome()
     
     # 询问是否开始测试
@@ -148,7 +246,11 @@ def main():
         return
     
     # 进行测试
-    answers = conduct_test()
+    if args.adaptive:
+        test = conduct_adaptive_test(args.confidence)
+        answers = test.scorer.answers() if test is not None else None
+    else:
+        answers = conduct_test()
     
     if answers is None:
         print("\n测试已中断。")
@@ -163,15 +265,17 @@ def main():
     print("=" * 80)
     print()
     
+    from .report_generator import TIMESTAMP_PLACEHOLDER, generate_professional_report, generate_summary_report
+
     # 计算结果
-    result = score_test(answers)
+    result = test.result() if args.adaptive else score_test(answers)
     
     # 生成专业报告
     report = generate_professional_report(result)
     
     # 替换报告中的时间戳
     timestamp = datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")
-    report = report.replace("报告生成时间：请填写实际时间", f"报告生成时间：{timestamp}")
+    report = report.replace(TIMESTAMP_PLACEHOLDER, f"报告生成时间：{timestamp}")
     
     # 显示报告
     print(report)
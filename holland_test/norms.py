@@ -0,0 +1,150 @@
+"""人群常模：按类型和群组统计得分分布，给出得分在人群中的百分位
+
+每种类型的得分是 0 到该类型题目数（20）之间的整数，取值只有21种，
+因此直接保存每个得分的人数（精确直方图），无需近似的分位数草图：
+更新为 O(1)，合并为数组相加，百分位查表为 O(1)，结果没有近似误差。
+
+多个工作进程各自统计后可以合并，常模可保存为 JSON 文件。
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .questions import QUESTION_BANK
+from .scorer import TYPE_CODES, TestResult
+
+# 全体测试者所在的群组，每次更新都同时计入
+ALL_COHORT = "*"
+
+MAX_SCORE = max(QUESTION_BANK.type_counts.values())
+_BINS = MAX_SCORE + 1
+
+
+class PopulationNorms:
+    """按群组和类型统计的得分分布"""
+
+    def __init__(self):
+        self._counts: Dict[str, np.ndarray] = {}  # 群组 -> (6, 21) 各得分的人数
+        self._tables: Dict[str, np.ndarray] = {}  # 群组 -> (6, 21) 各得分的百分位，更新后重建
+
+    @property
+    def cohorts(self) -> List[str]:
+        """已有数据的群组"""
+        return list(self._counts)
+
+    def _histogram(self, cohort: str) -> np.ndarray:
+        histogram = self._counts.get(cohort)
+        if histogram is None:
+            histogram = self._counts[cohort] = np.zeros((len(TYPE_CODES), _BINS), dtype=np.int64)
+        self._tables.pop(cohort, None)
+        return histogram
+
+    def _targets(self, cohort: Optional[str]) -> Iterable[np.ndarray]:
+        yield self._histogram(ALL_COHORT)
+        if cohort is not None and cohort != ALL_COHORT:
+            yield self._histogram(cohort)
+
+    def update(self, result: TestResult, cohort: Optional[str] = None):
+        """计入一个测试结果"""
+        for histogram in self._targets(cohort):
+            for row, code in enumerate(TYPE_CODES):
+                histogram[row, result.scores[code]] += 1
+
+    def update_batch(self, scores, cohort: Optional[str] = None):
+        """
+        计入一批得分
+
+        Args:
+            scores: (N, 6) 的得分矩阵（如 BatchResult.scores），列顺序为 TYPE_CODES
+        """
+        scores = np.asarray(scores, dtype=np.int64)
+        if scores.ndim != 2 or scores.shape[1] != len(TYPE_CODES):
+            raise ValueError(f"得分矩阵形状应为 (N, {len(TYPE_CODES)})，实际为 {scores.shape}")
+        if scores.size and (scores.min() < 0 or scores.max() > MAX_SCORE):
+            raise ValueError(f"得分应在 0 到 {MAX_SCORE} 之间")
+        keys = scores + np.arange(len(TYPE_CODES)) * _BINS
+        counts = np.bincount(keys.ravel(), minlength=len(TYPE_CODES) * _BINS)
+        counts = counts.reshape(len(TYPE_CODES), _BINS)
+        for histogram in self._targets(cohort):
+            histogram += counts
+
+    def merge(self, other: "PopulationNorms") -> "PopulationNorms":
+        """将另一份常模（如其他工作进程的统计）合并到本常模，返回本常模"""
+        for cohort, counts in other._counts.items():
+            self._histogram(cohort)[...] += counts
+        return self
+
+    def total(self, cohort: Optional[str] = None) -> int:
+        """群组的人数（cohort 为 None 表示全体测试者）"""
+        histogram = self._counts.get(cohort or ALL_COHORT)
+        return 0 if histogram is None else int(histogram[0].sum())
+
+    def _table(self, cohort: Optional[str]) -> np.ndarray:
+        cohort = cohort or ALL_COHORT
+        table = self._tables.get(cohort)
+        if table is None:
+            histogram = self._counts.get(cohort)
+            if histogram is None or not histogram[0].sum():
+                raise KeyError(f"群组没有常模数据：{cohort}")
+            # 百分位取中位秩：低于该得分的人数加上同分人数的一半
+            below = np.cumsum(histogram, axis=1) - histogram
+            total = histogram.sum(axis=1, keepdims=True)
+            table = (below + histogram / 2) / total * 100
+            table.setflags(write=False)
+            self._tables[cohort] = table
+        return table
+
+    def percentile(self, type_code: str, score: int, cohort: Optional[str] = None) -> float:
+        """
+        得分在群组中的百分位（0-100），cohort 为 None 表示全体测试者
+
+        Raises:
+            KeyError: 群组没有数据
+        """
+        return float(self._table(cohort)[TYPE_CODES.index(type_code), score])
+
+    def percentiles(self, result: TestResult, cohort: Optional[str] = None) -> Dict[str, float]:
+        """测试结果各类型得分的百分位"""
+        table = self._table(cohort)
+        return {code: float(table[row, result.scores[code]]) for row, code in enumerate(TYPE_CODES)}
+
+    def percentile_matrix(self, scores, cohort: Optional[str] = None) -> np.ndarray:
+        """(N, 6) 得分矩阵对应的百分位矩阵"""
+        scores = np.asarray(scores, dtype=np.intp)
+        return self._table(cohort)[np.arange(len(TYPE_CODES)), scores]
+
+    def to_dict(self) -> Dict:
+        """可序列化为 JSON 的表示"""
+        return {
+            "bank_version": QUESTION_BANK.version,
+            "type_codes": list(TYPE_CODES),
+            "counts": {cohort: counts.tolist() for cohort, counts in self._counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PopulationNorms":
+        """
+        从 to_dict 的结果恢复
+
+        Raises:
+            ValueError: 题库版本与当前题库不一致
+        """
+        if data.get("bank_version") != QUESTION_BANK.version or tuple(data.get("type_codes", ())) != TYPE_CODES:
+            raise ValueError(f"常模的题库版本 {data.get('bank_version')} 与当前题库 {QUESTION_BANK.version} 不一致")
+        norms = cls()
+        for cohort, counts in data["counts"].items():
+            norms._counts[cohort] = np.array(counts, dtype=np.int64).reshape(len(TYPE_CODES), _BINS)
+        return norms
+
+    def save(self, path: str):
+        """保存为 JSON 文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "PopulationNorms":
+        """从 JSON 文件加载"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,199 @@
+"""职业剖面索引：将答卷者的六维兴趣剖面与职业库匹配
+
+每个职业带有一个 RIASEC 剖面（六种类型的权重），匹配方式有两种：
+
+- cosine：答卷者百分比向量与职业剖面的余弦相似度（0-1）
+- congruence：双方三字母类型代码的 C 指数（Brown & Gore, 1994），
+  按位置比较六边形距离，C = 3·(3-d₁) + 2·(3-d₂) + (3-d₃)，取值 0-18
+
+职业库可从 CSV（列：name, R, I, A, S, E, C）或 JSON 文件加载，
+也可由 analysis 中的内置职业列表构建。
+"""
+
+import csv
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .analysis import congruence_batch
+from .scorer import TYPE_CODES, TestResult
+
+METHODS = ("cosine", "congruence")
+
+# 职业数不少于该值且已安装 scipy 时，余弦匹配默认使用 KD 树
+TREE_THRESHOLD = 20000
+
+
+class OccupationIndex:
+    """职业剖面索引"""
+
+    def __init__(self, names: Sequence[str], profiles, use_tree: Optional[bool] = None):
+        """
+        Args:
+            names: 职业名称
+            profiles: (M, 6) 的职业剖面，列顺序为 TYPE_CODES，数值非负
+            use_tree: 余弦匹配是否使用 KD 树，None 表示按职业数和 scipy 是否可用自动决定
+        """
+        profiles = np.asarray(profiles, dtype=np.float64)
+        if profiles.ndim != 2 or profiles.shape[1] != len(TYPE_CODES):
+            raise ValueError(f"职业剖面形状应为 (M, {len(TYPE_CODES)})，实际为 {profiles.shape}")
+        if len(names) != profiles.shape[0]:
+            raise ValueError(f"职业名称数 {len(names)} 与剖面数 {profiles.shape[0]} 不一致")
+        if (profiles < 0).any():
+            raise ValueError("职业剖面不能包含负数")
+
+        self.names: Tuple[str, ...] = tuple(names)
+        self.profiles = profiles
+        norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+        self._unit = np.divide(profiles, norms, out=np.zeros_like(profiles), where=norms > 0)
+        # 职业的三字母代码（剖面权重降序，同权重按 TYPE_CODES 顺序）
+        self.codes = np.argsort(-profiles, axis=1, kind="stable")[:, :3]
+
+        # scipy 只在确实需要建树时导入，小职业库不承担其导入耗时
+        cKDTree = None
+        if use_tree or (use_tree is None and len(self.names) >= TREE_THRESHOLD):
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:  # 未安装 scipy 时使用暴力搜索
+                pass
+        if use_tree is None:
+            use_tree = cKDTree is not None
+        if use_tree and cKDTree is None:
+            raise ImportError("KD 树匹配需要 scipy，请运行：pip install scipy")
+        # 单位向量之间的欧氏距离 d 与余弦相似度满足 cos = 1 - d²/2，最近邻即最相似
+        self._tree = cKDTree(self._unit) if use_tree else None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def load(cls, path: str, **options) -> "OccupationIndex":
+        """
+        从数据文件加载职业库
+
+        CSV：首行为表头，包含 name 列和 R, I, A, S, E, C 六列。
+        JSON：职业对象列表，每个对象包含 "name" 和 "profile"（{类型: 权重}）
+        或 "code"（如 "RIA"，依次记为 3、2、1）。
+        """
+        names: List[str] = []
+        rows: List[List[float]] = []
+        if path.lower().endswith(".csv"):
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                for record in csv.DictReader(f):
+                    names.append(record["name"])
+                    rows.append([float(record[code] or 0) for code in TYPE_CODES])
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                for record in json.load(f):
+                    names.append(record["name"])
+                    rows.append(_profile_from_record(record))
+        return cls(names, np.array(rows, dtype=np.float64).reshape(-1, len(TYPE_CODES)), **options)
+
+    @classmethod
+    def from_career_suggestions(cls, **options) -> "OccupationIndex":
+        """
+        由内置的 CAREER_SUGGESTIONS 和 TYPE_COMBINATIONS 构建职业库
+
+        职业每出现在一个类型的职业列表中，该类型的权重加 1。
+        """
+        from .analysis import CAREER_SUGGESTIONS, TYPE_COMBINATIONS
+
+        weights: Dict[str, List[float]] = {}
+        column = {code: i for i, code in enumerate(TYPE_CODES)}
+        for type_code, careers in CAREER_SUGGESTIONS.items():
+            for career in careers:
+                weights.setdefault(career, [0.0] * len(TYPE_CODES))[column[type_code]] += 1
+        for combo_code, combo in TYPE_COMBINATIONS.items():
+            for career in combo["careers"]:
+                profile = weights.setdefault(career, [0.0] * len(TYPE_CODES))
+                for type_code in combo_code:
+                    profile[column[type_code]] += 1
+        names = list(weights)
+        return cls(names, np.array([weights[n] for n in names]), **options)
+
+    def scores(self, percentages, method: str = "cosine"):
+        """
+        计算答卷者与全部职业的匹配分
+
+        Args:
+            percentages: (N, 6) 的百分比矩阵（列顺序为 TYPE_CODES），或单个长度为 6 的向量
+            method: cosine 或 congruence
+
+        Returns:
+            (N, M) 的匹配分矩阵
+        """
+        person = np.atleast_2d(np.asarray(percentages, dtype=np.float64))
+        if method == "cosine":
+            norms = np.linalg.norm(person, axis=1, keepdims=True)
+            unit = np.divide(person, norms, out=np.zeros_like(person), where=norms > 0)
+            # 保留 12 位小数，使数学上相等的相似度不因浮点误差改变排序
+            return np.round(unit @ self._unit.T, 12)
+        if method == "congruence":
+            person_codes = np.argsort(-person, axis=1, kind="stable")[:, :3]
+            return congruence_batch(person_codes[:, None, :], self.codes[None, :, :])
+        raise ValueError(f"未知的匹配方式：{method}，可选：{', '.join(METHODS)}")
+
+    def top_k(self, percentages, k: int = 10, method: str = "cosine"):
+        """
+        返回每个答卷者匹配度最高的 k 个职业
+
+        匹配分相同时按职业在库中的顺序排列。
+
+        Returns:
+            (indices, scores)：两个 (N, k) 矩阵
+        """
+        k = min(k, len(self))
+        if method == "cosine" and self._tree is not None:
+            return self._tree_top_k(percentages, k)
+
+        scores = self.scores(percentages, method)
+        # 先用 argpartition 取出候选，再稳定排序，保证同分时的顺序确定
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            threshold = np.take_along_axis(scores, candidates, axis=1).min(axis=1, keepdims=True)
+            order = np.argsort(-np.where(scores >= threshold, scores, -np.inf), axis=1, kind="stable")[:, :k]
+        else:
+            order = np.argsort(-scores, axis=1, kind="stable")
+        return order, np.take_along_axis(scores, order, axis=1)
+
+    def _tree_top_k(self, percentages, k: int):
+        person = np.atleast_2d(np.asarray(percentages, dtype=np.float64))
+        norms = np.linalg.norm(person, axis=1)
+        # 全零剖面与所有职业的匹配分都为 0（与 scores 一致），按库中顺序取前 k 个；
+        # 它到各单位向量的距离都是 1，不能交给 KD 树（会得到 0.5）
+        top_indices = np.tile(np.arange(k), (len(person), 1))
+        top_scores = np.zeros((len(person), k))
+        rows = np.flatnonzero(norms > 0)
+        if not len(rows):
+            return top_indices, top_scores
+        unit = person[rows] / norms[rows, None]
+        # KD 树对等距候选的返回顺序不确定：第 k 名存在并列时扩大查询范围取全并列者，
+        # 再按（匹配分降序，库中顺序）重排，使结果与暴力搜索一致
+        width = min(k + 1, len(self))
+        while True:
+            distances, indices = self._tree.query(unit, k=width)
+            indices = indices.reshape(len(rows), width)
+            scores = np.round(1.0 - distances.reshape(len(rows), width) ** 2 / 2.0, 12)
+            if width >= len(self) or not (scores[:, -1] == scores[:, k - 1]).any():
+                break
+            width = min(width * 2, len(self))
+        order = np.lexsort((indices, -scores), axis=1)[:, :k]
+        top_indices[rows] = np.take_along_axis(indices, order, axis=1)
+        top_scores[rows] = np.take_along_axis(scores, order, axis=1)
+        return top_indices, top_scores
+
+    def match(self, result: TestResult, k: int = 10, method: str = "cosine") -> List[Tuple[str, float]]:
+        """为单个测试结果返回 [(职业名称, 匹配分)]"""
+        vector = [result.percentages[code] for code in TYPE_CODES]
+        indices, scores = self.top_k(vector, k, method)
+        return [(self.names[i], float(s)) for i, s in zip(indices[0].tolist(), scores[0].tolist())]
+
+
+def _profile_from_record(record: Dict) -> List[float]:
+    if "profile" in record:
+        return [float(record["profile"].get(code, 0)) for code in TYPE_CODES]
+    profile = [0.0] * len(TYPE_CODES)
+    for weight, type_code in zip((3, 2, 1), record["code"]):
+        profile[TYPE_CODES.index(type_code)] = float(weight)
+    return profile
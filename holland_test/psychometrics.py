@@ -0,0 +1,250 @@
+"""题库的心理测量学分析：信度、题目区分度和量表间相关
+
+所有统计量都由答案矩阵的均值向量和协方差矩阵（120×120）推导：
+
+- 题目认可率：各题回答"是"的比例（均值）
+- Cronbach's α：按类型（及类型×维度的子量表）计算
+- 校正的题总相关：题目与同量表其余题目之和的相关
+- 删除该题后的 α
+- 量表间相关矩阵：六个类型得分之间的相关（6×6）
+
+协方差用可合并的矩阵累加器分块计算（Chan 等人的成对合并公式），
+数据可以分块从磁盘读入，内存占用只取决于块大小，与样本量无关。
+
+命令行：
+    python -m holland_test.psychometrics responses.npy
+    （(N, 120) 的 0/1 矩阵或 (N, 15) 的 pack_matrix 压缩矩阵，以内存映射方式分块读取）
+"""
+
+import argparse
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .answer_vector import VECTOR_BYTES, unpack_matrix
+from .questions import CATEGORIES, HOLLAND_TYPES, QUESTION_BANK
+from .scorer import TYPE_CODES, get_incidence_matrix
+
+# 分块计算时每块的行数
+CHUNK_ROWS = 65536
+
+
+class ResponseMoments:
+    """答案矩阵的样本数、均值向量和离差平方和矩阵（可分块更新、可合并）"""
+
+    def __init__(self, n_items: int = len(QUESTION_BANK)):
+        self.n = 0
+        self.mean = np.zeros(n_items)
+        self.comoment = np.zeros((n_items, n_items))  # Σ (x - 均值)(x - 均值)ᵀ
+
+    def update(self, responses) -> "ResponseMoments":
+        """
+        计入一块答案
+
+        Args:
+            responses: (n, 题目数) 的 0/1 矩阵，或 (n, 15) 的 pack_matrix 压缩矩阵
+        """
+        responses = np.asarray(responses)
+        for start in range(0, responses.shape[0], CHUNK_ROWS):
+            # 逐块解压和转换，内存映射的大文件也只有当前块被读入内存
+            chunk = _as_matrix(responses[start:start + CHUNK_ROWS]).astype(np.float64)
+            other = ResponseMoments(chunk.shape[1])
+            other.n = chunk.shape[0]
+            other.mean = chunk.mean(axis=0)
+            centered = chunk - other.mean
+            other.comoment = centered.T @ centered
+            self.merge(other)
+        return self
+
+    def merge(self, other: "ResponseMoments") -> "ResponseMoments":
+        """合并另一个累加器（如其他进程或其他文件的统计），返回本累加器"""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.comoment = other.n, other.mean.copy(), other.comoment.copy()
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.n * other.n / n)
+        self.mean = self.mean + delta * (other.n / n)
+        self.n = n
+        return self
+
+    def covariance(self) -> np.ndarray:
+        """样本协方差矩阵"""
+        if self.n < 2:
+            raise ValueError("计算协方差至少需要两份答卷")
+        return self.comoment / (self.n - 1)
+
+
+class ItemStatistics(NamedTuple):
+    """单个题目的统计量"""
+    question_id: int
+    type: str
+    category: str
+    endorsement: float  # 认可率（回答"是"的比例）
+    item_total_correlation: float  # 与同类型其余题目之和的相关
+    alpha_if_deleted: float  # 删除该题后所属类型量表的 α
+
+
+class ReliabilityReport(NamedTuple):
+    """信度分析结果"""
+    n: int  # 样本量
+    alpha: Dict[str, float]  # 类型 -> α
+    category_alpha: Dict[str, Dict[str, float]]  # 类型 -> 维度 -> 子量表 α（题目不足两道时为 nan）
+    items: Dict[str, Dict[str, List[ItemStatistics]]]  # 类型 -> 维度 -> 题目统计
+    scale_correlations: np.ndarray  # (6, 6) 类型得分的相关矩阵，行列顺序为 TYPE_CODES
+    endorsement: np.ndarray  # (题目数,) 按题库顺序
+    item_total_correlation: np.ndarray  # (题目数,)
+    alpha_if_deleted: np.ndarray  # (题目数,)
+
+
+def _as_matrix(responses) -> np.ndarray:
+    responses = np.asarray(responses)
+    if responses.ndim != 2:
+        raise ValueError(f"答案矩阵应为二维，实际为 {responses.ndim} 维")
+    if responses.shape[1] == VECTOR_BYTES and responses.dtype == np.uint8:
+        return unpack_matrix(responses)
+    if responses.shape[1] != len(QUESTION_BANK):
+        raise ValueError(f"答案矩阵应有 {len(QUESTION_BANK)} 列，实际为 {responses.shape[1]} 列")
+    return responses
+
+
+def _cronbach_alpha(n_items: np.ndarray, item_variance_sum: np.ndarray,
+                    total_variance: np.ndarray) -> np.ndarray:
+    """α = k/(k-1) · (1 - 各题方差之和 / 总分方差)，k < 2 或总分方差为 0 时为 nan"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha = n_items / (n_items - 1) * (1 - item_variance_sum / total_variance)
+    return np.where((n_items >= 2) & (total_variance > 0), alpha, np.nan)
+
+
+def _scale_matrix(groups: List[Tuple[int, ...]]) -> np.ndarray:
+    """(题目数, 量表数) 的 0/1 矩阵，第 s 列标记第 s 个量表包含的题目"""
+    matrix = np.zeros((len(QUESTION_BANK), len(groups)))
+    for column, ids in enumerate(groups):
+        for qid in ids:
+            matrix[QUESTION_BANK.index_of[qid], column] = 1.0
+    return matrix
+
+
+def reliability(moments: ResponseMoments) -> ReliabilityReport:
+    """由累加的矩计算全部信度统计量"""
+    cov = moments.covariance()
+    item_var = np.diag(cov)
+    scales = get_incidence_matrix().astype(np.float64)  # (题目数, 6)
+
+    # 类型量表：总分方差 = 1ᵀΣ1，各题方差之和 = Σ 对角线之和
+    item_scale_cov = cov @ scales  # (题目数, 6) 每道题与各类型总分的协方差
+    scale_cov = scales.T @ item_scale_cov  # (6, 6)
+    scale_var = np.diag(scale_cov)
+    n_items = scales.sum(axis=0)
+    alpha = _cronbach_alpha(n_items, item_var @ scales, scale_var)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale_sd = np.sqrt(scale_var)
+        scale_correlations = scale_cov / np.outer(scale_sd, scale_sd)
+
+        # 每道题所属量表的统计量，按题目展开
+        own = scales.argmax(axis=1)
+        rows = np.arange(len(own))
+        cov_with_own = item_scale_cov[rows, own]
+        own_var, own_k = scale_var[own], n_items[own]
+        own_item_var_sum = (item_var @ scales)[own]
+
+        # 题目与其余题目之和：cov(i, S - i) = cov(i, S) - var(i)，var(S - i) = var(S) - 2cov(i, S) + var(i)
+        rest_var = own_var - 2 * cov_with_own + item_var
+        item_total = (cov_with_own - item_var) / np.sqrt(item_var * rest_var)
+        alpha_if_deleted = _cronbach_alpha(own_k - 1, own_item_var_sum - item_var, rest_var)
+
+    # 类型×维度子量表
+    pairs = [(code, category) for code in TYPE_CODES for category in CATEGORIES]
+    category_ids = {category: set(QUESTION_BANK.ids_by_category.get(category, ())) for category in CATEGORIES}
+    groups = [tuple(qid for qid in QUESTION_BANK.ids_by_type[code] if qid in category_ids[category])
+              for code, category in pairs]
+    sub = _scale_matrix(groups)
+    sub_var = np.einsum("is,ij,js->s", sub, cov, sub)
+    sub_alpha = _cronbach_alpha(sub.sum(axis=0), item_var @ sub, sub_var)
+    category_alpha: Dict[str, Dict[str, float]] = {code: {} for code in TYPE_CODES}
+    for (code, category), value in zip(pairs, sub_alpha.tolist()):
+        category_alpha[code][category] = value
+
+    items: Dict[str, Dict[str, List[ItemStatistics]]] = {
+        code: {category: [] for category in CATEGORIES} for code in TYPE_CODES
+    }
+    for index, question in enumerate(QUESTION_BANK.questions):
+        items[question.type].setdefault(question.category, []).append(ItemStatistics(
+            question_id=question.id,
+            type=question.type,
+            category=question.category,
+            endorsement=float(moments.mean[index]),
+            item_total_correlation=float(item_total[index]),
+            alpha_if_deleted=float(alpha_if_deleted[index]),
+        ))
+
+    return ReliabilityReport(
+        n=moments.n,
+        alpha=dict(zip(TYPE_CODES, alpha.tolist())),
+        category_alpha=category_alpha,
+        items=items,
+        scale_correlations=scale_correlations,
+        endorsement=moments.mean.copy(),
+        item_total_correlation=item_total,
+        alpha_if_deleted=alpha_if_deleted,
+    )
+
+
+def analyze(responses) -> ReliabilityReport:
+    """
+    分析一个答案矩阵
+
+    Args:
+        responses: (N, 题目数) 的 0/1 矩阵或 (N, 15) 的压缩矩阵，可以是 numpy.memmap
+    """
+    return reliability(ResponseMoments().update(responses))
+
+
+def analyze_chunks(chunks: Iterable) -> ReliabilityReport:
+    """分析逐块产出的答案矩阵（适合无法一次载入内存的数据）"""
+    moments = ResponseMoments()
+    for chunk in chunks:
+        moments.update(chunk)
+    return reliability(moments)
+
+
+def format_report(report: ReliabilityReport, min_item_total: float = 0.2) -> str:
+    """将分析结果格式化为文本，题总相关低于 min_item_total 的题目标记为 ⚠"""
+    lines = [f"样本量：{report.n}", "", "各类型信度（Cronbach's α）："]
+    for code in TYPE_CODES:
+        subscales = "，".join(f"{category} {value:.3f}"
+                             for category, value in report.category_alpha[code].items()
+                             if not np.isnan(value))
+        lines.append(f"  {HOLLAND_TYPES[code]}: α = {report.alpha[code]:.3f}（{subscales}）")
+
+    lines.extend(["", "类型得分相关矩阵：", "      " + "".join(f"{code:>8}" for code in TYPE_CODES)])
+    for code, row in zip(TYPE_CODES, report.scale_correlations.tolist()):
+        lines.append(f"  {code:<4}" + "".join(f"{value:>8.3f}" for value in row))
+
+    lines.extend(["", "题目统计（认可率 / 校正题总相关 / 删除后 α）："])
+    for code in TYPE_CODES:
+        lines.append(f"【{HOLLAND_TYPES[code]}】")
+        for category, stats in report.items[code].items():
+            for item in stats:
+                flag = " ⚠" if item.item_total_correlation < min_item_total else ""
+                lines.append(f"  Q{item.question_id:<4} {category:<9} {item.endorsement:6.3f} "
+                             f"{item.item_total_correlation:7.3f} {item.alpha_if_deleted:7.3f}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="霍兰德职业兴趣测试题库信度分析")
+    parser.add_argument("responses", help="答案矩阵文件（.npy，(N, 120) 的 0/1 矩阵或 (N, 15) 的压缩矩阵）")
+    parser.add_argument("--min-item-total", type=float, default=0.2, help="标记题总相关低于该值的题目")
+    args = parser.parse_args(argv)
+
+    responses = np.load(args.responses, mmap_mode="r")
+    print(format_report(analyze(responses), args.min_item_total))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,19 @@
-"""霍兰德职业兴趣测试题目库 - 专业版"""
+"""霍兰德职业兴趣测试题目库 - 专业版
 
+题目保存在 banks/<版本>/<语言>.json 中，同一版本的各语言题库题目ID、类型和维度相同，只有文本不同，
+题库版本哈希（QuestionBank.version）也相同。
+每个题库首次加载时编译为二进制索引（题目ID、类型、维度和文本偏移量）并缓存到用户缓存目录，
+之后以内存映射方式只读加载：题目ID、类型和维度直接从索引解码，题目文本在首次访问时才从映射中读取，
+多个工作进程映射同一份缓存文件，共享操作系统页缓存中的同一份数据。
+"""
+
+import hashlib
+import mmap
+import os
+import struct
 from dataclasses import dataclass
-from typing import List
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
 # 霍兰德六种职业兴趣类型
 HOLLAND_TYPES = {
@@ -14,6 +26,17 @@ HOLLAND_TYPES = {
 }
 
 
+# 题目维度（兴趣、活动、技能、价值观）
+CATEGORIES: Tuple[str, ...] = ("interest", "activity", "skill", "value")
+
+CATEGORY_NAMES = {
+    "interest": "兴趣",
+    "activity": "活动",
+    "skill": "技能",
+    "value": "价值观",
+}
+
+
 @dataclass
 class Question:
     """测试题目"""
@@ -23,156 +46,403 @@ class Question:
     category: str = "interest"  # interest, activity, skill, value
 
 
-# 测试题目库（每个类型20道题目，共120题）
-# 参考标准霍兰德职业兴趣量表(SDS)设计
-QUESTIONS: List[Question] = [
-    # R - 现实型 (Realistic) - 20题
-    Question(1, "我喜欢修理或装配机械设备", "R", "activity"),
-    Question(2, "我喜欢使用工具或机器进行实际操作", "R", "activity"),
-    Question(3, "我喜欢户外活动和野外工作", "R", "interest"),
-    Question(4, "我喜欢做手工制作和工艺工作", "R", "activity"),
-    Question(5, "我喜欢建筑、施工或装修工作", "R", "activity"),
-    Question(6, "我喜欢操作和驾驶机械设备", "R", "activity"),
-    Question(7, "我喜欢园艺、农业或养殖活动", "R", "interest"),
-    Question(8, "我喜欢维修和保养各种物品", "R", "activity"),
-    Question(9, "我喜欢解决技术性和实用性问题", "R", "skill"),
-    Question(10, "我喜欢与物品、机器而非人打交道", "R", "interest"),
-    Question(11, "我喜欢阅读机械、技术类书籍杂志", "R", "interest"),
-    Question(12, "我喜欢参加技术技能竞赛", "R", "activity"),
-    Question(13, "我喜欢制作模型或手工艺品", "R", "activity"),
-    Question(14, "我喜欢测量和绘制技术图纸", "R", "skill"),
-    Question(15, "我喜欢组装和拆卸各类设备", "R", "activity"),
-    Question(16, "我喜欢参与生产制造活动", "R", "activity"),
-    Question(17, "我喜欢学习各种实用技能", "R", "interest"),
-    Question(18, "我喜欢在工厂或车间工作", "R", "interest"),
-    Question(19, "我喜欢从事需要动手能力的工作", "R", "value"),
-    Question(20, "我喜欢看到自己制作的产品成果", "R", "value"),
+# 题库文件目录：banks/<版本>/<语言>.json
+BANK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "banks")
+
+# 默认题库
+DEFAULT_BANK_VERSION = "v1"
+DEFAULT_LOCALE = "zh-CN"
+
+# 编译后二进制索引的缓存目录：环境变量 HOLLAND_BANK_CACHE 指定的目录，未设置时为
+# $XDG_CACHE_HOME/holland_test（默认 ~/.cache/holland_test）；设为空字符串时不写入磁盘
+BANK_CACHE_ENV = "HOLLAND_BANK_CACHE"
+
+
+@dataclass(frozen=True)
+class QuestionBank:
+    """编译后的只读题库索引（构建一次，供评分和分析模块共用）"""
+    questions: Sequence[Question]  # 按题库顺序排列的题目（从二进制索引加载时文本按需解码）
+    type_codes: Tuple[str, ...]  # 类型代码顺序（R, I, A, S, E, C）
+    ids: Tuple[int, ...]  # 下标 -> 题目ID
+    types: Tuple[str, ...]  # 下标 -> 类型
+    categories: Tuple[str, ...]  # 下标 -> 维度
+    index_of: Mapping[int, int]  # 题目ID -> 下标
+    type_of: Mapping[int, str]  # 题目ID -> 类型
+    category_of: Mapping[int, str]  # 题目ID -> 维度
+    type_counts: Mapping[str, int]  # 类型 -> 题目数量
+    ids_by_type: Mapping[str, Tuple[int, ...]]  # 类型 -> 题目ID
+    ids_by_category: Mapping[str, Tuple[int, ...]]  # 维度 -> 题目ID
+    version: str  # 题库结构哈希（题目ID、类型、维度及其顺序），评分结果、常模和 IRT 参数据此判断是否出自同一题库
+    label: str  # 题库版本名（banks/ 下的目录名，如 "v1"）
+    locale: str  # 题目文本的语言（如 "zh-CN"、"en"）
+    type_names: Mapping[str, str]  # 类型 -> 该语言的类型名称
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def question(self, question_id: int) -> Question:
+        """按题目ID获取题目"""
+        return self.questions[self.index_of[question_id]]
+
+    def same_layout(self, other: "QuestionBank") -> bool:
+        """题目ID、类型和维度的顺序是否与 other 相同（同一版本的各语言题库相同，评分结果一致）"""
+        return self.ids == other.ids and self.types == other.types and self.categories == other.categories
+
+
+def build_question_bank(questions: List[Question], label: str = "", locale: str = "",
+                        type_names: Optional[Mapping[str, str]] = None,
+                        version: Optional[str] = None) -> QuestionBank:
+    """
+    编译题库索引
     
-    # I - 研究型 (Investigative) - 20题
-    Question(21, "我喜欢阅读科学或技术类书籍", "I", "interest"),
-    Question(22, "我喜欢做实验或进行科学研究", "I", "activity"),
-    Question(23, "我喜欢分析数据和信息", "I", "activity"),
-    Question(24, "我喜欢解决复杂的问题", "I", "skill"),
-    Question(25, "我喜欢独立思考和研究", "I", "value"),
-    Question(26, "我喜欢探索新事物和未知领域", "I", "interest"),
-    Question(27, "我喜欢数学或逻辑推理", "I", "skill"),
-    Question(28, "我喜欢了解事物的工作原理和本质", "I", "interest"),
-    Question(29, "我喜欢进行科学观察和记录", "I", "activity"),
-    Question(30, "我喜欢在实验室或研究室工作", "I", "interest"),
-    Question(31, "我喜欢阅读学术论文和研究报告", "I", "interest"),
-    Question(32, "我喜欢参加学术讨论和研讨会", "I", "activity"),
-    Question(33, "我喜欢使用科学方法解决问题", "I", "skill"),
-    Question(34, "我喜欢收集和分析各种资料", "I", "activity"),
-    Question(35, "我喜欢发现和验证科学规律", "I", "value"),
-    Question(36, "我喜欢挑战复杂的智力问题", "I", "interest"),
-    Question(37, "我喜欢进行数据统计和分析", "I", "activity"),
-    Question(38, "我喜欢提出新的理论或假设", "I", "skill"),
-    Question(39, "我喜欢在安静的环境中深入研究", "I", "value"),
-    Question(40, "我喜欢通过研究获得新的知识", "I", "value"),
+    Args:
+        questions: 题目列表
+        label: 题库版本名
+        locale: 题目文本的语言
+        type_names: 类型名称，None 表示 HOLLAND_TYPES
+        version: 已知的结构哈希（从二进制索引加载时），None 表示按题目ID、类型、维度及顺序计算；
+            题目文本不参与计算，修改措辞或翻译不改变版本，已有的常模、IRT 参数和会话快照仍可使用
+        
+    Returns:
+        只读的题库索引
+    """
+    questions = tuple(questions)
+    return _assemble_bank(questions, tuple(q.id for q in questions), tuple(q.type for q in questions),
+                          tuple(q.category for q in questions), label, locale, type_names, version)
+
+
+def _assemble_bank(questions: Sequence[Question], ids: Tuple[int, ...], types: Tuple[str, ...],
+                   categories: Tuple[str, ...], label: str, locale: str,
+                   type_names: Optional[Mapping[str, str]], version: Optional[str]) -> QuestionBank:
+    # 只用题目ID、类型和维度建立索引，不访问题目文本（二进制索引中的文本按需解码）
+    type_codes = tuple(HOLLAND_TYPES.keys())
+    ids_by_type = {type_code: [] for type_code in type_codes}
+    ids_by_category = {category: [] for category in CATEGORIES}
+    digest = hashlib.sha256() if version is None else None
     
-    # A - 艺术型 (Artistic) - 20题
-    Question(41, "我喜欢创作艺术作品", "A", "activity"),
-    Question(42, "我喜欢音乐、戏剧或舞蹈", "A", "interest"),
-    Question(43, "我喜欢写作或表达创意想法", "A", "activity"),
-    Question(44, "我喜欢设计或装饰工作", "A", "activity"),
-    Question(45, "我喜欢摄影、绘画或雕塑", "A", "interest"),
-    Question(46, "我喜欢欣赏各种艺术作品", "A", "interest"),
-    Question(47, "我喜欢表达自己的想法和感受", "A", "value"),
-    Question(48, "我喜欢从事创造性工作", "A", "value"),
-    Question(49, "我喜欢独立工作，不受约束", "A", "value"),
-    Question(50, "我喜欢参与文化活动", "A", "activity"),
-    Question(51, "我喜欢尝试新的艺术表现形式", "A", "interest"),
-    Question(52, "我喜欢通过艺术表达情感", "A", "value"),
-    Question(53, "我喜欢阅读文学作品和诗歌", "A", "interest"),
-    Question(54, "我喜欢参加艺术展览和演出", "A", "activity"),
-    Question(55, "我喜欢学习各种艺术技巧", "A", "interest"),
-    Question(56, "我喜欢自由的工作环境", "A", "value"),
-    Question(57, "我喜欢创作独特和原创的作品", "A", "skill"),
-    Question(58, "我喜欢用艺术方式解决问题", "A", "skill"),
-    Question(59, "我喜欢展示自己的艺术才能", "A", "value"),
-    Question(60, "我喜欢在不同领域寻找灵感", "A", "interest"),
+    for qid, type_code, category in zip(ids, types, categories):
+        ids_by_type[type_code].append(qid)
+        ids_by_category.setdefault(category, []).append(qid)
+        if digest is not None:
+            digest.update(f"{qid}\t{type_code}\t{category}\n".encode("utf-8"))
     
-    # S - 社会型 (Social) - 20题
-    Question(61, "我喜欢帮助他人解决问题", "S", "activity"),
-    Question(62, "我喜欢教学或培训他人", "S", "activity"),
-    Question(63, "我喜欢照顾和关心他人", "S", "value"),
-    Question(64, "我喜欢团队合作和集体活动", "S", "value"),
-    Question(65, "我喜欢与人交流沟通", "S", "activity"),
-    Question(66, "我喜欢组织社交和公益活动", "S", "activity"),
-    Question(67, "我喜欢理解他人的感受和想法", "S", "skill"),
-    Question(68, "我喜欢提供咨询或建议", "S", "activity"),
-    Question(69, "我喜欢志愿服务工作", "S", "value"),
-    Question(70, "我喜欢促进他人的发展和成长", "S", "value"),
-    Question(71, "我喜欢参加社区服务活动", "S", "activity"),
-    Question(72, "我喜欢处理人际关系问题", "S", "skill"),
-    Question(73, "我喜欢在团队中发挥协调作用", "S", "skill"),
-    Question(74, "我喜欢了解不同人的需求", "S", "interest"),
-    Question(75, "我喜欢通过帮助他人获得满足感", "S", "value"),
-    Question(76, "我喜欢参与教育和培训活动", "S", "interest"),
-    Question(77, "我喜欢在服务性行业工作", "S", "interest"),
-    Question(78, "我喜欢与他人分享知识和经验", "S", "value"),
-    Question(79, "我喜欢创造和谐的人际关系", "S", "skill"),
-    Question(80, "我喜欢看到他人因为我的帮助而进步", "S", "value"),
+    return QuestionBank(
+        questions=questions,
+        type_codes=type_codes,
+        ids=ids,
+        types=types,
+        categories=categories,
+        index_of=MappingProxyType({qid: i for i, qid in enumerate(ids)}),
+        type_of=MappingProxyType(dict(zip(ids, types))),
+        category_of=MappingProxyType(dict(zip(ids, categories))),
+        type_counts=MappingProxyType({t: len(ids) for t, ids in ids_by_type.items()}),
+        ids_by_type=MappingProxyType({t: tuple(ids) for t, ids in ids_by_type.items()}),
+        ids_by_category=MappingProxyType({c: tuple(ids) for c, ids in ids_by_category.items()}),
+        version=digest.hexdigest()[:16] if digest is not None else version,
+        label=label,
+        locale=locale,
+        type_names=MappingProxyType(dict(type_names or HOLLAND_TYPES)),
+    )
+
+
+def bank_path(version: str, locale: str, bank_dir: str = BANK_DIR) -> str:
+    """题库文件路径"""
+    return os.path.join(bank_dir, version, f"{locale}.json")
+
+
+def available_banks(bank_dir: str = BANK_DIR) -> List[Tuple[str, str]]:
+    """题库目录中的全部 (版本, 语言)"""
+    banks = []
+    for version in sorted(os.listdir(bank_dir)):
+        folder = os.path.join(bank_dir, version)
+        if version.startswith("_") or not os.path.isdir(folder):
+            continue
+        banks.extend((version, name[:-len(".json")]) for name in sorted(os.listdir(folder)) if name.endswith(".json"))
+    return banks
+
+
+def read_bank_file(path: str) -> QuestionBank:
+    """
+    读取并校验题库文件（JSON：version、locale、type_names、questions）
     
-    # E - 企业型 (Enterprising) - 20题
-    Question(81, "我喜欢领导或管理他人", "E", "activity"),
-    Question(82, "我喜欢销售或说服他人", "E", "activity"),
-    Question(83, "我喜欢制定商业计划和策略", "E", "skill"),
-    Question(84, "我喜欢在竞争中获胜", "E", "value"),
-    Question(85, "我喜欢组织和管理活动", "E", "activity"),
-    Question(86, "我喜欢承担商业风险", "E", "value"),
-    Question(87, "我喜欢创业或经营企业", "E", "interest"),
-    Question(88, "我喜欢影响或说服他人", "E", "skill"),
-    Question(89, "我喜欢承担领导责任", "E", "value"),
-    Question(90, "我喜欢追求经济利益和成功", "E", "value"),
-    Question(91, "我喜欢参与商业谈判", "E", "activity"),
-    Question(92, "我喜欢阅读商业和管理类书籍", "E", "interest"),
-    Question(93, "我喜欢制定目标并努力实现", "E", "skill"),
-    Question(94, "我喜欢在快节奏的环境中工作", "E", "value"),
-    Question(95, "我喜欢建立和维护商业关系", "E", "skill"),
-    Question(96, "我喜欢管理项目和团队", "E", "activity"),
-    Question(97, "我喜欢参与投资和金融活动", "E", "interest"),
-    Question(98, "我喜欢通过努力获得更高的地位", "E", "value"),
-    Question(99, "我喜欢处理复杂的商业问题", "E", "skill"),
-    Question(100, "我喜欢在商业领域取得成功", "E", "value"),
+    Raises:
+        ValueError: 文件内容不符合要求
+    """
+    import json  # 只在编译索引时需要
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    try:
+        questions = [Question(int(item["id"]), str(item["text"]), item["type"], item.get("category", "interest"))
+                     for item in data["questions"]]
+        label, locale = str(data["version"]), str(data["locale"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"题库文件 {path} 格式错误：{e!r}") from None
+    if not questions:
+        raise ValueError(f"题库文件 {path} 没有题目")
+    ids = [q.id for q in questions]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"题库文件 {path} 中有重复的题目ID")
+    for q in questions:
+        if q.type not in HOLLAND_TYPES or q.category not in CATEGORIES:
+            raise ValueError(f"题库文件 {path} 中第 {q.id} 题的类型 {q.type!r} 或维度 {q.category!r} 无效")
+    type_names = data.get("type_names") or HOLLAND_TYPES
+    if set(type_names) != set(HOLLAND_TYPES):
+        raise ValueError(f"题库文件 {path} 的 type_names 应包含全部六种类型")
+    return build_question_bank(questions, label, locale, type_names)
+
+
+# 二进制索引（小端）：文件头之后依次为题目ID（int32 × n）、字符串偏移量（uint32 × (n + 9)）、
+# 类型下标（uint8 × n）、维度下标（uint8 × n）和 UTF-8 字符串区；
+# 字符串依次为 n 道题目的文本、6 个类型名称、版本名和语言
+_INDEX_MAGIC = b"HQB2"  # HQB1 的版本哈希包含题目文本
+_INDEX_HEADER = struct.Struct("<4sIqq16s")  # 魔数、题目数、源文件修改时间（ns）、源文件大小、结构哈希
+_INDEX_EXTRA_STRINGS = len(HOLLAND_TYPES) + 2
+
+
+def compile_bank_index(bank: QuestionBank, source_mtime_ns: int = 0, source_size: int = 0) -> bytes:
+    """将题库编译为二进制索引，源文件的修改时间和大小用于判断缓存是否过期"""
+    n = len(bank)
+    strings = [q.text for q in bank.questions]
+    strings += [bank.type_names[code] for code in bank.type_codes] + [bank.label, bank.locale]
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = [0]
+    for chunk in encoded:
+        offsets.append(offsets[-1] + len(chunk))
+    type_index = {code: i for i, code in enumerate(bank.type_codes)}
+    category_index = {category: i for i, category in enumerate(CATEGORIES)}
+    return b"".join([
+        _INDEX_HEADER.pack(_INDEX_MAGIC, n, source_mtime_ns, source_size, bank.version.encode("ascii")),
+        struct.pack(f"<{n}i", *bank.ids),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        bytes(type_index[t] for t in bank.types),
+        bytes(category_index[c] for c in bank.categories),
+        *encoded,
+    ])
+
+
+class _IndexedQuestions(Sequence):
+    """
+    二进制索引中的题目序列
     
-    # C - 常规型 (Conventional) - 20题
-    Question(101, "我喜欢整理文件和资料", "C", "activity"),
-    Question(102, "我喜欢处理数据和记录", "C", "activity"),
-    Question(103, "我喜欢遵循规则和程序", "C", "value"),
-    Question(104, "我喜欢有规律的工作", "C", "value"),
-    Question(105, "我喜欢使用办公软件", "C", "skill"),
-    Question(106, "我喜欢保持整洁有序", "C", "value"),
-    Question(107, "我喜欢做预算或财务工作", "C", "activity"),
-    Question(108, "我喜欢处理日常事务", "C", "activity"),
-    Question(109, "我喜欢稳定的工作环境", "C", "value"),
-    Question(110, "我喜欢执行标准化的流程", "C", "activity"),
-    Question(111, "我喜欢进行数据录入和整理", "C", "activity"),
-    Question(112, "我喜欢使用统计软件分析数据", "C", "skill"),
-    Question(113, "我喜欢维护档案和记录系统", "C", "activity"),
-    Question(114, "我喜欢在有序的环境中工作", "C", "value"),
-    Question(115, "我喜欢处理财务和会计事务", "C", "interest"),
-    Question(116, "我喜欢阅读规章制度和操作手册", "C", "interest"),
-    Question(117, "我喜欢确保工作的准确性和一致性", "C", "value"),
-    Question(118, "我喜欢参与行政管理工作", "C", "activity"),
-    Question(119, "我喜欢通过学习提高工作效率", "C", "skill"),
-    Question(120, "我喜欢通过规范工作获得成就感", "C", "value"),
-]
+    题目ID、类型和维度在加载时已解码；题目文本在首次访问某道题时才从索引（通常是内存映射）中解码，
+    之后缓存在本进程中。与同样内容的元组或列表比较时相等。
+    """
+    __slots__ = ("_buffer", "_ids", "_types", "_categories", "_offsets", "_start", "_decoded")
+
+    def __init__(self, buffer, ids: Tuple[int, ...], types: Tuple[str, ...], categories: Tuple[str, ...],
+                 offsets: Tuple[int, ...], start: int):
+        self._buffer = buffer
+        self._ids = ids
+        self._types = types
+        self._categories = categories
+        self._offsets = offsets
+        self._start = start
+        self._decoded: List[Optional[Question]] = [None] * len(ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        question = self._decoded[index]
+        if question is None:
+            index = range(len(self._ids))[index]
+            start, end = self._start + self._offsets[index], self._start + self._offsets[index + 1]
+            text = self._buffer[start:end].decode("utf-8")
+            question = self._decoded[index] = Question(
+                self._ids[index], text, self._types[index], self._categories[index])
+        return question
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (tuple, list, _IndexedQuestions)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"<{len(self)} 道题目（二进制索引）>"
+
+
+def read_bank_index(buffer, source_mtime_ns: Optional[int] = None,
+                    source_size: Optional[int] = None) -> Optional[QuestionBank]:
+    """
+    从二进制索引构建题库（buffer 可以是 bytes 或 mmap）
+    
+    题库引用 buffer，题目文本在访问时才从中解码；buffer 为 mmap 时在题库存续期间不能关闭。
+    
+    Returns:
+        题库；格式不符、内容损坏或与给定的源文件修改时间、大小不一致（缓存过期）时返回 None
+    """
+    try:
+        return _decode_bank_index(buffer, source_mtime_ns, source_size)
+    except (IndexError, KeyError, ValueError, struct.error):  # 截断或损坏的索引（含 UnicodeDecodeError）
+        return None
+
+
+def _decode_bank_index(buffer, source_mtime_ns: Optional[int], source_size: Optional[int]) -> Optional[QuestionBank]:
+    if len(buffer) < _INDEX_HEADER.size:
+        return None
+    magic, n, mtime_ns, size, version = _INDEX_HEADER.unpack_from(buffer)
+    if magic != _INDEX_MAGIC:
+        return None
+    if source_mtime_ns is not None and (mtime_ns, size) != (source_mtime_ns, source_size):
+        return None
+    
+    position = _INDEX_HEADER.size
+    ids = struct.unpack_from(f"<{n}i", buffer, position)
+    position += 4 * n
+    offsets = struct.unpack_from(f"<{n + _INDEX_EXTRA_STRINGS + 1}I", buffer, position)
+    position += 4 * len(offsets)
+    type_codes = tuple(HOLLAND_TYPES)
+    types = tuple(type_codes[i] for i in buffer[position:position + n])
+    position += n
+    categories = tuple(CATEGORIES[i] for i in buffer[position:position + n])
+    position += n
+    if len(buffer) < position + offsets[-1] or any(a > b for a, b in zip(offsets, offsets[1:])):
+        return None
+    # 一次性校验整个字符串区的编码（不保留解码结果），按需解码题目文本时不会再遇到损坏的数据
+    str(memoryview(buffer)[position:position + offsets[-1]], "utf-8")
+    extra = [buffer[position + start:position + end].decode("utf-8")
+             for start, end in zip(offsets[n:], offsets[n + 1:])]
+    
+    questions = _IndexedQuestions(buffer, ids, types, categories, offsets, position)
+    type_names = dict(zip(type_codes, extra))
+    return _assemble_bank(questions, ids, types, categories, extra[-2], extra[-1], type_names,
+                          version.decode("ascii"))
+
+
+def bank_cache_dir() -> Optional[str]:
+    """二进制索引的缓存目录，HOLLAND_BANK_CACHE 设为空字符串或无法确定用户目录时为 None（不写入磁盘）"""
+    configured = os.environ.get(BANK_CACHE_ENV)
+    if configured is not None:
+        return configured or None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "holland_test") if os.path.isabs(base) else None
+
+
+def _index_cache_path(version: str, locale: str, bank_dir: str) -> Optional[str]:
+    """缓存文件路径；文件名包含题库目录的哈希，不同目录中同名的版本和语言不会共用缓存"""
+    cache_dir = bank_cache_dir()
+    if cache_dir is None:
+        return None
+    source = hashlib.sha256(os.fsencode(os.path.abspath(bank_dir))).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{version}.{locale}.{source}.idx")
+
+
+def _load_cached_index(path: str, stat: os.stat_result) -> Optional[QuestionBank]:
+    # 映射在题库存续期间保持打开（关闭文件描述符不影响映射），题目文本按需从映射中解码
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # 缓存不存在、为空（mmap 报 ValueError）或不可读
+        return None
+    bank = read_bank_index(data, stat.st_mtime_ns, stat.st_size)
+    if bank is None:
+        data.close()
+    return bank
+
+
+def _save_index(path: str, data: bytes):
+    # 先写临时文件再原子替换：多个进程同时编译时不会读到不完整的索引，已映射旧文件的进程也不受影响
+    # （缓存文件从不原地改写）；目录不可写时只在内存中使用
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp, "wb") as f:
+            f.write(data)
+        os.replace(temp, path)
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+
+# 已加载的题库：(题库目录, 版本, 语言) -> 题库，每个进程只加载一次
+_LOADED_BANKS: Dict[Tuple[str, str, str], QuestionBank] = {}
+
+
+def load_question_bank(version: str = DEFAULT_BANK_VERSION, locale: str = DEFAULT_LOCALE,
+                       bank_dir: str = BANK_DIR) -> QuestionBank:
+    """
+    按版本和语言加载题库
+    
+    优先以内存映射方式读取缓存目录（见 bank_cache_dir）中的二进制索引；缓存不存在、
+    已损坏或题库文件已修改时解析题库文件，重新编译索引并写入缓存（写入失败时只在内存中使用）。
+    
+    Raises:
+        ValueError: 题库不存在或题库文件格式错误
+    """
+    key = (bank_dir, version, locale)
+    bank = _LOADED_BANKS.get(key)
+    if bank is not None:
+        return bank
+    source = bank_path(version, locale, bank_dir)
+    try:
+        stat = os.stat(source)
+    except FileNotFoundError:
+        raise ValueError(f"题库不存在：版本 {version}，语言 {locale}（{source}）") from None
+    cache = _index_cache_path(version, locale, bank_dir)
+    bank = _load_cached_index(cache, stat) if cache is not None else None
+    if bank is None:
+        bank = read_bank_file(source)
+        if cache is not None:
+            _save_index(cache, compile_bank_index(bank, stat.st_mtime_ns, stat.st_size))
+    _LOADED_BANKS[key] = bank
+    return bank
+
+
+# 编译后的默认题库索引
+QUESTION_BANK: QuestionBank = load_question_bank()
+
+# 默认题库的题目列表（每个类型20道题目，共120题，参考标准霍兰德职业兴趣量表(SDS)设计），
+# 首次访问模块属性 QUESTIONS 时才解码全部题目文本
+_QUESTIONS: Optional[List[Question]] = None
+
+
+def __getattr__(name: str):
+    global _QUESTIONS
+    if name == "QUESTIONS":
+        if _QUESTIONS is None:
+            _QUESTIONS = list(QUESTION_BANK.questions)
+        return _QUESTIONS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_question_bank() -> QuestionBank:
+    """获取编译后的题库索引"""
+    return QUESTION_BANK
+
+
+def find_question_bank(version: str) -> QuestionBank:
+    """
+    按题库版本（评分结果的 bank_version）查找本进程已加载的题库，默认题库优先
+
+    Raises:
+        ValueError: 没有已加载的题库与该版本一致
+    """
+    if version == QUESTION_BANK.version:
+        return QUESTION_BANK
+    for bank in _LOADED_BANKS.values():
+        if bank.version == version:
+            return bank
+    raise ValueError(f"未找到版本为 {version} 的题库，请先用 load_question_bank 加载或直接传入题库")
 
 
 def get_questions_by_type(question_type: str) -> List[Question]:
     """获取指定类型的题目"""
-    return [q for q in QUESTIONS if q.type == question_type]
+    bank = QUESTION_BANK
+    return [bank.question(qid) for qid in bank.ids_by_type.get(question_type, ())]
 
 
 def get_all_questions() -> List[Question]:
     """获取所有题目"""
-    return QUESTIONS
+    return __getattr__("QUESTIONS")
 
 
 def get_question_count_by_type() -> dict:
     """获取每个类型的题目数量"""
-    count = {type_code: 0 for type_code in HOLLAND_TYPES.keys()}
-    for q in QUESTIONS:
-        count[q.type] += 1
-    return count
+    return dict(QUESTION_BANK.type_counts)
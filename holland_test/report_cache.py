@@ -0,0 +1,265 @@
+"""报告缓存：按得分签名缓存生成的报告文本
+
+报告的绝大部分只取决于六种类型的得分（百分比和主要/次要/第三类型都由得分推导）
+和所用的题库（题目数、类型名称），因此同一题库下得分相同的答卷可以共用同一份报告正文。专业报告中的维度得分表和剖面指标
+不计入缓存键，每次取出报告时单独生成后插入正文。缓存分两级：
+
+- 进程内 LRU 缓存，限制条目数和总字节数
+- 可选的 SQLite 磁盘缓存，可在多个进程之间共享
+
+缓存中保存的是去掉了时间戳占位行的报告片段，取出时再填入调用方提供的时间，
+因此缓存内容与生成时间无关。缓存可在多个线程间共享（如评分服务的线程池）。
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from .questions import QuestionBank
+from .report_generator import (
+    TIMESTAMP_PLACEHOLDER,
+    _report_bank,
+    generate_professional_report,
+    generate_summary_report,
+    professional_report_body,
+    professional_report_inserts,
+)
+from .scorer import TYPE_CODES, TestResult
+
+REPORT_KINDS = {
+    "professional": generate_professional_report,
+    "summary": generate_summary_report,
+}
+
+
+def _professional_body(result: TestResult, bank: QuestionBank) -> Tuple[str, ...]:
+    return professional_report_body(result, bank=bank)
+
+
+def _summary_body(result: TestResult, bank: QuestionBank) -> Tuple[str]:
+    return (generate_summary_report(result, bank),)
+
+
+def _no_inserts(result: TestResult, bank: QuestionBank) -> Tuple[str, ...]:
+    return ()
+
+
+_PartsFunction = Callable[[TestResult, QuestionBank], Tuple[str, ...]]
+
+# 报告类型 -> (生成只取决于得分的正文片段, 生成插入片段之间的其余部分)
+_REPORT_PARTS: Dict[str, Tuple[_PartsFunction, _PartsFunction]] = {
+    "professional": (_professional_body, professional_report_inserts),
+    "summary": (_summary_body, _no_inserts),
+}
+
+# SQLite 中各片段之间的分隔符（报告文本中不会出现 NUL 字符）
+_SEGMENT_SEPARATOR = "\0"
+
+CacheKey = Tuple[str, str, str, Tuple[int, ...]]
+
+
+@dataclass
+class CacheStats:
+    """缓存统计"""
+    hits: int = 0  # 内存命中
+    disk_hits: int = 0  # 磁盘命中
+    misses: int = 0  # 未命中（重新生成报告）
+    evictions: int = 0  # 因容量限制被淘汰的条目数
+
+
+def report_key(result: TestResult, kind: str, bank: Optional[QuestionBank] = None) -> CacheKey:
+    """
+    报告的缓存键：(报告类型, 题库版本, 题库语言, 按 R, I, A, S, E, C 顺序排列的得分)
+
+    bank 为 None 时按 result.bank_version 查找题库（同 generate_professional_report）。
+    """
+    bank = _report_bank(result, bank)
+    return kind, bank.version, bank.locale, tuple(result.scores[code] for code in TYPE_CODES)
+
+
+def assemble_report(segments: Tuple[str, ...], inserts: Tuple[str, ...] = (),
+                    timestamp: Optional[str] = None) -> str:
+    """
+    将缓存的报告片段拼接为完整报告
+
+    片段之间依次填入 inserts（随答卷变化的部分），其后的间隔填入时间戳行；
+    timestamp 为 None 时保留原占位文字。
+    """
+    line = TIMESTAMP_PLACEHOLDER if timestamp is None else f"报告生成时间：{timestamp}"
+    fills = inserts + (line,) * (len(segments) - 1 - len(inserts))
+    parts = [segments[0]]
+    for fill, segment in zip(fills, segments[1:]):
+        parts.append(fill)
+        parts.append(segment)
+    return "".join(parts)
+
+
+class ReportCache:
+    """按得分签名缓存报告的 LRU 缓存"""
+
+    def __init__(self, maxsize: int = 4096, max_bytes: int = 64 * 1024 * 1024,
+                 db_path: Optional[str] = None):
+        """
+        Args:
+            maxsize: 内存中最多缓存的报告数
+            max_bytes: 内存中缓存报告的最大总字节数（UTF-8 编码）
+            db_path: SQLite 磁盘缓存路径，None 表示只使用内存缓存
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, Tuple[Tuple[str, ...], int]]" = OrderedDict()
+        self._bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        # 保护内存缓存和磁盘连接；报告在锁外生成，并发未命中同一键时各自生成一次，结果相同
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """内存中缓存报告的总字节数"""
+        return self._bytes
+
+    def get_report(self, result: TestResult, kind: str = "professional",
+                   timestamp: Optional[str] = None, bank: Optional[QuestionBank] = None) -> str:
+        """
+        获取报告（优先从缓存中读取）
+
+        Args:
+            result: 测试结果（由 score_test 或 score_batch 得到）
+            kind: 报告类型（professional/summary）
+            timestamp: 报告生成时间，None 表示保留原占位文字
+            bank: 题库，None 表示按 result.bank_version 查找
+
+        Returns:
+            完整的报告文本
+        """
+        bank = _report_bank(result, bank)
+        inserts = _REPORT_PARTS[kind][1](result, bank)
+        return assemble_report(self.get_segments(result, kind, bank), inserts, timestamp)
+
+    def get_segments(self, result: TestResult, kind: str = "professional",
+                     bank: Optional[QuestionBank] = None) -> Tuple[str, ...]:
+        """
+        获取只取决于得分和题库的报告片段（在插入部分和时间戳占位行处切分）
+
+        时间戳占位行只出现在最后一个正文片段中，因此插入部分总在时间戳之前。
+        """
+        bank = _report_bank(result, bank)
+        key = report_key(result, kind, bank)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+            segments = self._load(key)
+            if segments is not None:
+                self.stats.disk_hits += 1
+                self._put(key, segments)
+                return segments
+            self.stats.misses += 1
+
+        body = _REPORT_PARTS[kind][0](result, bank)
+        segments = body[:-1] + tuple(body[-1].split(TIMESTAMP_PLACEHOLDER))
+        with self._lock:
+            self._store(key, segments)
+            self._put(key, segments)
+        return segments
+
+    def clear(self):
+        """清空内存缓存（不影响磁盘缓存和统计）"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self):
+        """关闭磁盘缓存连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _put(self, key: CacheKey, segments: Tuple[str, ...]):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        size = sum(len(s.encode("utf-8")) for s in segments)
+        if size > self.max_bytes or self.maxsize <= 0:
+            return
+        self._entries[key] = (segments, size)
+        self._bytes += size
+        while len(self._entries) > self.maxsize or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.stats.evictions += 1
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        # 连接不能跨进程共享，fork 出的子进程需要重新连接
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                # 正文片段不含维度得分表和剖面指标，与旧版 reports 表的内容不兼容，使用新表
+                "CREATE TABLE IF NOT EXISTS report_bodies ("
+                " bank_version TEXT NOT NULL,"
+                " locale TEXT NOT NULL,"
+                " kind TEXT NOT NULL,"
+                " scores TEXT NOT NULL,"
+                " body TEXT NOT NULL,"
+                " PRIMARY KEY (bank_version, locale, kind, scores))"
+            )
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _load(self, key: CacheKey) -> Optional[Tuple[str, ...]]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        kind, version, locale, scores = key
+        row = conn.execute(
+            "SELECT body FROM report_bodies WHERE bank_version = ? AND locale = ? AND kind = ? AND scores = ?",
+            (version, locale, kind, ",".join(map(str, scores))),
+        ).fetchone()
+        return tuple(row[0].split(_SEGMENT_SEPARATOR)) if row else None
+
+    def _store(self, key: CacheKey, segments: Tuple[str, ...]):
+        conn = self._connection()
+        if conn is None:
+            return
+        kind, version, locale, scores = key
+        conn.execute(
+            "INSERT OR IGNORE INTO report_bodies (bank_version, locale, kind, scores, body) VALUES (?, ?, ?, ?, ?)",
+            (version, locale, kind, ",".join(map(str, scores)), _SEGMENT_SEPARATOR.join(segments)),
+        )
+
+
+_default_cache: Optional[ReportCache] = None
+
+
+def get_default_cache() -> ReportCache:
+    """获取进程内共享的默认报告缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ReportCache()
+    return _default_cache
+
+
+def configure_default_cache(maxsize: int = 4096, max_bytes: int = 64 * 1024 * 1024,
+                            db_path: Optional[str] = None) -> ReportCache:
+    """替换进程内共享的默认报告缓存"""
+    global _default_cache
+    if _default_cache is not None:
+        _default_cache.close()
+    _default_cache = ReportCache(maxsize=maxsize, max_bytes=max_bytes, db_path=db_path)
+    return _default_cache
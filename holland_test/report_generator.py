@@ -1,260 +1,438 @@
 """专业报告生成器"""
 
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
 from .analysis import (
-    TYPE_COMBINATIONS,
-    analyze_career_positioning,
-    analyze_career_tendency,
-    generate_career_guidance,
-    get_career_suggestions,
+    STRENGTH_LEVELS,
+    ProfileMetrics,
+    analyze_profile,
+    get_analysis_entry,
+    get_career_recommendations,
+    get_type_combination,
     get_type_description,
+    percentage_band,
 )
-from .questions import HOLLAND_TYPES
+from .questions import CATEGORIES, CATEGORY_NAMES, QuestionBank, find_question_bank
 from .scorer import TestResult
 
+# 报告尾部的时间戳占位行，由调用方在输出前替换为实际时间
+TIMESTAMP_PLACEHOLDER = "报告生成时间：请填写实际时间"
 
-def generate_professional_report(result: TestResult) -> str:
+# ---------------------------------------------------------------------------
+# 报告模板：固定文字在导入时拼接为整段文本，生成报告时只填充随结果变化的部分。
+# 每个片段由若干行以换行符连接而成，与逐行拼接的结果逐字节一致。
+# ---------------------------------------------------------------------------
+
+_SEPARATOR = "-" * 80
+
+
+def _lines(*lines: str) -> str:
+    return "\n".join(lines)
+
+
+def _section(title: str) -> str:
+    return _lines(title, _SEPARATOR)
+
+
+@lru_cache(maxsize=None)
+def _professional_head(question_count: int) -> str:
+    """第一部分及得分统计表头（只取决于题目总数）"""
+    return _lines(
+        "=" * 80,
+        "霍兰德职业兴趣测试 - 专业评估报告",
+        "Holland Career Interest Test - Professional Assessment Report",
+        "=" * 80,
+        "",
+        "一、测试概况",
+        _SEPARATOR,
+        "测试类型：霍兰德职业兴趣测试（RIASEC模型）",
+        f"题目总数：{question_count}题",
+        "答题方式：是/否",
+        "",
+        "二、各类型得分统计",
+        _SEPARATOR,
+        f"{'类型':<20} {'得分':<10} {'题目数':<10} {'百分比':<10} {'强度':<10}",
+        _SEPARATOR,
+    )
+
+
+_SUBSCORE_HEAD = _lines(
+    "各维度得分（得分/该维度题目数）：",
+    f"{'类型':<20} " + " ".join(f"{CATEGORY_NAMES[category]:<10}" for category in CATEGORIES),
+)
+
+# 题库版本 -> 类型 -> 维度 -> 题目数
+_CATEGORY_COUNTS: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+
+def _category_counts(bank: QuestionBank) -> Dict[str, Dict[str, int]]:
+    counts = _CATEGORY_COUNTS.get(bank.version)
+    if counts is None:
+        counts = _CATEGORY_COUNTS[bank.version] = {
+            type_code: {category: sum(bank.category_of[qid] == category for qid in ids)
+                        for category in CATEGORIES}
+            for type_code, ids in bank.ids_by_type.items()
+        }
+    return counts
+
+
+def _report_bank(result: TestResult, bank: Optional[QuestionBank]) -> QuestionBank:
+    """
+    报告所用的题库（题目数、类型名称和各维度题目数）：未指定时按结果的 bank_version 查找
+
+    Raises:
+        ValueError: 指定的题库与结果的题库版本不一致，或找不到该版本的题库
+    """
+    if bank is None:
+        return find_question_bank(result.bank_version)
+    if bank.version != result.bank_version:
+        raise ValueError(f"题库版本 {bank.version} 与测试结果的题库版本 {result.bank_version} 不一致")
+    return bank
+
+
+_SECTION_CORE = _section("三、核心结果")
+_SECTION_TENDENCY = _section("五、职业倾向分析")
+_SECTION_POSITIONING = _section("六、职业定位分析")
+_SECTION_CAREERS = _section("七、推荐职业方向")
+_SECTION_GUIDANCE = _section("八、职业指导建议")
+
+_PROFESSIONAL_TAIL = _lines(
+    "九、测试说明",
+    _SEPARATOR,
+    "1. 本测试基于霍兰德职业兴趣理论（RIASEC模型），是国际公认的职业兴趣评估工具。",
+    "2. 测试结果反映的是职业兴趣倾向，而非能力评估。",
+    "3. 职业选择应综合考虑兴趣、能力、价值观、市场需求等多方面因素。",
+    "4. 建议结合其他评估工具（如能力测试、性格测试等）进行综合评估。",
+    "5. 职业发展是一个动态过程，建议定期重新评估。",
+    "6. 本报告仅供参考，具体职业选择请结合个人实际情况和专业咨询。",
+    "",
+    "=" * 80,
+    TIMESTAMP_PLACEHOLDER,
+    "本报告基于您的测试结果生成，希望对您的职业规划有所帮助。",
+    "=" * 80,
+)
+
+_GUIDANCE_SECTIONS = (
+    ("immediate_actions", "【立即行动建议】"),
+    ("skill_development", "【技能发展建议】"),
+    ("career_path", "【职业路径建议】"),
+    ("workplace_advice", "【工作环境建议】"),
+)
+
+_SUMMARY_HEAD = _lines(
+    "=" * 60,
+    "霍兰德职业兴趣测试 - 简要报告",
+    "=" * 60,
+    "",
+)
+
+
+@lru_cache(maxsize=1024)
+def _score_row(type_name: str, score: int, total_questions: int, percentage: float) -> str:
+    """得分统计表中的一行及其强度条"""
+    strength = STRENGTH_LEVELS[percentage_band(percentage)]
+    bar = "█" * int(percentage / 5)
+    return _lines(
+        f"{type_name:<20} {score:<10} {total_questions:<10} {percentage:>6.1f}%{'':<4} {strength:<10}",
+        f"{'':<20} {bar}",
+    )
+
+
+def _format_subscore(value: float) -> str:
+    return str(value) if isinstance(value, int) else f"{value:g}"
+
+
+@lru_cache(maxsize=4096)
+def _subscore_row(type_name: str, counts: Tuple[int, ...], values: Tuple[float, ...]) -> str:
+    """维度得分表中的一行"""
+    cells = (f"{_format_subscore(value) + '/' + str(count):<10}" for count, value in zip(counts, values))
+    return f"{type_name:<20} " + " ".join(cells)
+
+
+def _append_subscores(report: List[str], result: TestResult, bank: QuestionBank):
+    """第二部分：各类型在兴趣、活动、技能、价值观四个维度上的得分"""
+    category_counts = _category_counts(bank)
+    report.append(_SUBSCORE_HEAD)
+    for type_code, row in result.subscores.items():
+        counts = category_counts[type_code]
+        report.append(_subscore_row(bank.type_names[type_code], tuple(counts[c] for c in CATEGORIES),
+                                    tuple(row[c] for c in CATEGORIES)))
+
+    # 主要类型中认同比例最高和最低的维度（同比例时按 CATEGORIES 顺序取前者）
+    counts = category_counts[result.primary_type]
+    ratios = {category: value / counts[category] * 100
+              for category, value in result.subscores[result.primary_type].items() if counts[category]}
+    strongest = max(ratios, key=ratios.get)
+    weakest = min(ratios, key=ratios.get)
+    report.append(
+        f"{bank.type_names[result.primary_type]}的各维度中，{CATEGORY_NAMES[strongest]}维度的得分比例最高（{ratios[strongest]:.1f}%），"
+        f"{CATEGORY_NAMES[weakest]}维度最低（{ratios[weakest]:.1f}%）"
+    )
+    report.append("")
+
+
+@lru_cache(maxsize=1024)
+def _core_type(label: str, type_name: str, type_code: str, score: int, total_questions: int,
+               percentage: float) -> str:
+    """核心结果中的一个类型（含其后的空行）"""
+    return _lines(
+        f"{label}：{type_name} ({type_code})",
+        f"  得分：{score}/{total_questions} ({percentage:.1f}%)",
+        "",
+    )
+
+
+# 六边形距离 -> 一致性的说明
+_HEXAGON_RELATIONS = {1: "在六边形上相邻", 2: "在六边形上相隔一个类型", 3: "在六边形上相对"}
+
+
+@lru_cache(maxsize=1024)
+def _profile_metrics(metrics: ProfileMetrics) -> str:
+    """第三部分：剖面一致性和区分度"""
+    return _lines(
+        f"剖面一致性：{metrics.consistency_level}"
+        f"（主要类型与次要类型{_HEXAGON_RELATIONS[metrics.consistency]}）",
+        f"剖面区分度：{metrics.differentiation_level}"
+        f"（最高与最低类型百分比相差 {metrics.differentiation:.1f} 个百分点）",
+        "",
+    )
+
+
+@lru_cache(maxsize=None)
+def _interest_profile(type_code: str) -> str:
+    """第四部分：主要类型的职业兴趣分析（只取决于主要类型）"""
+    desc = get_type_description(type_code)
+    return _lines(
+        "四、职业兴趣分析",
+        _SEPARATOR,
+        f"【{desc['name']}】",
+        f"核心特点：{desc['characteristics']}",
+        f"喜欢的工作：{desc['likes']}",
+        f"不喜欢的工作：{desc['dislikes']}",
+        f"适合的工作环境：{desc['work_environment']}",
+        f"核心能力：{desc['skills']}",
+        f"价值观：{desc['values']}",
+        "",
+    )
+
+
+@lru_cache(maxsize=1024)
+def _strength_line(type_name: str, percentage: float) -> str:
+    level = STRENGTH_LEVELS[percentage_band(percentage)]
+    return f"  {type_name}: {level} ({percentage:.1f}%)"
+
+
+@lru_cache(maxsize=256)
+def _positioning_section(primary: str, secondary: str, band: int) -> str:
+    """第六部分：职业定位分析（只取决于主要、次要类型和主要类型的百分比分档）"""
+    entry = get_analysis_entry(primary, secondary, band)
+    lines = [
+        _SECTION_POSITIONING,
+        f"主要定位：{entry.primary_positioning}",
+        "",
+        "适合的行业领域：",
+    ]
+    _append_numbered(lines, entry.suitable_industries, "  {}. {}")
+    lines.extend(["", f"职业层级建议：{entry.career_level}", ""])
+    return _lines(*lines)
+
+
+@lru_cache(maxsize=256)
+def _guidance_section(primary: str, secondary: str, band: int) -> str:
+    """第八部分：职业指导建议（只取决于主要、次要类型和主要类型的百分比分档）"""
+    entry = get_analysis_entry(primary, secondary, band)
+    lines = [_SECTION_GUIDANCE]
+    for key, title in _GUIDANCE_SECTIONS:
+        lines.append(title)
+        _append_numbered(lines, getattr(entry, key), "  {}. {}")
+        lines.append("")
+    return _lines(*lines)
+
+
+def generate_professional_report(result: TestResult, occupation_index=None, top_k: int = 20,
+                                 norms=None, cohort: Optional[str] = None,
+                                 bank: Optional[QuestionBank] = None) -> str:
     """
     生成专业的测试报告
-    
+
     Args:
         result: 测试结果
-        
+        occupation_index: 职业剖面索引（occupations.OccupationIndex），提供时第七部分
+            按六维剖面的匹配度推荐职业，代替按类型字母选取的固定列表
+        top_k: 使用职业剖面索引时推荐的职业数
+        norms: 人群常模（norms.PopulationNorms），提供时第五部分增加各类型得分在人群中的百分位
+        cohort: 使用常模中哪个群组的数据，默认为全体测试者
+        bank: 题库（提供题目数、类型名称和各维度题目数），None 表示按 result.bank_version 查找已加载的题库
+
     Returns:
         完整的报告文本
+
+    Raises:
+        ValueError: 找不到与 result.bank_version 一致的题库
     """
-    report = []
-    
-    # 报告头部
-    report.append("=" * 80)
-    report.append("霍兰德职业兴趣测试 - 专业评估报告")
-    report.append("Holland Career Interest Test - Professional Assessment Report")
-    report.append("=" * 80)
-    report.append("")
-    
-    # 一、测试概况
-    report.append("一、测试概况")
-    report.append("-" * 80)
-    report.append(f"测试类型：霍兰德职业兴趣测试（RIASEC模型）")
-    report.append(f"题目总数：120题")
-    report.append(f"答题方式：是/否")
-    report.append("")
-    
+    bank = _report_bank(result, bank)
+    head, middle, tail = professional_report_body(result, occupation_index, top_k, norms, cohort, bank)
+    subscores, metrics = professional_report_inserts(result, bank)
+    return head + subscores + middle + metrics + tail
+
+
+def professional_report_inserts(result: TestResult, bank: Optional[QuestionBank] = None) -> Tuple[str, str]:
+    """
+    专业报告中不由六种类型得分决定的部分：(维度得分表, 剖面指标)
+
+    依次插入 professional_report_body 返回的三个片段之间；没有子分数时维度得分表为空字符串。
+    """
+    subscores: List[str] = []
+    if result.subscores:
+        _append_subscores(subscores, result, _report_bank(result, bank))
+    return "".join("\n" + line for line in subscores), _profile_metrics(analyze_profile(result))
+
+
+def professional_report_body(result: TestResult, occupation_index=None, top_k: int = 20,
+                             norms=None, cohort: Optional[str] = None,
+                             bank: Optional[QuestionBank] = None) -> Tuple[str, str, str]:
+    """
+    专业报告中只取决于六种类型得分（及题库）的部分，在维度得分表和剖面指标处切分为三个片段
+    （参数同 generate_professional_report），报告缓存按得分保存这些片段
+    """
+    bank = _report_bank(result, bank)
+    names = bank.type_names
+    scores = result.scores
+    percentages = result.percentages
+    report = [_professional_head(len(bank))]
+
     # 二、得分统计
-    report.append("二、各类型得分统计")
-    report.append("-" * 80)
-    sorted_scores = sorted(result.scores.items(), key=lambda x: x[1], reverse=True)
-    report.append(f"{'类型':<20} {'得分':<10} {'题目数':<10} {'百分比':<10} {'强度':<10}")
-    report.append("-" * 80)
+    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
     for type_code, score in sorted_scores:
-        type_name = HOLLAND_TYPES[type_code]
-        total_questions = 20  # 每个类型20题
-        percentage = result.percentages[type_code]
-        
-        # 强度等级
-        if percentage >= 70:
-            strength = "很强"
-            bar = "█" * int(percentage / 5)
-        elif percentage >= 50:
-            strength = "较强"
-            bar = "█" * int(percentage / 5)
-        elif percentage >= 30:
-            strength = "中等"
-            bar = "█" * int(percentage / 5)
-        else:
-            strength = "较弱"
-            bar = "█" * int(percentage / 5)
-        
-        report.append(f"{type_name:<20} {score:<10} {total_questions:<10} {percentage:>6.1f}%{'':<4} {strength:<10}")
-        report.append(f"{'':<20} {bar}")
-    
+        report.append(_score_row(names[type_code], score, bank.type_counts[type_code], percentages[type_code]))
     report.append("")
-    
+    head = "\n".join(report)
+
     # 三、核心结果
-    report.append("三、核心结果")
-    report.append("-" * 80)
-    primary_name = HOLLAND_TYPES[result.primary_type]
-    secondary_name = HOLLAND_TYPES[result.secondary_type]
-    tertiary_name = HOLLAND_TYPES[result.tertiary_type]
-    
-    report.append(f"主要类型：{primary_name} ({result.primary_type})")
-    report.append(f"  得分：{result.scores[result.primary_type]}/20 ({result.percentages[result.primary_type]:.1f}%)")
-    report.append("")
-    report.append(f"次要类型：{secondary_name} ({result.secondary_type})")
-    report.append(f"  得分：{result.scores[result.secondary_type]}/20 ({result.percentages[result.secondary_type]:.1f}%)")
-    report.append("")
-    report.append(f"第三类型：{tertiary_name} ({result.tertiary_type})")
-    report.append(f"  得分：{result.scores[result.tertiary_type]}/20 ({result.percentages[result.tertiary_type]:.1f}%)")
-    report.append("")
+    report = [_SECTION_CORE]
+    for label, type_code in (("主要类型", result.primary_type),
+                             ("次要类型", result.secondary_type),
+                             ("第三类型", result.tertiary_type)):
+        report.append(_core_type(label, names[type_code], type_code, scores[type_code],
+                                 bank.type_counts[type_code], percentages[type_code]))
     report.append(f"类型代码：{result.type_combination}")
     report.append("")
-    
+
     # 类型组合分析
-    if result.type_combination in TYPE_COMBINATIONS:
-        combo = TYPE_COMBINATIONS[result.type_combination]
+    combo = get_type_combination(result.type_combination)
+    if combo is not None:
         report.append(f"类型组合：{combo['name']}")
         report.append(f"组合特征：{combo['description']}")
         report.append(f"典型职业：{', '.join(combo['careers'][:5])}")
         report.append("")
-    
+    middle = "\n" + "\n".join(report) + "\n"
+
     # 四、职业兴趣分析
-    report.append("四、职业兴趣分析")
-    report.append("-" * 80)
-    primary_desc = get_type_description(result.primary_type)
-    report.append(f"【{primary_desc['name']}】")
-    report.append(f"核心特点：{primary_desc['characteristics']}")
-    report.append(f"喜欢的工作：{primary_desc['likes']}")
-    report.append(f"不喜欢的工作：{primary_desc['dislikes']}")
-    report.append(f"适合的工作环境：{primary_desc['work_environment']}")
-    report.append(f"核心能力：{primary_desc['skills']}")
-    report.append(f"价值观：{primary_desc['values']}")
-    report.append("")
-    
+    report = [_interest_profile(result.primary_type)]
+
     # 五、职业倾向分析
-    report.append("五、职业倾向分析")
-    report.append("-" * 80)
-    tendency = analyze_career_tendency(result)
-    report.append(f"主导倾向：{HOLLAND_TYPES[tendency['dominant_type']]}")
-    report.append(f"辅助倾向：{', '.join([HOLLAND_TYPES[t] for t in tendency['supporting_types']])}")
+    band = percentage_band(percentages[result.primary_type])
+    entry = get_analysis_entry(result.primary_type, result.secondary_type, band)
+    report.append(_SECTION_TENDENCY)
+    report.append(f"主导倾向：{names[result.primary_type]}")
+    report.append(f"辅助倾向：{names[result.secondary_type]}, {names[result.tertiary_type]}")
     report.append("")
     report.append("各类型强度：")
-    for type_code, level in tendency['strength_level'].items():
-        report.append(f"  {HOLLAND_TYPES[type_code]}: {level} ({result.percentages[type_code]:.1f}%)")
+    for type_code, percentage in percentages.items():
+        report.append(_strength_line(names[type_code], percentage))
     report.append("")
-    report.append(f"工作风格：{tendency['work_style']}")
-    report.append(f"团队偏好：{tendency['team_preference']}")
+    if norms is not None:
+        report.append(f"常模百分位（与{norms.total(cohort)}名测试者相比）：")
+        for type_code, rank in norms.percentiles(result, cohort).items():
+            report.append(f"  {names[type_code]}: 百分位 {rank:.0f}")
+        report.append("")
+    report.append(f"工作风格：{entry.work_style}")
+    report.append(f"团队偏好：{entry.team_preference}")
     report.append("")
-    
+
     # 六、职业定位分析
-    report.append("六、职业定位分析")
-    report.append("-" * 80)
-    positioning = analyze_career_positioning(result)
-    report.append(f"主要定位：{positioning['primary_positioning']}")
-    report.append("")
-    report.append("适合的行业领域：")
-    for i, industry in enumerate(positioning['suitable_industries'], 1):
-        report.append(f"  {i}. {industry}")
-    report.append("")
-    report.append(f"职业层级建议：{positioning['career_level']}")
-    report.append("")
-    
+    report.append(_positioning_section(result.primary_type, result.secondary_type, band))
+
     # 七、推荐职业方向
-    report.append("七、推荐职业方向")
-    report.append("-" * 80)
-    all_careers = set()
-    for type_code in [result.primary_type, result.secondary_type, result.tertiary_type]:
-        careers = get_career_suggestions(type_code)
-        all_careers.update(careers)
-    
+    report.append(_SECTION_CAREERS)
+    if occupation_index is not None:
+        report.append("按兴趣剖面匹配度推荐的职业：")
+        for i, (name, score) in enumerate(occupation_index.match(result, top_k), 1):
+            report.append(f"  {i:2d}. {name}（匹配度 {score * 100:.1f}%）")
+        report.append("")
+    else:
+        _append_career_lists(report, result, names)
+
+    # 八、职业指导建议
+    report.append(_guidance_section(result.primary_type, result.secondary_type, band))
+
+    # 九、测试说明及报告尾部
+    report.append(_PROFESSIONAL_TAIL)
+
+    return head, middle, "\n" + "\n".join(report)
+
+
+def _append_career_lists(report: List[str], result: TestResult, names: Mapping[str, str]):
+    """第七部分：按主要、次要和第三类型选取的推荐职业（查预计算的推荐职业表）"""
+    careers = get_career_recommendations(result.type_combination)
+
     # 按类型分组显示
-    report.append(f"【{HOLLAND_TYPES[result.primary_type]}】相关职业：")
-    primary_careers = get_career_suggestions(result.primary_type)
-    for i, career in enumerate(primary_careers[:15], 1):
-        report.append(f"  {i:2d}. {career}")
+    report.append(f"【{names[result.primary_type]}】相关职业：")
+    _append_numbered(report, careers.primary)
     report.append("")
-    
+
     if result.secondary_type != result.primary_type:
-        report.append(f"【{HOLLAND_TYPES[result.secondary_type]}】相关职业：")
-        secondary_careers = get_career_suggestions(result.secondary_type)
-        for i, career in enumerate(secondary_careers[:10], 1):
-            report.append(f"  {i:2d}. {career}")
+        report.append(f"【{names[result.secondary_type]}】相关职业：")
+        _append_numbered(report, careers.secondary)
         report.append("")
-    
+
     report.append("综合推荐职业（结合三个类型）：")
-    combined_careers = sorted(all_careers)
-    for i, career in enumerate(combined_careers[:20], 1):
-        report.append(f"  {i:2d}. {career}")
+    _append_numbered(report, careers.combined)
     report.append("")
-    
-    # 八、职业指导建议
-    report.append("八、职业指导建议")
-    report.append("-" * 80)
-    guidance = generate_career_guidance(result)
-    
-    report.append("【立即行动建议】")
-    for i, action in enumerate(guidance['immediate_actions'], 1):
-        report.append(f"  {i}. {action}")
-    report.append("")
-    
-    report.append("【技能发展建议】")
-    for i, skill in enumerate(guidance['skill_development'], 1):
-        report.append(f"  {i}. {skill}")
-    report.append("")
-    
-    report.append("【职业路径建议】")
-    for i, path in enumerate(guidance['career_path'], 1):
-        report.append(f"  {i}. {path}")
-    report.append("")
-    
-    report.append("【工作环境建议】")
-    for i, advice in enumerate(guidance['workplace_advice'], 1):
-        report.append(f"  {i}. {advice}")
-    report.append("")
-    
-    # 九、测试说明
-    report.append("九、测试说明")
-    report.append("-" * 80)
-    report.append("1. 本测试基于霍兰德职业兴趣理论（RIASEC模型），是国际公认的职业兴趣评估工具。")
-    report.append("2. 测试结果反映的是职业兴趣倾向，而非能力评估。")
-    report.append("3. 职业选择应综合考虑兴趣、能力、价值观、市场需求等多方面因素。")
-    report.append("4. 建议结合其他评估工具（如能力测试、性格测试等）进行综合评估。")
-    report.append("5. 职业发展是一个动态过程，建议定期重新评估。")
-    report.append("6. 本报告仅供参考，具体职业选择请结合个人实际情况和专业咨询。")
-    report.append("")
-    
-    # 报告尾部
-    report.append("=" * 80)
-    report.append("报告生成时间：请填写实际时间")
-    report.append("本报告基于您的测试结果生成，希望对您的职业规划有所帮助。")
-    report.append("=" * 80)
-    
-    return "\n".join(report)
 
 
-def generate_summary_report(result: TestResult) -> str:
+def _append_numbered(report: List[str], items: Sequence[str], fmt: str = "  {:2d}. {}"):
+    """追加编号列表"""
+    for i, item in enumerate(items, 1):
+        report.append(fmt.format(i, item))
+
+
+def generate_summary_report(result: TestResult, bank: Optional[QuestionBank] = None) -> str:
     """
     生成简要报告（适合快速查看）
-    
+
     Args:
         result: 测试结果
-        
+        bank: 题库，None 表示按 result.bank_version 查找（同 generate_professional_report）
+
     Returns:
         简要报告文本
     """
-    report = []
-    report.append("=" * 60)
-    report.append("霍兰德职业兴趣测试 - 简要报告")
-    report.append("=" * 60)
-    report.append("")
-    
-    primary_name = HOLLAND_TYPES[result.primary_type]
+    bank = _report_bank(result, bank)
+    report = [_SUMMARY_HEAD]
+
+    primary_name = bank.type_names[result.primary_type]
     report.append(f"主要类型：{primary_name} ({result.primary_type})")
     report.append(f"类型组合：{result.type_combination}")
     report.append("")
-    
+
     report.append("各类型得分：")
     sorted_scores = sorted(result.scores.items(), key=lambda x: x[1], reverse=True)
     for type_code, score in sorted_scores:
-        type_name = HOLLAND_TYPES[type_code]
-        percentage = result.percentages[type_code]
-        report.append(f"  {type_name}: {score}/20 ({percentage:.1f}%)")
+        report.append(_summary_score_line(bank.type_names[type_code], score, bank.type_counts[type_code],
+                                          result.percentages[type_code]))
     report.append("")
-    
+
     report.append("推荐职业方向（前10项）：")
-    all_careers = set()
-    for type_code in [result.primary_type, result.secondary_type]:
-        careers = get_career_suggestions(type_code)
-        all_careers.update(careers)
-    
-    for i, career in enumerate(sorted(all_careers)[:10], 1):
-        report.append(f"  {i:2d}. {career}")
-    
+    _append_numbered(report, get_career_recommendations(result.type_combination).primary_secondary)
+
     report.append("")
     report.append("=" * 60)
-    
-    return "\n".join(report)
-
 
+    return "\n".join(report)
 
 
+@lru_cache(maxsize=1024)
+def _summary_score_line(type_name: str, score: int, total_questions: int, percentage: float) -> str:
+    return f"  {type_name}: {score}/{total_questions} ({percentage:.1f}%)"
@@ -0,0 +1,371 @@
+"""列式结果存储：只追加、以内存映射方式读取的测试结果库
+
+每个结果保存为若干定长列，每列一个文件：
+
+    scores.u8     (N, 6) uint8   各类型得分，列顺序为 TYPE_CODES
+    combination.u8 (N,)  uint8   类型代码在 COMBINATION_CODES 中的下标
+    timestamp.i64 (N,)   int64   评分时间（Unix 秒）
+    cohort.u16    (N,)   uint16  群组在 meta.json 的 cohorts 列表中的下标
+
+meta.json 记录已提交的行数，追加时先写列文件再更新行数，中途失败的追加在下次打开时被截掉。
+查询时以 numpy.memmap 映射列文件，按块做向量化的过滤和分组统计，
+内存占用只取决于块大小，与总行数无关。
+
+用法：
+    store = ResultsStore("results_db")
+    store.append_batch(score_batch(matrix), timestamp=time.time(), cohort="2025秋季")
+    store.type_code_distribution()                 # {群组: {类型代码: 人数}}
+    store.mean_percentages(cohort="2025秋季")        # {类型: 平均百分比}
+    store.trend(86400)                             # 按天统计人数和平均百分比
+"""
+
+import json
+import os
+from itertools import permutations
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .questions import QUESTION_BANK
+from .scorer import TYPE_CODES, BatchResult, TestResult
+
+# 全部 6×5×4 = 120 种类型代码，按 TYPE_CODES 的排列顺序
+COMBINATION_CODES: Tuple[str, ...] = tuple("".join(p) for p in permutations(TYPE_CODES, 3))
+
+# (主要, 次要, 第三) 类型下标 -> 类型代码下标，类型有重复的位置为 _NO_COMBINATION
+_NO_COMBINATION = 255
+_COMBINATION_LOOKUP = np.full((len(TYPE_CODES),) * 3, _NO_COMBINATION, dtype=np.uint8)
+for _i, _code in enumerate(COMBINATION_CODES):
+    _COMBINATION_LOOKUP[tuple(TYPE_CODES.index(c) for c in _code)] = _i
+# 类型代码下标 -> 主要类型下标
+_PRIMARY_OF = np.array([TYPE_CODES.index(code[0]) for code in COMBINATION_CODES], dtype=np.intp)
+
+# 列名 -> (文件名, 数据类型, 每行的元素数)
+_COLUMNS = {
+    "scores": ("scores.u8", np.uint8, len(TYPE_CODES)),
+    "combination": ("combination.u8", np.uint8, 1),
+    "timestamp": ("timestamp.i64", np.int64, 1),
+    "cohort": ("cohort.u16", np.uint16, 1),
+}
+
+_META_FILE = "meta.json"
+_FORMAT = 1
+
+# 查询时每块处理的行数
+QUERY_CHUNK_ROWS = 1 << 20
+
+TimeRange = Optional[Union[int, float]]
+
+
+def _check_bank_version(version: str):
+    # 存储中的得分都出自 meta.json 记录的题库（即当前题库），其他题库的得分不能混入
+    if version != QUESTION_BANK.version:
+        raise ValueError(f"结果的题库版本 {version} 与结果存储的题库 {QUESTION_BANK.version} 不一致")
+
+
+class ResultsStore:
+    """只追加的列式结果存储"""
+
+    def __init__(self, path: str):
+        """
+        打开或创建结果存储
+
+        Args:
+            path: 存储目录，不存在时创建
+
+        Raises:
+            ValueError: 存储的格式版本不受支持，或题库版本与当前题库不一致
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, _META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("format") != _FORMAT:
+                raise ValueError(f"不支持的结果存储格式：{meta.get('format')}")
+            if meta["bank_version"] != QUESTION_BANK.version:
+                raise ValueError(
+                    f"结果存储的题库版本 {meta['bank_version']} 与当前题库 {QUESTION_BANK.version} 不一致"
+                )
+            self._rows = int(meta["rows"])
+            self.cohorts: List[str] = list(meta["cohorts"])
+        else:
+            self._rows = 0
+            self.cohorts = []
+        self._cohort_index = {name: i for i, name in enumerate(self.cohorts)}
+        self._truncate_uncommitted()
+        self._maps: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, _COLUMNS[name][0])
+
+    def _truncate_uncommitted(self):
+        """截掉未提交（行数未写入 meta.json）的数据"""
+        for name, (_, dtype, width) in _COLUMNS.items():
+            size = self._rows * width * np.dtype(dtype).itemsize
+            column_path = self._column_path(name)
+            with open(column_path, "ab") as f:
+                if f.tell() != size:
+                    f.truncate(size)
+
+    def _write_meta(self):
+        meta = {
+            "format": _FORMAT,
+            "bank_version": QUESTION_BANK.version,
+            "rows": self._rows,
+            "cohorts": self.cohorts,
+        }
+        meta_path = os.path.join(self.path, _META_FILE)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    # ------------------------------------------------------------------
+    # 追加
+    # ------------------------------------------------------------------
+
+    def _cohort_id(self, cohort: Optional[str]) -> int:
+        cohort = cohort or ""
+        index = self._cohort_index.get(cohort)
+        if index is None:
+            if len(self.cohorts) >= np.iinfo(np.uint16).max:
+                raise ValueError("群组数超出上限")
+            index = self._cohort_index[cohort] = len(self.cohorts)
+            self.cohorts.append(cohort)
+        return index
+
+    def append(self, scores, top_types, timestamp, cohort: Optional[str] = None) -> int:
+        """
+        追加一批结果
+
+        Args:
+            scores: (N, 6) 的得分矩阵，列顺序为 TYPE_CODES
+            top_types: (N, 3) 的主要、次要、第三类型在 TYPE_CODES 中的下标
+            timestamp: 评分时间（Unix 秒），可为单个值或长度为 N 的数组
+            cohort: 这批结果所属的群组，None 表示默认群组
+
+        Returns:
+            追加的行数
+
+        Raises:
+            ValueError: 矩阵形状不正确，得分超出 0-255，或类型下标越界、同一行中有重复
+        """
+        scores = np.asarray(scores)
+        top_types = np.asarray(top_types)
+        n_rows = scores.shape[0]
+        if scores.shape != (n_rows, len(TYPE_CODES)) or top_types.shape != (n_rows, 3):
+            raise ValueError(f"得分矩阵应为 (N, 6)、类型下标应为 (N, 3)，实际为 {scores.shape}、{top_types.shape}")
+        if n_rows and ((scores < 0) | (scores > np.iinfo(np.uint8).max)).any():
+            raise ValueError(f"得分应在 0-{np.iinfo(np.uint8).max} 之间")
+        if n_rows and ((top_types < 0) | (top_types >= len(TYPE_CODES))).any():
+            raise ValueError(f"类型下标应在 0-{len(TYPE_CODES) - 1} 之间")
+        combination = _COMBINATION_LOOKUP[top_types[:, 0], top_types[:, 1], top_types[:, 2]]
+        invalid = np.flatnonzero(combination == _NO_COMBINATION)
+        if invalid.size:
+            raise ValueError(f"第 {invalid[0]} 行的主要、次要、第三类型有重复：{top_types[invalid[0]].tolist()}")
+        columns = {
+            "scores": scores.astype(np.uint8),
+            "combination": combination,
+            "timestamp": np.broadcast_to(np.asarray(timestamp, dtype=np.int64), (n_rows,)),
+            "cohort": np.full(n_rows, self._cohort_id(cohort), dtype=np.uint16),
+        }
+        for name, values in columns.items():
+            with open(self._column_path(name), "ab") as f:
+                f.write(np.ascontiguousarray(values).tobytes())
+        self._rows += n_rows
+        self._write_meta()
+        self._maps.clear()
+        return n_rows
+
+    def append_batch(self, batch: BatchResult, timestamp, cohort: Optional[str] = None) -> int:
+        """
+        追加 score_batch 的结果
+
+        Raises:
+            ValueError: 结果的题库版本与存储不一致
+        """
+        _check_bank_version(batch.bank_version)
+        return self.append(batch.scores, batch.top_types, timestamp, cohort)
+
+    def append_results(self, results: Sequence[TestResult], timestamp, cohort: Optional[str] = None) -> int:
+        """
+        追加多个 TestResult
+
+        Raises:
+            ValueError: 有结果的题库版本与存储不一致
+        """
+        for r in results:
+            _check_bank_version(r.bank_version)
+        scores = np.array([[r.scores[code] for code in TYPE_CODES] for r in results], dtype=np.int64)
+        top_types = np.array(
+            [[TYPE_CODES.index(t) for t in (r.primary_type, r.secondary_type, r.tertiary_type)]
+             for r in results],
+            dtype=np.intp,
+        ).reshape(-1, 3)
+        return self.append(scores.reshape(-1, len(TYPE_CODES)), top_types, timestamp, cohort)
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """以只读内存映射方式返回一列（scores 为 (N, 6)，其余为 (N,)）"""
+        mapped = self._maps.get(name)
+        if mapped is None:
+            _, dtype, width = _COLUMNS[name]
+            if self._rows == 0:
+                mapped = np.empty((0, width) if width > 1 else 0, dtype=dtype)
+            else:
+                shape = (self._rows, width) if width > 1 else (self._rows,)
+                mapped = np.memmap(self._column_path(name), dtype=dtype, mode="r", shape=shape)
+            self._maps[name] = mapped
+        return mapped
+
+    def _chunks(self, cohort: Optional[str], start: TimeRange, end: TimeRange,
+                chunk_rows: int) -> Iterator[Tuple[slice, Optional[np.ndarray]]]:
+        """按块产出 (行范围, 过滤掩码)，掩码为 None 表示整块都满足条件"""
+        cohort_id = None
+        if cohort is not None:
+            cohort_id = self._cohort_index.get(cohort)
+            if cohort_id is None:
+                return
+        timestamps = self.column("timestamp")
+        cohorts = self.column("cohort")
+        for begin in range(0, self._rows, chunk_rows):
+            rows = slice(begin, min(begin + chunk_rows, self._rows))
+            mask = None
+            if cohort_id is not None:
+                mask = cohorts[rows] == cohort_id
+            if start is not None:
+                in_range = timestamps[rows] >= start
+                mask = in_range if mask is None else mask & in_range
+            if end is not None:
+                in_range = timestamps[rows] < end
+                mask = in_range if mask is None else mask & in_range
+            yield rows, mask
+
+    def count(self, cohort: Optional[str] = None, start: TimeRange = None, end: TimeRange = None) -> int:
+        """满足条件的结果数"""
+        total = 0
+        for rows, mask in self._chunks(cohort, start, end, QUERY_CHUNK_ROWS):
+            total += (rows.stop - rows.start) if mask is None else int(np.count_nonzero(mask))
+        return total
+
+    def type_code_distribution(self, by_cohort: bool = True, start: TimeRange = None,
+                               end: TimeRange = None,
+                               chunk_rows: int = QUERY_CHUNK_ROWS) -> Dict[str, Dict[str, int]]:
+        """
+        类型代码分布
+
+        Args:
+            by_cohort: 是否按群组分别统计，False 时所有结果归入群组 "*"
+            start, end: 只统计评分时间在 [start, end) 内的结果
+
+        Returns:
+            {群组: {类型代码: 人数}}，只包含人数大于 0 的类型代码，按人数降序排列
+        """
+        n_groups = len(self.cohorts) if by_cohort else 1
+        counts = np.zeros(max(n_groups, 1) * len(COMBINATION_CODES), dtype=np.int64)
+        combinations = self.column("combination")
+        cohorts = self.column("cohort")
+        for rows, mask in self._chunks(None, start, end, chunk_rows):
+            keys = combinations[rows].astype(np.int64)
+            if by_cohort:
+                keys += cohorts[rows].astype(np.int64) * len(COMBINATION_CODES)
+            if mask is not None:
+                keys = keys[mask]
+            counts += np.bincount(keys, minlength=counts.size)
+
+        counts = counts.reshape(-1, len(COMBINATION_CODES))
+        names = self.cohorts if by_cohort else ["*"]
+        distribution = {}
+        for name, row in zip(names, counts):
+            order = np.argsort(-row, kind="stable")
+            distribution[name] = {COMBINATION_CODES[i]: int(row[i]) for i in order.tolist() if row[i]}
+        return distribution
+
+    def mean_percentages(self, cohort: Optional[str] = None, start: TimeRange = None,
+                         end: TimeRange = None,
+                         chunk_rows: int = QUERY_CHUNK_ROWS) -> Dict[str, float]:
+        """
+        各类型的平均百分比
+
+        Returns:
+            {类型: 平均百分比}，没有满足条件的结果时返回空字典
+        """
+        totals = np.zeros(len(TYPE_CODES), dtype=np.int64)
+        n_rows = 0
+        scores = self.column("scores")
+        for rows, mask in self._chunks(cohort, start, end, chunk_rows):
+            chunk = scores[rows] if mask is None else scores[rows][mask]
+            totals += chunk.sum(axis=0, dtype=np.int64)
+            n_rows += chunk.shape[0]
+        if not n_rows:
+            return {}
+        type_counts = np.array([QUESTION_BANK.type_counts[code] for code in TYPE_CODES])
+        means = totals / n_rows / type_counts * 100
+        return dict(zip(TYPE_CODES, means.tolist()))
+
+    def trend(self, interval: int = 86400, cohort: Optional[str] = None, start: TimeRange = None,
+              end: TimeRange = None, chunk_rows: int = QUERY_CHUNK_ROWS) -> Dict[str, np.ndarray]:
+        """
+        按时间区间统计的趋势
+
+        Args:
+            interval: 区间长度（秒），默认为一天（按 UTC 对齐）
+
+        Returns:
+            {
+                "start": (B,) 各区间的起始时间（Unix 秒）,
+                "count": (B,) 各区间的结果数,
+                "mean_percentages": (B, 6) 各区间各类型的平均百分比,
+                "primary_share": (B, 6) 各区间主要类型为各类型的比例,
+            }
+            只包含有结果的区间，按时间升序排列
+        """
+        timestamps = self.column("timestamp")
+        combinations = self.column("combination")
+        scores = self.column("scores")
+        buckets: Dict[int, np.ndarray] = {}
+        n_types = len(TYPE_CODES)
+        for rows, mask in self._chunks(cohort, start, end, chunk_rows):
+            bucket = timestamps[rows] // interval
+            chunk_scores = scores[rows]
+            primary = _PRIMARY_OF[combinations[rows]]
+            if mask is not None:
+                bucket, chunk_scores, primary = bucket[mask], chunk_scores[mask], primary[mask]
+            if not bucket.size:
+                continue
+            keys, inverse = np.unique(bucket, return_inverse=True)
+            # 每个区间一行：[人数, 六种类型得分之和, 六种主要类型的人数]
+            sums = np.zeros((keys.size, 1 + 2 * n_types), dtype=np.int64)
+            sums[:, 0] = np.bincount(inverse, minlength=keys.size)
+            for t in range(n_types):
+                sums[:, 1 + t] = np.bincount(inverse, weights=chunk_scores[:, t], minlength=keys.size)
+            sums[:, 1 + n_types:] = np.bincount(
+                inverse * n_types + primary, minlength=keys.size * n_types
+            ).reshape(keys.size, n_types)
+            for key, row in zip(keys.tolist(), sums):
+                if key in buckets:
+                    buckets[key] += row
+                else:
+                    buckets[key] = row
+
+        keys = sorted(buckets)
+        sums = np.array([buckets[k] for k in keys], dtype=np.int64).reshape(len(keys), 1 + 2 * n_types)
+        counts = sums[:, 0]
+        type_counts = np.array([QUESTION_BANK.type_counts[code] for code in TYPE_CODES])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_percentages = sums[:, 1:1 + n_types] / counts[:, None] / type_counts * 100
+            primary_share = sums[:, 1 + n_types:] / counts[:, None]
+        return {
+            "start": np.array(keys, dtype=np.int64) * interval,
+            "count": counts,
+            "mean_percentages": mean_percentages,
+            "primary_share": primary_share,
+        }
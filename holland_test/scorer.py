@@ -1,9 +1,31 @@
 """霍兰德职业兴趣测试评分系统"""
 
-from dataclasses import dataclass
-from typing import Dict, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
 
-from .questions import HOLLAND_TYPES
+from .answer_vector import AnswerVector
+from .questions import CATEGORIES, QUESTION_BANK, QuestionBank
+
+# numpy 在首次调用批量接口时导入（见 _require_numpy），逐份评分不必承担其导入耗时，也可以在未安装时使用
+np = None
+
+# 类型代码的固定顺序（R, I, A, S, E, C），批量接口的列顺序与同分排序均以此为准
+TYPE_CODES: Tuple[str, ...] = QUESTION_BANK.type_codes
+
+# 子分数的展平顺序：按 TYPE_CODES 中的类型、再按 CATEGORIES 中的维度排列
+_SUBSCORE_CELLS: Tuple[Tuple[str, str], ...] = tuple(
+    (code, category) for code in TYPE_CODES for category in CATEGORIES
+)
+_SUBSCORE_CELL: Dict[int, int] = {
+    qid: _SUBSCORE_CELLS.index(cell)
+    for qid, cell in zip(QUESTION_BANK.ids, zip(QUESTION_BANK.types, QUESTION_BANK.categories))
+}
+
+# 各题库的 题目ID -> 子分数展平下标，按题库版本哈希缓存
+_BANK_CELLS: Dict[str, Dict[int, int]] = {QUESTION_BANK.version: _SUBSCORE_CELL}
+
+# 批量评分时每次参与矩阵乘法的最大行数，避免大批量时一次性分配过大的临时矩阵
+BATCH_CHUNK_ROWS = 65536
 
 
 @dataclass
@@ -15,33 +37,91 @@ class TestResult:
     secondary_type: str  # 次要类型
     tertiary_type: str  # 第三类型
     type_combination: str  # 类型组合代码
+    subscores: Dict[str, Dict[str, float]] = field(default_factory=dict)  # 类型 -> 维度 -> 子分数
+    bank_version: str = QUESTION_BANK.version  # 评分所用题库的版本哈希（QuestionBank.version）
 
 
-def calculate_scores(answers: Dict[int, bool]) -> Dict[str, int]:
+def _subscore_cells(bank: QuestionBank) -> Dict[int, int]:
+    cells = _BANK_CELLS.get(bank.version)
+    if cells is None:
+        cells = _BANK_CELLS[bank.version] = {
+            qid: _SUBSCORE_CELLS.index(cell) for qid, cell in zip(bank.ids, zip(bank.types, bank.categories))
+        }
+    return cells
+
+
+def _default_layout(bank: Optional[QuestionBank]) -> bool:
+    """
+    题库布局是否与默认题库相同（同一版本的各语言题库相同）：AnswerVector 的位和预计算的
+    关联矩阵都按默认题库的题目顺序排列，布局相同时可以直接使用
+    """
+    return bank is None or bank is QUESTION_BANK or bank.same_layout(QUESTION_BANK)
+
+
+def calculate_scores(answers: Union[Dict[int, bool], AnswerVector],
+                     bank: Optional[QuestionBank] = None) -> Dict[str, int]:
     """
     计算各类型得分（性能优化版本）
     
     Args:
-        answers: 题目ID到答案的映射，True表示"是"，False表示"否"
+        answers: 题目ID到答案的映射（True表示"是"，False表示"否"），
+            或紧凑的 AnswerVector
+        bank: 评分所用的题库，None 表示默认题库
         
     Returns:
         每种类型的得分（答"是"的题目数量）
     """
-    from .questions import QUESTIONS
+    if isinstance(answers, AnswerVector):
+        # 紧凑向量：与各类型掩码按位与后计数，无需转换回字典
+        if _default_layout(bank):
+            return answers.type_scores()
+        answers = answers.to_dict()
     
-    # 性能优化：使用字典推导式和集合操作
-    scores = {type_code: 0 for type_code in HOLLAND_TYPES.keys()}
-    type_counts = {type_code: 0 for type_code in HOLLAND_TYPES.keys()}
+    # 性能优化：只遍历答案本身，通过预编译的题库索引查找类型，
+    # 不再逐题扫描 QUESTIONS；不在题库中的题目ID会被忽略
+    type_of = (bank or QUESTION_BANK).type_of
+    scores = dict.fromkeys(TYPE_CODES, 0)
+    for qid, ans in answers.items():
+        if ans:
+            type_code = type_of.get(qid)
+            if type_code is not None:
+                scores[type_code] += 1
     
-    # 性能优化：单次遍历，减少字典查找
-    answers_set = {qid for qid, ans in answers.items() if ans}
+    return scores
+
+
+def calculate_subscores(answers: Union[Dict[int, bool], AnswerVector],
+                        weights: Optional[Mapping[int, float]] = None,
+                        bank: Optional[QuestionBank] = None) -> Dict[str, Dict[str, float]]:
+    """
+    计算类型×维度（兴趣、活动、技能、价值观）子分数
     
-    for question in QUESTIONS:
-        type_counts[question.type] += 1
-        if question.id in answers_set:
-            scores[question.type] += 1
+    Args:
+        answers: 题目ID到答案的映射，或紧凑的 AnswerVector
+        weights: 题目ID到权重的映射，未列出的题目权重为 1；
+            None 表示不加权，子分数为回答"是"的题目数量
+        bank: 评分所用的题库，None 表示默认题库
+        
+    Returns:
+        类型 -> 维度 -> 子分数（回答"是"的题目的权重之和）
+    """
+    if isinstance(answers, AnswerVector):
+        if weights is None and _default_layout(bank):
+            return answers.category_scores()
+        answers = answers.to_dict()
     
-    return scores
+    # 按预编译的 题目ID -> (类型, 维度) 展平下标累加，最后再整理为嵌套字典
+    cell_of = (_SUBSCORE_CELL if bank is None else _subscore_cells(bank)).get
+    totals = [0 if weights is None else 0.0] * len(_SUBSCORE_CELLS)
+    for qid, ans in answers.items():
+        if ans:
+            cell = cell_of(qid)
+            if cell is not None:
+                totals[cell] += 1 if weights is None else weights.get(qid, 1.0)
+    
+    width = len(CATEGORIES)
+    return {code: dict(zip(CATEGORIES, totals[row * width:(row + 1) * width]))
+            for row, code in enumerate(TYPE_CODES)}
 
 
 def calculate_percentages(scores: Dict[str, int], type_counts: Dict[str, int]) -> Dict[str, float]:
@@ -56,7 +136,7 @@ def calculate_percentages(scores: Dict[str, int], type_counts: Dict[str, int]) -
         各类型的百分比
     """
     percentages = {}
-    for type_code in HOLLAND_TYPES.keys():
+    for type_code in TYPE_CODES:
         count = type_counts.get(type_code, 1)
         score = scores.get(type_code, 0)
         percentages[type_code] = (score / count * 100) if count > 0 else 0.0
@@ -83,20 +163,29 @@ def determine_types(scores: Dict[str, int]) -> Tuple[str, str, str]:
     return primary, secondary, tertiary
 
 
-def score_test(answers: Dict[int, bool]) -> TestResult:
+def score_test(answers: Union[Dict[int, bool], AnswerVector],
+               weights: Optional[Mapping[int, float]] = None,
+               bank: Optional[QuestionBank] = None) -> TestResult:
     """
     计算测试结果
     
     Args:
-        answers: 题目ID到答案的映射（True/False）
+        answers: 题目ID到答案的映射（True/False），或紧凑的 AnswerVector
+        weights: 计算子分数时各题的权重（见 calculate_subscores），不影响类型得分
+        bank: 评分所用的题库（questions.load_question_bank），None 表示默认题库；
+            AnswerVector 的位总是按默认题库的题目顺序排列
         
     Returns:
-        测试结果对象
+        测试结果对象（bank_version 为所用题库的版本哈希）
     """
-    from .questions import get_question_count_by_type
-    
-    scores = calculate_scores(answers)
-    type_counts = get_question_count_by_type()
+    subscores = calculate_subscores(answers, weights, bank)
+    if weights is None:
+        # 不加权时类型得分就是各维度子分数之和，无需再遍历一次答案
+        scores = {code: sum(row.values()) for code, row in subscores.items()}
+    else:
+        scores = calculate_scores(answers, bank)
+    bank = bank or QUESTION_BANK
+    type_counts = bank.type_counts
     percentages = calculate_percentages(scores, type_counts)
     primary, secondary, tertiary = determine_types(scores)
     type_combination = primary + secondary + tertiary
@@ -108,4 +197,222 @@ def score_test(answers: Dict[int, bool]) -> TestResult:
         secondary_type=secondary,
         tertiary_type=tertiary,
         type_combination=type_combination,
+        subscores=subscores,
+        bank_version=bank.version,
     )
+
+
+@dataclass
+class BatchResult:
+    """批量测试结果（每一行对应一份答卷）"""
+    scores: "np.ndarray"  # (N, 6) 每种类型的得分，列顺序为 TYPE_CODES
+    percentages: "np.ndarray"  # (N, 6) 每种类型的百分比
+    top_types: "np.ndarray"  # (N, 3) 主要、次要、第三类型在 TYPE_CODES 中的下标
+    subscores: "np.ndarray" = None  # (N, 6, 4) 类型×维度子分数，维度顺序为 CATEGORIES
+    bank_version: str = QUESTION_BANK.version  # 评分所用题库的版本哈希
+
+    def __len__(self) -> int:
+        return int(self.scores.shape[0])
+
+    def type_combinations(self) -> List[str]:
+        """返回每一行的类型组合代码"""
+        codes = np.array(TYPE_CODES)
+        letters = codes[self.top_types]
+        return ["".join(row) for row in letters.tolist()]
+
+    def to_result(self, row: int) -> TestResult:
+        """将第 row 行转换为与 score_test 相同的 TestResult"""
+        scores = {code: int(v) for code, v in zip(TYPE_CODES, self.scores[row].tolist())}
+        percentages = dict(zip(TYPE_CODES, self.percentages[row].tolist()))
+        primary, secondary, tertiary = (TYPE_CODES[i] for i in self.top_types[row].tolist())
+        subscores = {}
+        if self.subscores is not None:
+            subscores = {code: dict(zip(CATEGORIES, values))
+                         for code, values in zip(TYPE_CODES, self.subscores[row].tolist())}
+        return TestResult(
+            scores=scores,
+            percentages=percentages,
+            primary_type=primary,
+            secondary_type=secondary,
+            tertiary_type=tertiary,
+            type_combination=primary + secondary + tertiary,
+            subscores=subscores,
+            bank_version=self.bank_version,
+        )
+
+    def iter_results(self) -> Iterator[TestResult]:
+        """逐行生成 TestResult"""
+        for row in range(len(self)):
+            yield self.to_result(row)
+
+
+_INCIDENCE = None
+_TYPE_COUNTS = None
+_CATEGORY_INCIDENCE = None
+_SCORING_MATRIX = None
+
+
+def get_incidence_matrix() -> "np.ndarray":
+    """
+    获取题目-类型关联矩阵（首次调用时构建并缓存）
+    
+    Returns:
+        (题目数, 6) 的 float32 矩阵，第 j 行对应题库中的第 j 道题，
+        该题所属类型的列为 1，其余为 0
+    """
+    global _INCIDENCE, _TYPE_COUNTS
+    if _INCIDENCE is None:
+        _require_numpy()
+        bank = QUESTION_BANK
+        type_index = {code: i for i, code in enumerate(TYPE_CODES)}
+        incidence = np.zeros((len(bank), len(TYPE_CODES)), dtype=np.float32)
+        for row, type_code in enumerate(bank.types):
+            incidence[row, type_index[type_code]] = 1.0
+        incidence.setflags(write=False)
+        type_counts = incidence.sum(axis=0).astype(np.int64)
+        type_counts.setflags(write=False)
+        _INCIDENCE, _TYPE_COUNTS = incidence, type_counts
+    return _INCIDENCE
+
+
+def get_category_incidence() -> "np.ndarray":
+    """
+    获取题目-类型-维度关联张量（首次调用时构建并缓存）
+    
+    Returns:
+        (题目数, 6, 4) 的 float32 张量，第 j 道题在其所属类型和维度处为 1，其余为 0
+    """
+    global _CATEGORY_INCIDENCE
+    if _CATEGORY_INCIDENCE is None:
+        _require_numpy()
+        tensor = _category_tensor(QUESTION_BANK)
+        tensor.setflags(write=False)
+        _CATEGORY_INCIDENCE = tensor
+    return _CATEGORY_INCIDENCE
+
+
+def _category_tensor(bank: QuestionBank) -> "np.ndarray":
+    type_index = {code: i for i, code in enumerate(TYPE_CODES)}
+    category_index = {category: i for i, category in enumerate(CATEGORIES)}
+    tensor = np.zeros((len(bank), len(TYPE_CODES), len(CATEGORIES)), dtype=np.float32)
+    for row, (type_code, category) in enumerate(zip(bank.types, bank.categories)):
+        tensor[row, type_index[type_code], category_index[category]] = 1.0
+    return tensor
+
+
+# 布局与默认题库不同的题库的不加权评分矩阵，按题库版本哈希缓存
+_BANK_SCORING_MATRICES: Dict[str, "np.ndarray"] = {}
+
+
+def _scoring_matrix(weights: Optional[Mapping[int, float]],
+                    bank: Optional[QuestionBank] = None) -> "np.ndarray":
+    """
+    得分与子分数共用的 (题目数, 6 + 24) 矩阵：前6列为类型关联矩阵，
+    其后为按权重缩放并展平的类型-维度关联张量，一次矩阵乘法同时得到两者
+    """
+    global _SCORING_MATRIX
+    if _default_layout(bank):
+        if weights is None and _SCORING_MATRIX is not None:
+            return _SCORING_MATRIX
+        bank = QUESTION_BANK
+        incidence = get_incidence_matrix()
+        tensor = get_category_incidence().reshape(len(bank), -1)
+    else:
+        if weights is None and bank.version in _BANK_SCORING_MATRICES:
+            return _BANK_SCORING_MATRICES[bank.version]
+        full = _category_tensor(bank)
+        incidence, tensor = full.sum(axis=2), full.reshape(len(bank), -1)
+    if weights is None:
+        matrix = np.hstack([incidence, tensor])
+        matrix.setflags(write=False)
+        if bank is QUESTION_BANK:
+            _SCORING_MATRIX = matrix
+        else:
+            _BANK_SCORING_MATRICES[bank.version] = matrix
+        return matrix
+    column_weights = np.array([weights.get(qid, 1.0) for qid in bank.ids], dtype=np.float64)
+    return np.hstack([incidence, tensor * column_weights[:, None]]).astype(np.float64)
+
+
+def score_batch(answers: "np.ndarray", weights: Optional[Mapping[int, float]] = None,
+                bank: Optional[QuestionBank] = None) -> BatchResult:
+    """
+    批量计算测试结果（向量化版本）
+    
+    得分和类型×维度子分数通过答案矩阵与预计算关联矩阵的一次矩阵乘法同时得到，
+    每一行的结果与对同一份答卷调用 score_test 完全一致。
+    
+    同分处理：得分高者在前；得分相同时按 TYPE_CODES 顺序（R, I, A, S, E, C）
+    排列，与 score_test 中稳定排序的结果相同。
+    
+    Args:
+        answers: (N, 题目数) 的布尔或 uint8 矩阵，第 j 列对应题库中的第 j 道题，
+            非零表示"是"
+        weights: 计算子分数时各题的权重（见 calculate_subscores），不影响类型得分
+        bank: 评分所用的题库，None 表示默认题库；列顺序为该题库的题目顺序
+        
+    Returns:
+        批量测试结果（不加权时子分数为 int64，加权时为 float64）
+    """
+    _require_numpy()
+    matrix = _scoring_matrix(weights, bank)
+    answers = np.asarray(answers)
+    if answers.ndim != 2 or answers.shape[1] != matrix.shape[0]:
+        raise ValueError(
+            f"答案矩阵形状应为 (N, {matrix.shape[0]})，实际为 {answers.shape}"
+        )
+    
+    n_rows = answers.shape[0]
+    n_types = len(TYPE_CODES)
+    scores = np.empty((n_rows, n_types), dtype=np.int64)
+    subscores = np.empty((n_rows, n_types * len(CATEGORIES)),
+                         dtype=np.int64 if weights is None else np.float64)
+    # 分块计算，控制临时矩阵的内存占用
+    for start in range(0, n_rows, BATCH_CHUNK_ROWS):
+        chunk = answers[start:start + BATCH_CHUNK_ROWS]
+        product = (chunk != 0).astype(matrix.dtype) @ matrix
+        scores[start:start + BATCH_CHUNK_ROWS] = product[:, :n_types]
+        subscores[start:start + BATCH_CHUNK_ROWS] = product[:, n_types:]
+    
+    # 与 calculate_percentages 相同的运算顺序（先除后乘），保证浮点结果逐位一致
+    if _default_layout(bank):
+        bank, type_counts = bank or QUESTION_BANK, _TYPE_COUNTS
+    else:
+        type_counts = np.array([bank.type_counts[code] for code in TYPE_CODES], dtype=np.int64)
+    percentages = scores / type_counts * 100
+    # 稳定排序：同分时保持 TYPE_CODES 原有顺序
+    top_types = np.argsort(-scores, axis=1, kind="stable")[:, :3]
+    
+    return BatchResult(scores=scores, percentages=percentages, top_types=top_types,
+                       subscores=subscores.reshape(n_rows, n_types, len(CATEGORIES)),
+                       bank_version=bank.version)
+
+
+def answers_to_matrix(answers_list: List[Dict[int, bool]]) -> "np.ndarray":
+    """
+    将多份 {题目ID: 答案} 映射转换为 score_batch 所需的 uint8 矩阵
+    
+    Args:
+        answers_list: 多份答卷
+        
+    Returns:
+        (N, 题目数) 的 uint8 矩阵
+    """
+    _require_numpy()
+    column = QUESTION_BANK.index_of
+    matrix = np.zeros((len(answers_list), len(QUESTION_BANK)), dtype=np.uint8)
+    for row, answers in enumerate(answers_list):
+        for qid, ans in answers.items():
+            if ans and qid in column:
+                matrix[row, column[qid]] = 1
+    return matrix
+
+
+def _require_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("批量评分需要 numpy，请运行：pip install numpy") from None
+        np = numpy
@@ -0,0 +1,174 @@
+"""答卷质量筛查：在生成报告之前识别无效作答
+
+对整批答案矩阵做向量化检查，每项检查对应一个原因代码：
+
+- low_endorsement / high_endorsement：回答"是"的比例过低或过高（如全部答"否"或全部答"是"）
+- long_run：按题目顺序连续相同答案的最长长度过长
+- alternating：按题目顺序"是/否"交替出现的最长长度过长
+- flat_scales：全部类型量表内的答案方差都很小（每个量表几乎都是同一个答案）
+- too_fast：逐题用时的中位数过短（提供逐题用时时才检查）
+
+阈值由 ScreeningThresholds 配置，可从 JSON 文件加载。
+"""
+
+import json
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .questions import QUESTION_BANK
+from .scorer import get_incidence_matrix
+
+# 原因代码，ScreeningResult.flags 中第 i 位对应第 i 个原因
+REASON_CODES = (
+    "low_endorsement",
+    "high_endorsement",
+    "long_run",
+    "alternating",
+    "flat_scales",
+    "too_fast",
+)
+
+REASON_DESCRIPTIONS = {
+    "low_endorsement": "回答\"是\"的比例过低",
+    "high_endorsement": "回答\"是\"的比例过高",
+    "long_run": "连续相同答案过长",
+    "alternating": "答案交替出现过长",
+    "flat_scales": "各类型量表内答案几乎没有变化",
+    "too_fast": "作答速度过快",
+}
+
+_BITS = {code: 1 << i for i, code in enumerate(REASON_CODES)}
+
+
+@dataclass(frozen=True)
+class ScreeningThresholds:
+    """筛查阈值（题目按题库顺序排列，同类型的20道题相邻，连续相同答案的阈值应大于量表长度）"""
+    min_endorsement: float = 0.05  # 回答"是"的比例不高于该值时标记
+    max_endorsement: float = 0.95  # 回答"是"的比例不低于该值时标记
+    max_run: int = 60  # 连续相同答案达到该长度时标记
+    max_alternating: int = 20  # 交替答案达到该长度时标记
+    min_scale_variance: float = 0.05  # 全部量表内答案方差 p(1-p) 都低于该值时标记
+    min_item_seconds: float = 1.0  # 逐题用时中位数低于该值（秒）时标记
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScreeningThresholds":
+        """
+        从字典构建，未给出的阈值取默认值
+
+        Raises:
+            ValueError: 包含未知的阈值名称
+        """
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"未知的筛查阈值：{', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @classmethod
+    def load(cls, path: str) -> "ScreeningThresholds":
+        """从 JSON 文件加载"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class ScreeningResult(NamedTuple):
+    """一批答卷的筛查结果（每个数组的第 i 行对应第 i 份答卷）"""
+    flags: np.ndarray  # (N,) 原因代码的位掩码，0 表示通过
+    endorsement: np.ndarray  # (N,) 回答"是"的比例
+    longest_run: np.ndarray  # (N,) 连续相同答案的最长长度
+    longest_alternating: np.ndarray  # (N,) 交替答案的最长长度
+    scale_variance: np.ndarray  # (N, 6) 各类型量表内的答案方差，列顺序为 TYPE_CODES
+    median_item_seconds: np.ndarray  # (N,) 逐题用时中位数，未提供用时的行为 nan
+
+    @property
+    def passed(self) -> np.ndarray:
+        """(N,) 是否通过筛查"""
+        return self.flags == 0
+
+    def reasons(self, row: int) -> List[str]:
+        """第 row 份答卷被标记的原因代码"""
+        flags = int(self.flags[row])
+        return [code for code in REASON_CODES if flags & _BITS[code]]
+
+
+def _longest_streak(breaks: np.ndarray) -> np.ndarray:
+    """
+    每行最长连续段的长度
+
+    Args:
+        breaks: (N, L) 布尔矩阵，True 表示新的一段从该列开始（第 0 列视为 True）
+    """
+    positions = np.arange(breaks.shape[1])
+    starts = np.where(breaks, positions, 0)
+    starts[:, 0] = 0
+    # 每一列所在段的起点 = 该列及之前最后一个断点的位置
+    starts = np.maximum.accumulate(starts, axis=1)
+    return (positions - starts + 1).max(axis=1)
+
+
+def screen(answers, thresholds: Optional[ScreeningThresholds] = None,
+           item_seconds=None) -> ScreeningResult:
+    """
+    筛查一批答卷
+
+    Args:
+        answers: (N, 题目数) 的 0/1 矩阵，列顺序为题库顺序（即作答顺序）
+        thresholds: 筛查阈值，None 表示默认阈值
+        item_seconds: 可选的 (N, 题目数) 逐题用时（秒），没有用时数据的行可整行为 nan
+
+    Returns:
+        筛查结果
+    """
+    thresholds = thresholds or ScreeningThresholds()
+    answers = np.asarray(answers) != 0
+    if answers.ndim != 2 or answers.shape[1] != len(QUESTION_BANK):
+        raise ValueError(f"答案矩阵形状应为 (N, {len(QUESTION_BANK)})，实际为 {answers.shape}")
+    n_rows = answers.shape[0]
+    flags = np.zeros(n_rows, dtype=np.uint8)
+
+    endorsement = answers.mean(axis=1)
+    flags[endorsement <= thresholds.min_endorsement] |= _BITS["low_endorsement"]
+    flags[endorsement >= thresholds.max_endorsement] |= _BITS["high_endorsement"]
+
+    changed = np.zeros_like(answers)
+    changed[:, 1:] = answers[:, 1:] != answers[:, :-1]
+    longest_run = _longest_streak(changed)
+    longest_alternating = _longest_streak(~changed)
+    flags[longest_run >= thresholds.max_run] |= _BITS["long_run"]
+    flags[longest_alternating >= thresholds.max_alternating] |= _BITS["alternating"]
+
+    # 量表内回答"是"的比例 p，0/1 答案的方差为 p(1-p)
+    incidence = get_incidence_matrix()
+    scale_p = (answers.astype(np.float32) @ incidence) / incidence.sum(axis=0)
+    scale_variance = scale_p * (1 - scale_p)
+    flags[(scale_variance < thresholds.min_scale_variance).all(axis=1)] |= _BITS["flat_scales"]
+
+    median_item_seconds = np.full(n_rows, np.nan)
+    if item_seconds is not None:
+        item_seconds = np.asarray(item_seconds, dtype=np.float64)
+        if item_seconds.shape != answers.shape:
+            raise ValueError(f"逐题用时的形状应为 {answers.shape}，实际为 {item_seconds.shape}")
+        timed = ~np.isnan(item_seconds).any(axis=1)
+        median_item_seconds[timed] = np.median(item_seconds[timed], axis=1)
+        flags[timed & (median_item_seconds < thresholds.min_item_seconds)] |= _BITS["too_fast"]
+
+    return ScreeningResult(
+        flags=flags,
+        endorsement=endorsement,
+        longest_run=longest_run,
+        longest_alternating=longest_alternating,
+        scale_variance=scale_variance,
+        median_item_seconds=median_item_seconds,
+    )
+
+
+def summarize(result: ScreeningResult) -> Dict[str, int]:
+    """各原因代码标记的答卷数，以及通过筛查的答卷数（"passed"）"""
+    counts = {code: int((result.flags & _BITS[code]).astype(bool).sum()) for code in REASON_CODES}
+    counts["passed"] = int(result.passed.sum())
+    return counts
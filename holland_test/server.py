@@ -0,0 +1,315 @@
+"""霍兰德职业兴趣测试评分服务
+
+基于 asyncio 的本地 HTTP/1.1 服务（仅使用标准库），支持长连接（keep-alive）。
+
+用法：
+    python -m holland_test.server --port 8765
+    python -m holland_test.server --host 0.0.0.0 --port 8765 --max-concurrency 64
+
+接口：
+    POST /score                       返回测试结果（TestResult 的各字段）
+    POST /report?kind=professional    返回测试结果及报告（kind 为 professional 或 summary）
+    GET  /health                      服务状态及计数
+
+请求体为一份答卷对象，或答卷对象的数组（批量）。答卷对象的格式与批量评分工具的 JSONL 行相同：
+    {"id": "可选", "answers": {"1": "是", "2": "否", ...}}
+    {"id": "可选", "answers": [1, 0, 1, ...]}
+    {"id": "可选", "vector": "AnswerVector 的 base64 字符串"}
+
+单份答卷无法解析时返回 400；批量请求中无法解析的答卷在对应位置返回 {"id": ..., "error": ...}。
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .batch import RowError, parse_record, result_to_dict, warm_up
+from .questions import QUESTION_BANK
+from .report_cache import REPORT_KINDS, get_default_cache
+from .scorer import score_test
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class HTTPError(Exception):
+    """以指定状态码结束当前请求"""
+
+    def __init__(self, status: HTTPStatus, message: str = ""):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+@dataclass
+class ServerStats:
+    """服务计数"""
+    connections: int = 0        # 当前连接数
+    requests: int = 0           # 已处理的请求数
+    sheets: int = 0             # 已评分的答卷数
+    rejected: int = 0           # 因超出并发或连接限制而拒绝（503）的请求数
+
+
+class ScoringServer:
+    """评分服务"""
+
+    def __init__(self, max_concurrency: int = 32, max_queue: int = 1024, max_connections: int = 1024,
+                 max_body_bytes: int = 8 * 1024 * 1024, max_batch: int = 10000,
+                 keep_alive_timeout: float = 15.0, max_headers: int = 100,
+                 max_header_bytes: int = 64 * 1024):
+        """
+        Args:
+            max_concurrency: 同时处理的请求数上限（也是评分线程数）
+            max_queue: 等待处理的请求数上限，超出时返回 503
+            max_connections: 同时保持的连接数上限，超出时返回 503 并关闭连接
+            max_body_bytes: 请求体的最大字节数，超出时返回 413
+            max_batch: 批量请求中答卷数的上限，超出时返回 413
+            keep_alive_timeout: 长连接的空闲超时（秒）
+            max_headers: 请求头的最大行数，超出时返回 431
+            max_header_bytes: 请求头的最大总字节数，超出时返回 431
+        """
+        self.max_queue = max_queue
+        self.max_connections = max_connections
+        self.max_body_bytes = max_body_bytes
+        self.max_batch = max_batch
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_headers = max_headers
+        self.max_header_bytes = max_header_bytes
+        self.stats = ServerStats()
+        self._max_concurrency = max_concurrency
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._waiting = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> Tuple[str, int]:
+        """
+        开始监听
+
+        Returns:
+            实际监听的 (地址, 端口)，port 为 0 时由系统分配端口
+        """
+        warm_up()
+        self._slots = asyncio.Semaphore(self._max_concurrency)
+        # 评分和报告生成是 CPU 密集的同步代码，放到线程池中执行，事件循环只负责收发请求
+        self._executor = ThreadPoolExecutor(max_workers=self._max_concurrency,
+                                            thread_name_prefix="holland-score")
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats.connections += 1
+        try:
+            if self.stats.connections > self.max_connections:
+                self.stats.rejected += 1
+                await self._respond(writer, HTTPStatus.SERVICE_UNAVAILABLE,
+                                    {"error": "连接数已达上限"}, keep_alive=False)
+                return
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    return
+                except ValueError:  # 单行超过 StreamReader 的长度上限
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "请求行过长"}, keep_alive=False)
+                    return
+                if not request_line:
+                    return
+                keep_alive = await self._handle_request(request_line, reader, writer)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            self.stats.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_request(self, request_line: bytes, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter) -> bool:
+        """处理一个请求，返回连接是否保持"""
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "无效的请求行"}, keep_alive=False)
+            return False
+
+        headers: Dict[str, str] = {}
+        count = size = 0
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:  # 单行超过 StreamReader 的长度上限
+                line = None
+            if line in (b"\r\n", b"\n", b""):
+                break
+            count += 1
+            size += len(line) if line is not None else 0
+            if line is None or count > self.max_headers or size > self.max_header_bytes:
+                status = HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE
+                await self._respond(writer, status, {"error": status.phrase}, keep_alive=False)
+                return False
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.max_body_bytes:
+            status = HTTPStatus.BAD_REQUEST if length < 0 else HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+            await self._respond(writer, status, {"error": status.phrase}, keep_alive=False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        self.stats.requests += 1
+        try:
+            status, payload = await self._dispatch(method, target, body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        await self._respond(writer, status, payload, keep_alive)
+        return keep_alive
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, object]:
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            return HTTPStatus.OK, {"status": "ok", "bank_version": QUESTION_BANK.version,
+                                   **asdict(self.stats)}
+        if url.path not in ("/score", "/report"):
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+        if method != "POST":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+        report_kind = None
+        if url.path == "/report":
+            report_kind = parse_qs(url.query).get("kind", ["professional"])[0]
+            if report_kind not in REPORT_KINDS:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"未知的报告类型：{report_kind}")
+
+        try:
+            document = json.loads(body)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "请求体不是有效的 JSON") from None
+        if isinstance(document, list) and len(document) > self.max_batch:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"每次最多提交 {self.max_batch} 份答卷")
+
+        if self._waiting >= self.max_queue:
+            self.stats.rejected += 1
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "请求过多，请稍后重试")
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            loop = asyncio.get_running_loop()
+            timestamp = datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")
+            payload, sheets = await loop.run_in_executor(self._executor, self._score, document,
+                                                         report_kind, timestamp)
+        finally:
+            self._slots.release()
+        self.stats.sheets += sheets
+        return HTTPStatus.OK, payload
+
+    def _score(self, document, report_kind: Optional[str], timestamp: str) -> Tuple[object, int]:
+        """在评分线程中处理单份或批量答卷，返回 (响应内容, 评分的答卷数)"""
+        if not isinstance(document, list):
+            try:
+                return self._score_sheet(document, report_kind, timestamp), 1
+            except RowError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e)) from None
+
+        results: List[Dict] = []
+        sheets = 0
+        for sheet in document:
+            try:
+                results.append(self._score_sheet(sheet, report_kind, timestamp))
+                sheets += 1
+            except RowError as e:
+                record_id = sheet.get("id") if isinstance(sheet, dict) else None
+                results.append({"id": record_id, "error": str(e)})
+        return results, sheets
+
+    def _score_sheet(self, sheet, report_kind: Optional[str], timestamp: str) -> Dict:
+        vector = parse_record(sheet)
+        result = score_test(vector)
+        row = result_to_dict(sheet.get("id"), result)
+        if report_kind is not None:
+            row["report"] = get_default_cache().get_report(result, report_kind, timestamp)
+        return row
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: HTTPStatus, payload,
+                       keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+        ]
+        if keep_alive:
+            head.append("Connection: keep-alive")
+            head.append(f"Keep-Alive: timeout={int(self.keep_alive_timeout)}")
+        else:
+            head.append("Connection: close")
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **options):
+    """启动评分服务并一直运行"""
+    server = ScoringServer(**options)
+    host, port = await server.start(host, port)
+    print(f"评分服务已启动：http://{host}:{port}（POST /score、POST /report、GET /health）")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="霍兰德职业兴趣测试评分服务")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"监听地址（默认 {DEFAULT_HOST}）")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"监听端口（默认 {DEFAULT_PORT}）")
+    parser.add_argument("--max-concurrency", type=int, default=32, help="同时处理的请求数上限")
+    parser.add_argument("--max-queue", type=int, default=1024, help="等待处理的请求数上限")
+    parser.add_argument("--max-connections", type=int, default=1024, help="同时保持的连接数上限")
+    parser.add_argument("--max-batch", type=int, default=10000, help="批量请求中答卷数的上限")
+    parser.add_argument("--keep-alive", type=float, default=15.0, help="长连接空闲超时（秒）")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, max_concurrency=args.max_concurrency,
+                          max_queue=args.max_queue, max_connections=args.max_connections,
+                          max_batch=args.max_batch, keep_alive_timeout=args.keep_alive))
+    except KeyboardInterrupt:
+        print("\n评分服务已停止")
+
+
+if __name__ == "__main__":
+    main()
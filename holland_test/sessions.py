@@ -0,0 +1,316 @@
+"""服务端会话存储：保存大量答题中的测试会话
+
+每个会话只保存两个120位的位集合（已作答、回答"是"）和两个时间戳，
+对象使用 __slots__，十万个会话约占用几十MB内存。存储按最近访问顺序维护会话：
+
+- 超过 TTL 未访问的会话过期删除
+- 会话总内存超过上限时淘汰最久未访问的会话
+
+snapshot/restore 将全部会话写入磁盘或从磁盘恢复，服务重启后会话不丢失。
+"""
+
+import os
+import secrets
+import struct
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional
+
+from .answer_vector import CATEGORY_MASKS, TYPE_MASKS, VECTOR_BITS, VECTOR_BYTES, AnswerVector, _popcount
+from .questions import QUESTION_BANK
+from .scorer import TestResult, calculate_percentages, determine_types
+
+_FULL_MASK = (1 << VECTOR_BITS) - 1
+
+# 快照文件格式：文件头（魔数、格式版本、题库版本），随后每个会话一条记录
+_SNAPSHOT_MAGIC = b"HTSS"
+_SNAPSHOT_FORMAT = 1
+_HEADER = struct.Struct("<4sHH")           # 魔数, 格式版本, 题库版本字节数
+_RECORD = struct.Struct(f"<H{VECTOR_BYTES}s{VECTOR_BYTES}sdd")  # ID 字节数, 已作答, 是, 创建时间, 最近访问时间
+
+
+class Session:
+    """一个答题中的测试会话"""
+
+    __slots__ = ("session_id", "answered", "yes", "created", "last_access")
+
+    def __init__(self, session_id: str, created: float, answered: int = 0, yes: int = 0,
+                 last_access: Optional[float] = None):
+        self.session_id = session_id
+        self.answered = answered   # 已作答题目的位集合（位布局与 AnswerVector 相同）
+        self.yes = yes             # 回答"是"的题目的位集合
+        self.created = created
+        self.last_access = created if last_access is None else last_access
+
+    def __len__(self) -> int:
+        """已作答的题目数"""
+        return _popcount(self.answered)
+
+    def answer(self, question_id: int, answer: bool):
+        """
+        作答或修改某题的答案
+
+        Raises:
+            KeyError: 题目ID不在题库中
+        """
+        bit = 1 << QUESTION_BANK.index_of[question_id]
+        self.answered |= bit
+        if answer:
+            self.yes |= bit
+        else:
+            self.yes &= ~bit
+
+    def get(self, question_id: int) -> Optional[bool]:
+        """获取某题当前的答案，未作答时返回 None"""
+        bit = 1 << QUESTION_BANK.index_of[question_id]
+        if not self.answered & bit:
+            return None
+        return bool(self.yes & bit)
+
+    @property
+    def complete(self) -> bool:
+        """是否已作答全部题目"""
+        return self.answered == _FULL_MASK
+
+    def scores(self) -> Dict[str, int]:
+        """当前各类型得分"""
+        return {code: _popcount(self.yes & mask) for code, mask in TYPE_MASKS.items()}
+
+    def subscores(self) -> Dict[str, Dict[str, int]]:
+        """当前类型×维度子分数"""
+        return {
+            code: {category: _popcount(self.yes & mask) for category, mask in masks.items()}
+            for code, masks in CATEGORY_MASKS.items()
+        }
+
+    def answered_counts(self) -> Dict[str, int]:
+        """各类型已作答的题目数"""
+        return {code: _popcount(self.answered & mask) for code, mask in TYPE_MASKS.items()}
+
+    def result(self) -> TestResult:
+        """当前的测试结果（与对已作答部分调用 score_test 的结果相同）"""
+        scores = self.scores()
+        primary, secondary, tertiary = determine_types(scores)
+        return TestResult(
+            scores=scores,
+            percentages=calculate_percentages(scores, QUESTION_BANK.type_counts),
+            primary_type=primary,
+            secondary_type=secondary,
+            tertiary_type=tertiary,
+            type_combination=primary + secondary + tertiary,
+            subscores=self.subscores(),
+        )
+
+    def to_vector(self) -> AnswerVector:
+        """当前答案的紧凑表示（未作答的题目视为"否"）"""
+        return AnswerVector(self.yes)
+
+    def __repr__(self) -> str:
+        return f"Session({self.session_id!r}, answered={len(self)})"
+
+
+def _estimate_session_bytes() -> int:
+    """单个会话的内存占用上限（按全部作答、ID 为默认长度估算，含字典条目开销）"""
+    session = Session(secrets.token_urlsafe(16), time.time(), _FULL_MASK, _FULL_MASK)
+    size = sys.getsizeof(session) + sys.getsizeof(session.session_id)
+    size += sys.getsizeof(session.answered) + sys.getsizeof(session.yes)
+    size += sys.getsizeof(session.created) + sys.getsizeof(session.last_access)
+    # OrderedDict 每个条目的哈希表槽位和双向链表节点
+    return size + 100
+
+
+SESSION_BYTES = _estimate_session_bytes()
+
+
+@dataclass
+class StoreStats:
+    """会话存储统计"""
+    created: int = 0  # 创建的会话数
+    restored: int = 0  # 从快照恢复的会话数
+    expired: int = 0  # 因超过 TTL 未访问而删除的会话数
+    evictions: int = 0  # 因内存上限被淘汰的会话数
+
+
+class SessionStore:
+    """按最近访问顺序维护的会话存储"""
+
+    def __init__(self, ttl: float = 1800.0, max_bytes: int = 256 * 1024 * 1024,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            ttl: 会话超过该秒数未访问即过期
+            max_bytes: 会话总内存的上限（按 SESSION_BYTES 估算）
+            clock: 当前时间（秒），快照中保存的是该时钟的时间，默认为系统时间
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_sessions = max(1, max_bytes // SESSION_BYTES)
+        self.clock = clock
+        self.stats = StoreStats()
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """当前存活的会话数"""
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        """会话是否存在且未过期（不刷新访问时间，也不改变访问顺序）"""
+        session = self._sessions.get(session_id)
+        return session is not None and self.clock() - session.last_access <= self.ttl
+
+    def __iter__(self) -> Iterator[Session]:
+        """按最久未访问到最近访问的顺序遍历会话"""
+        return iter(list(self._sessions.values()))
+
+    @property
+    def memory_bytes(self) -> int:
+        """当前会话占用的内存估算"""
+        return len(self._sessions) * SESSION_BYTES
+
+    def create(self, session_id: Optional[str] = None) -> Session:
+        """创建新会话，session_id 为 None 时随机生成"""
+        self.expire()
+        if session_id is None:
+            session_id = secrets.token_urlsafe(16)
+        elif session_id in self._sessions:
+            raise ValueError(f"会话已存在：{session_id}")
+        session = Session(session_id, self.clock())
+        self._insert(session)
+        self.stats.created += 1
+        return session
+
+    def _insert(self, session: Session):
+        self._sessions[session.session_id] = session
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """获取会话并刷新其访问时间，不存在或已过期时返回 None"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        now = self.clock()
+        if now - session.last_access > self.ttl:
+            del self._sessions[session_id]
+            self.stats.expired += 1
+            return None
+        session.last_access = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def answer(self, session_id: str, question_id: int, answer: bool) -> Session:
+        """
+        在会话中作答一题
+
+        Raises:
+            KeyError: 会话不存在或已过期，或题目ID不在题库中
+        """
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        session.answer(question_id, answer)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        """删除会话（如测试完成后），返回会话是否存在"""
+        return self._sessions.pop(session_id, None) is not None
+
+    def expire(self) -> int:
+        """
+        删除全部过期会话
+
+        会话按访问顺序排列，从最久未访问的一端删除，遇到未过期的会话即停止，
+        每次调用的开销与删除的会话数成正比。
+
+        Returns:
+            删除的会话数
+        """
+        deadline = self.clock() - self.ttl
+        removed = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_access >= deadline:
+                break
+            self._sessions.popitem(last=False)
+            removed += 1
+        self.stats.expired += removed
+        return removed
+
+    def snapshot(self, path: str) -> int:
+        """
+        将全部未过期的会话写入快照文件（先写临时文件再替换，写入中途失败不会损坏原快照）
+
+        Returns:
+            写入的会话数
+        """
+        self.expire()
+        version = QUESTION_BANK.version.encode("ascii")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_FORMAT, len(version)))
+            f.write(version)
+            for session in self._sessions.values():
+                session_id = session.session_id.encode("utf-8")
+                f.write(_RECORD.pack(
+                    len(session_id),
+                    session.answered.to_bytes(VECTOR_BYTES, "little"),
+                    session.yes.to_bytes(VECTOR_BYTES, "little"),
+                    session.created,
+                    session.last_access,
+                ))
+                f.write(session_id)
+        os.replace(tmp_path, path)
+        return len(self._sessions)
+
+    def restore(self, path: str) -> int:
+        """
+        从快照文件恢复会话（已过期的会话跳过，同名会话被覆盖）
+
+        Returns:
+            恢复的会话数
+
+        Raises:
+            ValueError: 文件格式不正确，或快照的题库版本与当前题库不一致
+        """
+        deadline = self.clock() - self.ttl
+        restored: Dict[str, Session] = {}
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError("会话快照文件不完整")
+            magic, fmt, version_length = _HEADER.unpack(header)
+            if magic != _SNAPSHOT_MAGIC or fmt != _SNAPSHOT_FORMAT:
+                raise ValueError("不是会话快照文件或格式版本不受支持")
+            version = f.read(version_length).decode("ascii")
+            if version != QUESTION_BANK.version:
+                raise ValueError(f"快照的题库版本 {version} 与当前题库 {QUESTION_BANK.version} 不一致")
+
+            while True:
+                record = f.read(_RECORD.size)
+                if not record:
+                    break
+                if len(record) != _RECORD.size:
+                    raise ValueError("会话快照文件不完整")
+                id_length, answered, yes, created, last_access = _RECORD.unpack(record)
+                raw_id = f.read(id_length)
+                if len(raw_id) != id_length:
+                    raise ValueError("会话快照文件不完整")
+                session_id = raw_id.decode("utf-8")
+                if last_access < deadline:
+                    continue
+                restored.pop(session_id, None)
+                restored[session_id] = Session(session_id, created, int.from_bytes(answered, "little"),
+                                               int.from_bytes(yes, "little"), last_access)
+
+        # 按访问时间与现有会话合并，保持 expire() 依赖的“最久未访问在前”的顺序
+        merged = [session for session in self._sessions.values() if session.session_id not in restored]
+        merged.extend(restored.values())
+        merged.sort(key=lambda session: session.last_access)
+        self._sessions.clear()
+        for session in merged:
+            self._insert(session)
+        self.stats.restored += len(restored)
+        return len(restored)
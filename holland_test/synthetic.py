@@ -0,0 +1,250 @@
+"""合成答卷生成器：按潜在 RIASEC 剖面和项目反应模型批量模拟答卷
+
+模拟过程：
+
+1. 每个模拟答卷者按权重随机选一个潜在剖面（LatentProfile），
+   六种类型的特质 θ 服从以剖面均值为中心的多元正态分布，
+   类型之间的相关系数取决于它们在霍兰德六边形上的距离
+2. 题目 j 回答"是"的概率按 2PL 模型计算：P = 1 / (1 + exp(-a_j·(θ_类型 - b_j)))，
+   题目参数可以取默认值，也可以来自 irt 标定的模型
+
+生成按固定大小的块进行，第 k 块使用由 (seed, k) 派生的独立随机数流，
+因此同一种子下的输出与分块方式、读取方式无关，可重复、也可以分段并行生成。
+输出可以是 (N, 120) 的 0/1 矩阵、(N, 15) 的 pack_matrix 压缩矩阵、.npy 文件或 JSONL。
+
+命令行：
+    python -m holland_test.synthetic 1000000 -o answers.npy --packed --seed 1
+    python -m holland_test.synthetic 100000 -o answers.jsonl
+"""
+
+import argparse
+import base64
+import json
+import sys
+from typing import IO, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .answer_vector import VECTOR_BYTES, pack_matrix
+from .hexagon import hexagon_distance_matrix
+from .questions import QUESTION_BANK
+from .scorer import TYPE_CODES
+
+# 每块生成的答卷数（同一种子下的输出取决于该值，修改后同一种子生成的答卷会改变）
+BLOCK_ROWS = 16384
+
+# write_jsonl 支持的答案格式
+JSONL_FORMATS = ("vector", "list")
+
+# 默认的类型间相关系数，按六边形距离 0-3 排列：相邻类型正相关，相对类型略负相关
+DEFAULT_CORRELATION = (1.0, 0.3, 0.1, -0.1)
+
+# 默认题目参数：区分度统一取 1.7，各类型的难度在 [-1, 1] 上均匀分布
+DEFAULT_DISCRIMINATION = 1.7
+DEFAULT_DIFFICULTY_RANGE = (-1.0, 1.0)
+
+
+class LatentProfile(NamedTuple):
+    """潜在剖面：六种类型特质 θ 的均值（列顺序为 TYPE_CODES）及其在人群中的权重"""
+    mean: Tuple[float, ...]
+    weight: float = 1.0
+
+
+def default_profiles(strength: float = 1.0) -> List[LatentProfile]:
+    """
+    六个等权重的剖面，各以一种类型为主：主要类型的 θ 均值为 strength，
+    其余类型按六边形距离 1、2、3 依次取 strength 的 1/2、0、-1/2
+    """
+    falloff = np.array([1.0, 0.5, 0.0, -0.5]) * strength
+    distance = hexagon_distance_matrix()
+    return [LatentProfile(tuple(falloff[distance[row]].tolist())) for row in range(len(TYPE_CODES))]
+
+
+def _default_difficulty() -> np.ndarray:
+    low, high = DEFAULT_DIFFICULTY_RANGE
+    difficulty = np.empty(len(QUESTION_BANK))
+    for code in TYPE_CODES:
+        columns = [QUESTION_BANK.index_of[qid] for qid in QUESTION_BANK.ids_by_type[code]]
+        difficulty[columns] = np.linspace(low, high, len(columns))
+    return difficulty
+
+
+class RespondentSimulator:
+    """按潜在剖面和 2PL 模型向量化生成答卷"""
+
+    def __init__(self, profiles: Optional[Sequence[LatentProfile]] = None,
+                 correlation: Sequence[float] = DEFAULT_CORRELATION,
+                 discrimination=None, difficulty=None, seed: int = 0):
+        """
+        Args:
+            profiles: 潜在剖面，None 表示 default_profiles()
+            correlation: 按六边形距离 0-3 排列的类型间相关系数（第一项应为 1）
+            discrimination: (题目数,) 的区分度（按题库顺序），或对全部题目相同的数值
+            difficulty: (题目数,) 的难度（按题库顺序），None 表示默认难度
+            seed: 随机种子
+
+        Raises:
+            ValueError: 参数形状不正确，或相关矩阵不是正定矩阵
+        """
+        profiles = list(default_profiles() if profiles is None else profiles)
+        if not profiles:
+            raise ValueError("至少需要一个潜在剖面")
+        n_types, n_items = len(TYPE_CODES), len(QUESTION_BANK)
+
+        self.means = np.array([profile.mean for profile in profiles], dtype=np.float64)
+        if self.means.shape != (len(profiles), n_types):
+            raise ValueError(f"潜在剖面的均值应有 {n_types} 个分量")
+        weights = np.array([profile.weight for profile in profiles], dtype=np.float64)
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("潜在剖面的权重应为非负数且不全为 0")
+        self.weights = weights / weights.sum()
+
+        if len(correlation) != 4:
+            raise ValueError("相关系数应按六边形距离 0-3 给出 4 个值")
+        matrix = np.asarray(correlation, dtype=np.float64)[hexagon_distance_matrix()]
+        try:
+            self._cholesky = np.linalg.cholesky(matrix)
+        except np.linalg.LinAlgError:
+            raise ValueError(f"相关系数 {tuple(correlation)} 构成的相关矩阵不是正定矩阵") from None
+
+        if discrimination is None:
+            discrimination = DEFAULT_DISCRIMINATION
+        self.discrimination = np.broadcast_to(np.asarray(discrimination, dtype=np.float64), (n_items,)).copy()
+        self.difficulty = _default_difficulty() if difficulty is None else np.asarray(difficulty, dtype=np.float64)
+        if self.difficulty.shape != (n_items,):
+            raise ValueError(f"难度应为长度 {n_items} 的向量")
+
+        self._difficulty32 = self.difficulty.astype(np.float32)
+        self._discrimination32 = self.discrimination.astype(np.float32)
+
+        type_index = {code: i for i, code in enumerate(TYPE_CODES)}
+        self._item_types = np.array([type_index[code] for code in QUESTION_BANK.types])
+        self.seed = seed
+
+    @classmethod
+    def from_irt_model(cls, model, **options) -> "RespondentSimulator":
+        """使用 irt.IRTModel 标定的题目参数"""
+        return cls(discrimination=model.discrimination, difficulty=model.difficulty, **options)
+
+    def _block(self, index: int, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """第 index 块的前 rows 行：(θ, 答案)"""
+        rng = np.random.default_rng([self.seed, index])
+        profile = rng.choice(len(self.weights), size=BLOCK_ROWS, p=self.weights)[:rows]
+        noise = rng.standard_normal((BLOCK_ROWS, len(TYPE_CODES)))[:rows]
+        theta = self.means[profile] + noise @ self._cholesky.T
+        logits = (theta[:, self._item_types].astype(np.float32) - self._difficulty32) * self._discrimination32
+        uniform = rng.random((BLOCK_ROWS, len(QUESTION_BANK)), dtype=np.float32)[:rows]
+        # u < 1/(1+e^-x) 等价于 log(u/(1-u)) < x，省去逐元素计算概率（u = 0 时左边为 -inf）
+        with np.errstate(divide="ignore"):
+            answers = np.log(uniform / (1 - uniform)) < logits
+        return theta, answers.view(np.uint8)
+
+    def iter_chunks(self, n: int, start: int = 0, packed: bool = False,
+                    with_theta: bool = False) -> Iterator:
+        """
+        逐块生成第 start 到 start + n 份答卷
+
+        Args:
+            n: 答卷数
+            start: 起始序号（同一种子下第 i 份答卷总是相同）
+            packed: 是否输出 (rows, 15) 的压缩矩阵
+            with_theta: 是否同时输出 (rows, 6) 的潜在特质 θ
+
+        Yields:
+            答案矩阵块，with_theta 时为 (答案矩阵块, θ 块)
+        """
+        position, end = start, start + n
+        while position < end:
+            index, offset = divmod(position, BLOCK_ROWS)
+            rows = min(BLOCK_ROWS - offset, end - position)
+            theta, answers = self._block(index, offset + rows)
+            answers, theta = answers[offset:], theta[offset:]
+            if packed:
+                answers = pack_matrix(answers)
+            yield (answers, theta) if with_theta else answers
+            position += rows
+
+    def generate(self, n: int, start: int = 0, packed: bool = False):
+        """生成 n 份答卷：(n, 120) 的 uint8 矩阵，packed 时为 (n, 15) 的压缩矩阵"""
+        chunks = list(self.iter_chunks(n, start, packed))
+        if not chunks:
+            return np.zeros((0, VECTOR_BYTES if packed else len(QUESTION_BANK)), dtype=np.uint8)
+        return np.concatenate(chunks)
+
+    def generate_with_theta(self, n: int, start: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """生成 n 份答卷及其潜在特质 θ（(n, 6)，列顺序为 TYPE_CODES），用于检验估计的准确性"""
+        chunks = list(self.iter_chunks(n, start, with_theta=True))
+        if not chunks:
+            return np.zeros((0, len(QUESTION_BANK)), dtype=np.uint8), np.zeros((0, len(TYPE_CODES)))
+        answers, theta = zip(*chunks)
+        return np.concatenate(answers), np.concatenate(theta)
+
+    def save_npy(self, path: str, n: int, packed: bool = True) -> int:
+        """
+        逐块写入 .npy 文件（内存映射写入，内存占用与 n 无关），可以用 mmap_mode="r" 读取
+
+        Returns:
+            写入的答卷数
+        """
+        columns = VECTOR_BYTES if packed else len(QUESTION_BANK)
+        output = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(n, columns))
+        position = 0
+        for chunk in self.iter_chunks(n, packed=packed):
+            output[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        output.flush()
+        del output
+        return n
+
+    def write_jsonl(self, stream: IO[str], n: int, fmt: str = "vector", start: int = 0) -> int:
+        """
+        以批量评分的输入格式逐行写出答卷，id 为答卷序号
+
+        Args:
+            stream: 文本输出流
+            n: 答卷数
+            fmt: vector 表示 base64 压缩答案（{"id", "vector"}），list 表示 0/1 列表（{"id", "answers"}）
+            start: 起始序号
+
+        Returns:
+            写入的行数
+        """
+        if fmt not in JSONL_FORMATS:
+            raise ValueError(f"未知的 JSONL 格式：{fmt}，可选：{', '.join(JSONL_FORMATS)}")
+        record_id = start
+        for chunk in self.iter_chunks(n, start, packed=fmt == "vector"):
+            if fmt == "vector":
+                lines = [json.dumps({"id": record_id + i, "vector": base64.b64encode(row.tobytes()).decode("ascii")})
+                         + "\n" for i, row in enumerate(chunk)]
+            else:
+                lines = [json.dumps({"id": record_id + i, "answers": row}) + "\n"
+                         for i, row in enumerate(chunk.tolist())]
+            stream.writelines(lines)
+            record_id += len(chunk)
+        return n
+
+
+def main(argv: Optional[List[str]] = None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="霍兰德职业兴趣测试合成答卷生成器")
+    parser.add_argument("rows", type=int, help="生成的答卷数")
+    parser.add_argument("-o", "--output", default="-",
+                        help="输出文件：.npy 写入答案矩阵，其余写入 JSONL，- 表示标准输出（JSONL）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--packed", action="store_true", help="写入 .npy 时使用 (N, 15) 的压缩矩阵")
+    parser.add_argument("--format", choices=JSONL_FORMATS, default="vector", help="JSONL 中答案的格式")
+    parser.add_argument("--strength", type=float, default=1.0, help="默认潜在剖面中主要类型的 θ 均值")
+    args = parser.parse_args(argv)
+
+    simulator = RespondentSimulator(default_profiles(args.strength), seed=args.seed)
+    if args.output.endswith(".npy"):
+        simulator.save_npy(args.output, args.rows, packed=args.packed)
+    elif args.output == "-":
+        simulator.write_jsonl(sys.stdout, args.rows, args.format)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            simulator.write_jsonl(f, args.rows, args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1033 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+霍兰德职业兴趣测试核心模块测试
+验证评分、报告等接口的行为
+"""
+
+import asyncio
+import itertools
+import hashlib
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import warnings
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from holland_test import analysis, batch, questions, scorer
+from holland_test.adaptive import run_adaptive, simulate
+from holland_test.analysis import (
+    CAREER_SUGGESTIONS,
+    INDUSTRY_MAPPING,
+    TYPE_DESCRIPTIONS,
+    analyze_career_positioning,
+    analyze_career_tendency,
+    analyze_profile,
+    calculate_congruence,
+    congruence_batch,
+    consistency_batch,
+    differentiation_batch,
+    type_code_indices,
+    generate_career_guidance,
+    get_career_recommendations,
+    get_career_table,
+)
+from holland_test.answer_vector import AnswerVector, pack_matrix, unpack_matrix
+from holland_test.benchmark import DEFERRED_IMPORTS, IMPORT_BUDGET_MS, measure_import_time
+from holland_test.hexagon import hexagon_distance
+from holland_test.importer import ImportConfig, import_answers, iter_blocks
+from holland_test.incremental import IncrementalScorer
+from holland_test.irt import IRTModel, calibrate, calibrate_scale
+from holland_test.norms import PopulationNorms
+from holland_test.occupations import OccupationIndex
+from holland_test.psychometrics import analyze, analyze_chunks
+from holland_test.questions import (
+    CATEGORIES,
+    QUESTION_BANK,
+    QUESTIONS,
+    available_banks,
+    build_question_bank,
+    compile_bank_index,
+    get_questions_by_type,
+    load_question_bank,
+    read_bank_index,
+)
+from holland_test.report_cache import REPORT_KINDS, ReportCache, report_key
+from holland_test.report_generator import (
+    TIMESTAMP_PLACEHOLDER,
+    generate_professional_report,
+    generate_summary_report,
+)
+from holland_test.results_store import ResultsStore
+from holland_test.screening import ScreeningThresholds, screen
+from holland_test.scorer import TYPE_CODES, answers_to_matrix, score_batch, score_test
+from holland_test.server import ScoringServer
+from holland_test.sessions import SESSION_BYTES, SessionStore
+from holland_test.synthetic import LatentProfile, RespondentSimulator
+
+
+def _random_answer_dicts(count, seed=0):
+    """生成随机答卷（包含大量同分情况）"""
+    rng = random.Random(seed)
+    sheets = []
+    for _ in range(count):
+        p = rng.choice([0.0, 0.1, 0.5, 0.9, 1.0])
+        sheets.append({q.id: rng.random() < p for q in QUESTIONS})
+    return sheets
+
+
+def test_score_batch_matches_score_test():
+    """score_batch 每一行都应与 score_test 一致"""
+    sheets = _random_answer_dicts(500)
+    batch = score_batch(answers_to_matrix(sheets))
+    for row, answers in enumerate(sheets):
+        assert batch.to_result(row) == score_test(answers)
+
+
+def test_score_batch_tie_break_follows_type_order():
+    """全部同分时按 R, I, A, S, E, C 顺序排列"""
+    batch = score_batch(np.zeros((2, len(QUESTIONS)), dtype=bool))
+    assert batch.type_combinations() == ["RIA", "RIA"]
+
+
+def test_subscores_match_direct_counts_weights_and_cache_key():
+    """类型×维度子分数：与逐题计数一致，加权时批量与逐份一致，专业报告的缓存键不含子分数"""
+    sheets = _random_answer_dicts(200, seed=19)
+    rng = random.Random(19)
+    weights = {q.id: rng.uniform(0.5, 2.0) for q in QUESTIONS[::3]}
+    weighted_batch = score_batch(answers_to_matrix(sheets), weights=weights)
+    for row, answers in enumerate(sheets):
+        result = score_test(answers)
+        for code in TYPE_CODES:
+            assert sum(result.subscores[code].values()) == result.scores[code]
+            for category in CATEGORIES:
+                expected = sum(1 for q in QUESTIONS if q.type == code and q.category == category and answers[q.id])
+                assert result.subscores[code][category] == expected
+        weighted = score_test(answers, weights=weights)
+        assert weighted.scores == result.scores
+        for code, values in zip(TYPE_CODES, weighted_batch.subscores[row].tolist()):
+            assert values == [pytest.approx(weighted.subscores[code][c]) for c in CATEGORIES]
+
+    # 得分相同、子分数不同的两份答卷共用缓存的报告正文，维度得分表各自生成后插入
+    realistic = QUESTION_BANK.ids_by_type["R"]
+    first = score_test({qid: True for qid in realistic[:5]})
+    second = score_test({qid: True for qid in realistic[-5:]})
+    assert first.scores == second.scores and first.subscores != second.subscores
+    assert report_key(first, "summary") == report_key(second, "summary")
+    assert report_key(first, "professional") == report_key(second, "professional")
+    cache = ReportCache()
+    for result in (first, second, replace(first, subscores={})):
+        assert cache.get_report(result, "professional") == generate_professional_report(result)
+    assert cache.stats.misses == 1 and cache.stats.hits == 2
+    assert "各维度得分" in generate_professional_report(first)
+
+
+def test_answer_vector_round_trip_and_scoring():
+    """AnswerVector 序列化往返一致，评分与字典输入相同"""
+    for answers in _random_answer_dicts(200, seed=1):
+        vector = AnswerVector.from_dict(answers)
+        assert len(vector.to_bytes()) == 15
+        assert AnswerVector.from_bytes(vector.to_bytes()) == vector
+        assert AnswerVector.from_base64(vector.to_base64()) == vector
+        assert score_test(vector) == score_test(answers)
+
+
+def test_pack_matrix_matches_answer_vector_bytes():
+    """打包矩阵的每一行与 AnswerVector.to_bytes() 相同"""
+    sheets = _random_answer_dicts(50, seed=2)
+    packed = pack_matrix(answers_to_matrix(sheets))
+    for row, answers in enumerate(sheets):
+        assert packed[row].tobytes() == AnswerVector.from_dict(answers).to_bytes()
+    assert (unpack_matrix(packed) == answers_to_matrix(sheets)).all()
+
+
+def test_question_bank_index_matches_questions():
+    """题库索引与 QUESTIONS 列表一致"""
+    bank = QUESTION_BANK
+    assert bank.ids == tuple(q.id for q in QUESTIONS)
+    for type_code, count in bank.type_counts.items():
+        expected = [q for q in QUESTIONS if q.type == type_code]
+        assert get_questions_by_type(type_code) == expected
+        assert count == len(expected)
+    assert sum(len(ids) for ids in bank.ids_by_category.values()) == len(QUESTIONS)
+    # 未知题目ID不计分
+    assert sum(score_test({0: True, 999: True}).scores.values()) == 0
+
+
+def test_batch_cli_scores_rows_and_collects_bad_rows(tmp_path):
+    """批量评分：正常行写入结果，错误行写入错误文件"""
+    sheets = _random_answer_dicts(20, seed=3)
+    source = tmp_path / "answers.jsonl"
+    with open(source, "w", encoding="utf-8") as f:
+        for i, answers in enumerate(sheets):
+            tokens = {qid: ("是" if ans else "N") for qid, ans in answers.items()}
+            f.write(json.dumps({"id": i, "answers": tokens}, ensure_ascii=False) + "\n")
+        f.write('{"id": "bad", "answers": {"1": "maybe"}}\n')
+    output = tmp_path / "results.jsonl"
+
+    assert batch.main([str(source), "-o", str(output)]) == 0
+
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [row["type_combination"] for row in rows] == [
+        score_test(answers).type_combination for answers in sheets
+    ]
+    bad_rows = (tmp_path / "results.jsonl.errors.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(bad_rows) == 1 and json.loads(bad_rows[0])["id"] == "bad"
+
+
+def test_batch_process_pool_keeps_input_order(tmp_path):
+    """多进程批量评分的输出与单进程完全相同"""
+    source = tmp_path / "answers.jsonl"
+    with open(source, "w", encoding="utf-8") as f:
+        for i, answers in enumerate(_random_answer_dicts(60, seed=4)):
+            f.write(json.dumps({"id": i, "answers": [int(answers[q.id]) for q in QUESTIONS]}) + "\n")
+    serial, parallel = tmp_path / "serial.jsonl", tmp_path / "parallel.jsonl"
+
+    batch.run(str(source), str(serial), None, None, jobs=1, report_kind="summary")
+    batch.run(str(source), str(parallel), None, None, jobs=2, chunk_size=7, report_kind="summary")
+
+    assert serial.read_bytes() == parallel.read_bytes()
+
+
+def test_report_cache_hits_evictions_and_disk_tier(tmp_path):
+    """报告缓存：命中与生成结果一致，容量满时淘汰，磁盘缓存可跨实例共享"""
+    results = [score_test(answers) for answers in _random_answer_dicts(40, seed=5)]
+    db_path = str(tmp_path / "reports.sqlite")
+    cache = ReportCache(maxsize=8, db_path=db_path)
+
+    for result in results + results:
+        assert cache.get_report(result) == generate_professional_report(result)
+        assert cache.get_report(result, "summary") == generate_summary_report(result)
+    for segments, _ in cache._entries.values():
+        assert all(TIMESTAMP_PLACEHOLDER not in segment for segment in segments)
+    assert len(cache) == 8 and cache.stats.evictions > 0
+
+    other = ReportCache(maxsize=8, db_path=db_path)
+    report = other.get_report(results[0], timestamp="2025年01月01日 00:00:00")
+    assert other.stats.disk_hits == 1 and other.stats.misses == 0
+    assert "报告生成时间：2025年01月01日 00:00:00" in report
+
+
+def _legacy_analysis(result):
+    """查找表引入之前的分析逻辑（逐次计算），作为对照"""
+    desc = TYPE_DESCRIPTIONS[result.primary_type]
+    primary_pct = result.percentages[result.primary_type]
+    levels = {}
+    for type_code, percentage in result.percentages.items():
+        levels[type_code] = ("很强" if percentage >= 70 else "较强" if percentage >= 50
+                             else "中等" if percentage >= 30 else "较弱")
+    if result.primary_type in ["R", "I", "A"]:
+        work_style = "更适合独立工作或小团队协作"
+    elif result.primary_type in ["S", "E"]:
+        work_style = "更适合团队合作和人际交往"
+    else:
+        work_style = "更适合规范化的工作环境"
+    team_preference = {"S": "喜欢团队合作，擅长协调人际关系", "E": "喜欢领导团队，擅长管理和组织",
+                       "R": "可以独立工作，也能参与团队项目", "I": "可以独立工作，也能参与团队项目",
+                       }.get(result.primary_type, "更适合独立创作或规范化工作")
+    industries = INDUSTRY_MAPPING[result.primary_type] + INDUSTRY_MAPPING[result.secondary_type]
+    if primary_pct >= 70:
+        career_level = "非常适合该领域，可以考虑成为该领域的专家或高级专业人员"
+        career_path = ["可以直接进入该领域，从基础岗位开始", "在该领域深耕，成为专业人才",
+                       "可以考虑在该领域内跨职能发展", "长期目标可以是该领域的专家或高级管理人员"]
+    else:
+        career_level = ("比较适合该领域，可以从基础岗位开始，逐步发展为专业人员" if primary_pct >= 50
+                        else "可以考虑该领域，但建议结合其他兴趣类型寻找更适合的方向")
+        career_path = [f"可以考虑以{result.primary_type}为主，结合{result.secondary_type}发展复合型能力",
+                       "寻找结合多个兴趣类型的职业方向", "可以先尝试该领域的工作，根据实际体验调整方向",
+                       "保持开放心态，探索更多可能性"]
+    tendency = {"dominant_type": result.primary_type,
+                "supporting_types": [result.secondary_type, result.tertiary_type],
+                "strength_level": levels, "work_style": work_style, "team_preference": team_preference}
+    positioning = {"primary_positioning": f"{desc['name']} - {desc['characteristics']}",
+                   "career_fields": [], "suitable_industries": list(dict.fromkeys(industries)),
+                   "career_level": career_level}
+    guidance = {
+        "immediate_actions": [f"深入了解{desc['name']}相关的职业领域", "收集该领域的职业信息，了解工作内容和发展前景",
+                              "寻找该领域的实习或实践机会", "与该领域的专业人士交流，了解实际工作情况"],
+        "skill_development": [f"重点培养{desc['name']}相关的核心技能", "通过课程、培训或实践提升专业技能",
+                              "建立作品集或项目经验，展示相关能力", "持续学习和更新该领域的知识和技能"],
+        "career_path": career_path,
+        "workplace_advice": [f"寻找{desc['work_environment']}的工作环境", f"在工作中体现{desc['values']}的价值观",
+                             f"避免{desc['dislikes']}为主的工作内容", "找到适合的工作风格和节奏"],
+    }
+    return tendency, positioning, guidance
+
+
+def test_analysis_table_matches_legacy_functions():
+    """查找表支撑的分析函数与逐次计算的结果一致（覆盖全部类型组合和分档）"""
+    for primary, secondary, tertiary in itertools.permutations(TYPE_CODES, 3):
+        for primary_pct in (100.0, 70.0, 69.9, 50.0, 49.9, 30.0, 29.9, 0.0):
+            percentages = {code: 35.0 for code in TYPE_CODES}
+            percentages.update({primary: primary_pct, secondary: 55.0, tertiary: 20.0})
+            result = scorer.TestResult(
+                scores={code: 0 for code in TYPE_CODES}, percentages=percentages,
+                primary_type=primary, secondary_type=secondary, tertiary_type=tertiary,
+                type_combination=primary + secondary + tertiary,
+            )
+            assert (analyze_career_tendency(result), analyze_career_positioning(result),
+                    generate_career_guidance(result)) == _legacy_analysis(result)
+
+
+def test_profile_metrics_batch_matches_scalar_versions():
+    """一致性、区分度和 C 指数：批量版本与报告使用的逐份版本逐行一致"""
+    sheets = _random_answer_dicts(300, seed=20)
+    batch_result = score_batch(answers_to_matrix(sheets))
+    consistency = consistency_batch(batch_result.scores)
+    differentiation = differentiation_batch(batch_result.percentages)
+    environments = ("RIA", "SEC", "ASI", "CRE")
+    environment_codes = np.array([type_code_indices(code) for code in environments])
+    congruence = congruence_batch(batch_result.top_types[:, None, :], environment_codes[None, :, :])
+    for row, answers in enumerate(sheets):
+        result = score_test(answers)
+        metrics = analyze_profile(result)
+        assert metrics.consistency == consistency[row] == hexagon_distance(result.primary_type, result.secondary_type)
+        assert metrics.differentiation == differentiation[row]
+        assert [calculate_congruence(result.type_combination, code) for code in environments] == congruence[row].tolist()
+    assert calculate_congruence("RIA", "RIA") == 18 and calculate_congruence("RIA", "SEC") == 0
+    assert "剖面一致性" in generate_professional_report(score_test(sheets[0]))
+
+
+def test_incremental_scorer_matches_score_test_with_changes_and_undo():
+    """增量评分：作答、修改、撤销后的结果与对当前答案调用 score_test 一致"""
+    rng = random.Random(6)
+    incremental = IncrementalScorer()
+    snapshots = []
+    for _ in range(400):
+        if snapshots and rng.random() < 0.2:
+            incremental.undo()
+            expected = snapshots.pop()
+        else:
+            snapshots.append(incremental.answers())
+            incremental.answer(rng.choice(QUESTIONS).id, rng.random() < 0.5)
+            expected = incremental.answers()
+        assert incremental.answers() == expected
+        assert incremental.result() == score_test(expected)
+
+
+def test_adaptive_test_stops_early_and_matches_full_test_when_exhausted():
+    """自适应测试：问完全部题目时结果与 score_test 相同；模拟中平均题数少于全部题目"""
+    for answers in _random_answer_dicts(20, seed=7):
+        test = run_adaptive(answers, confidence=1.1)
+        assert len(test) == len(QUESTIONS)
+        assert test.result() == score_test(answers)
+
+    stats = simulate(respondents=50, seed=0, confidence=0.9)
+    assert stats["mean_questions"] < len(QUESTIONS)
+    assert stats["primary_agreement"] > 0.8
+    # 校正后的置信度：前三类型与完整测试一致的比例不低于目标（留 1 个百分点的抽样误差）
+    stats = simulate(respondents=300, seed=0, confidence=0.95)
+    assert stats["combination_agreement"] >= 0.94 and stats["mean_questions"] < 0.8 * len(QUESTIONS)
+
+    answers = _random_answer_dicts(1, seed=7)[0]
+    test = run_adaptive(answers, confidence=0.9)
+    assert len(test) < len(QUESTIONS)
+    early = test.result()
+    assert early.subscores == {}
+    assert "各维度得分" not in generate_professional_report(early)
+
+
+def test_occupation_index_top_k_matches_brute_force(tmp_path):
+    """职业匹配：向量化 top-k 与逐个计算的余弦相似度和 C 指数一致，报告可使用职业索引"""
+    catalog = tmp_path / "occupations.csv"
+    rng = random.Random(8)
+    rows = [f"职业{i}," + ",".join(str(rng.randint(0, 3)) for _ in TYPE_CODES) for i in range(300)]
+    catalog.write_text("name," + ",".join(TYPE_CODES) + "\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    index = OccupationIndex.load(str(catalog))
+    assert len(index) == 300
+
+    results = [score_test(answers) for answers in _random_answer_dicts(30, seed=8)]
+    percentages = np.array([[r.percentages[code] for code in TYPE_CODES] for r in results])
+    for method in ("cosine", "congruence"):
+        indices, scores = index.top_k(percentages, k=10, method=method)
+        for row, result in enumerate(results):
+            person = percentages[row]
+            expected = []
+            for j, profile in enumerate(index.profiles):
+                if method == "cosine":
+                    norm = np.linalg.norm(person) * np.linalg.norm(profile)
+                    value = float(person @ profile / norm) if norm else 0.0
+                else:
+                    person_code = [TYPE_CODES[i] for i in np.argsort(-person, kind="stable")[:3]]
+                    job_code = [TYPE_CODES[i] for i in np.argsort(-profile, kind="stable")[:3]]
+                    value = sum(w * (3 - hexagon_distance(a, b))
+                                for w, a, b in zip((3, 2, 1), person_code, job_code))
+                expected.append((-round(value, 9), j))
+            expected_indices = [j for _, j in sorted(expected)[:10]]
+            assert indices[row].tolist() == expected_indices
+
+    report = generate_professional_report(results[0], occupation_index=index, top_k=5)
+    best, score = index.match(results[0], k=1)[0]
+    assert f" 1. {best}（匹配度 {score * 100:.1f}%）" in report
+    assert "综合推荐职业" not in report
+
+
+class _ReversedTieTree:
+    """KD 树替身：等距邻居按库中逆序返回，模拟 cKDTree 对并列候选的任意顺序"""
+
+    def __init__(self, points):
+        self.points = points
+
+    def query(self, x, k):
+        distances = np.round(np.linalg.norm(x[:, None, :] - self.points[None, :, :], axis=2), 12)
+        order = np.lexsort((-np.arange(len(self.points))[None, :].repeat(len(x), 0), distances), axis=1)[:, :k]
+        return np.take_along_axis(distances, order, axis=1), order
+
+
+def test_occupation_tree_path_breaks_ties_in_catalog_order():
+    """职业匹配：KD 树路径对等距职业按库中顺序排列，全零剖面的匹配分为 0，与暴力搜索结果一致"""
+    rng = random.Random(11)
+    profiles = [[rng.randint(0, 2) for _ in TYPE_CODES] for _ in range(12)] * 5
+    index = OccupationIndex([f"职业{i}" for i in range(len(profiles))], profiles, use_tree=False)
+    percentages = np.array([[rng.randint(0, 100) for _ in TYPE_CODES] for _ in range(20)], dtype=float)
+    percentages[[3, 17]] = 0  # 全零剖面的匹配分为 0，按库中顺序排列
+    for k in (1, 4, 7, 30):
+        expected = index.top_k(percentages, k=k)
+        index._tree = _ReversedTieTree(index._unit)
+        indices, scores = index.top_k(percentages, k=k)
+        index._tree = None
+        assert indices.tolist() == expected[0].tolist()
+        assert np.allclose(scores, expected[1])
+    index._tree = _ReversedTieTree(index._unit)
+    indices, scores = index.top_k(np.zeros(len(TYPE_CODES)), k=3)
+    assert indices.tolist() == [[0, 1, 2]] and scores.tolist() == [[0.0, 0.0, 0.0]]
+
+
+def test_career_table_covers_all_codes_and_matches_set_union():
+    """推荐职业表：覆盖全部120种类型代码，与逐次合并、排序、截取的结果一致"""
+    table = get_career_table()
+    assert len(table) == 120
+    for primary, secondary, tertiary in itertools.permutations(TYPE_CODES, 3):
+        careers = get_career_recommendations(primary + secondary + tertiary)
+        assert careers.primary == tuple(CAREER_SUGGESTIONS[primary][:15])
+        assert careers.secondary == tuple(CAREER_SUGGESTIONS[secondary][:10])
+        assert careers.combined == tuple(sorted(
+            set(CAREER_SUGGESTIONS[primary]) | set(CAREER_SUGGESTIONS[secondary])
+            | set(CAREER_SUGGESTIONS[tertiary]))[:20])
+        assert careers.primary_secondary == tuple(sorted(
+            set(CAREER_SUGGESTIONS[primary]) | set(CAREER_SUGGESTIONS[secondary]))[:10])
+
+
+def test_scoring_server_single_batch_and_keep_alive():
+    """评分服务：同一长连接上依次处理单份、批量和报告请求，结果与 score_test 一致"""
+    sheets = _random_answer_dicts(3, seed=9)
+
+    async def request(reader, writer, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n"
+                     .encode("latin-1") + body)
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.lower()] = value.strip()
+        data = await reader.readexactly(int(headers["content-length"]))
+        return status, headers, json.loads(data)
+
+    async def scenario():
+        server = ScoringServer(max_concurrency=2)
+        host, port = await server.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            single = {"id": "a", "answers": {str(k): "是" if v else "否" for k, v in sheets[0].items()}}
+            status, headers, row = await request(reader, writer, "POST", "/score", single)
+            assert status == 200 and headers["connection"] == "keep-alive"
+            assert row["id"] == "a" and row["scores"] == score_test(sheets[0]).scores
+
+            batch_body = [{"id": i, "answers": [int(v) for _, v in sorted(sheet.items())]}
+                          for i, sheet in enumerate(sheets)]
+            batch_body.append({"id": "bad", "answers": [1, 0]})
+            status, _, rows = await request(reader, writer, "POST", "/report?kind=summary", batch_body)
+            assert status == 200 and len(rows) == 4
+            for sheet, row in zip(sheets, rows):
+                result = score_test(sheet)
+                assert row["type_combination"] == result.type_combination
+                assert row["report"] == generate_summary_report(result)
+            assert rows[3]["id"] == "bad" and "error" in rows[3]
+
+            assert (await request(reader, writer, "POST", "/score", {"answers": [1]}))[0] == 400
+            assert (await request(reader, writer, "GET", "/missing"))[0] == 404
+            status, _, health = await request(reader, writer, "GET", "/health")
+            assert status == 200 and health["sheets"] == 4 and health["connections"] == 1
+        finally:
+            writer.close()
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_scoring_server_serves_other_requests_while_scoring():
+    """评分服务：评分在线程池中进行，耗时请求处理期间仍能响应 /health，超出排队上限的请求返回 503"""
+    sheet = {"answers": [1, 0] * (len(QUESTIONS) // 2)}
+    started, release = threading.Event(), threading.Event()
+
+    async def send(host, port, method, path, payload=None):
+        reader, writer = await asyncio.open_connection(host, port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nConnection: close\r\nContent-Length: {len(body)}\r\n\r\n"
+                     .encode("latin-1") + body)
+        response = await reader.read()
+        writer.close()
+        head, _, data = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(data)
+
+    async def scenario():
+        server = ScoringServer(max_concurrency=1, max_queue=1)
+        score_sheet = server._score_sheet
+
+        def slow_score_sheet(*args):
+            started.set()
+            release.wait(5)
+            return score_sheet(*args)
+
+        server._score_sheet = slow_score_sheet
+        host, port = await server.start("127.0.0.1", 0)
+        try:
+            first = asyncio.ensure_future(send(host, port, "POST", "/score", sheet))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            status, health = await asyncio.wait_for(send(host, port, "GET", "/health"), 2)
+            assert status == 200 and health["sheets"] == 0
+            queued = asyncio.ensure_future(send(host, port, "POST", "/score", sheet))
+            while server._waiting == 0:
+                await asyncio.sleep(0.01)
+            status, _ = await asyncio.wait_for(send(host, port, "POST", "/score", sheet), 2)
+            assert status == 503 and not first.done()
+            release.set()
+            assert (await first)[0] == 200 and (await queued)[0] == 200
+            assert server.stats.sheets == 2 and server.stats.rejected == 1
+        finally:
+            release.set()
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_scoring_server_rejects_oversized_request_heads():
+    """评分服务：请求行或单行请求头超过长度上限、请求头行数或总字节数超限时返回 4xx 而非断开连接"""
+
+    async def send(host, port, head):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(head.encode("latin-1"))
+        response = await reader.read()
+        writer.close()
+        return int(response.split()[1])
+
+    async def scenario():
+        server = ScoringServer(max_headers=10, max_header_bytes=1024)
+        host, port = await server.start("127.0.0.1", 0)
+        try:
+            assert await send(host, port, "GET /" + "x" * 100000 + " HTTP/1.1\r\n\r\n") == 400
+            assert await send(host, port, "GET /health HTTP/1.1\r\nX: " + "x" * 100000 + "\r\n\r\n") == 431
+            assert await send(host, port, "GET /health HTTP/1.1\r\n" + "X: 1\r\n" * 11 + "\r\n") == 431
+            assert await send(host, port, "GET /health HTTP/1.1\r\nX: " + "x" * 2000 + "\r\n\r\n") == 431
+            assert await send(host, port, "GET /health HTTP/1.1\r\n" + "X: 1\r\n" * 10
+                              + "Connection: close\r\n\r\n") == 431
+            assert await send(host, port, "GET /health HTTP/1.1\r\n" + "X: 1\r\n" * 9
+                              + "Connection: close\r\n\r\n") == 200
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_session_store_ttl_eviction_and_snapshot(tmp_path):
+    """会话存储：过期、按内存上限淘汰、快照恢复，会话结果与 score_test 一致"""
+    now = [1000.0]
+    store = SessionStore(ttl=60, max_bytes=3 * SESSION_BYTES, clock=lambda: now[0])
+    sheet = _random_answer_dicts(1, seed=10)[0]
+    first = store.create("a")
+    for qid, answer in list(sheet.items())[:50]:
+        store.answer("a", qid, answer)
+    assert len(first) == 50 and first.get(QUESTIONS[60].id) is None
+    assert first.result() == score_test(dict(list(sheet.items())[:50]))
+
+    store.create("b")
+    store.create("c")
+    now[0] += 30
+    store.get("a")                      # a 成为最近访问的会话
+    store.create("d")                   # 超过 3 个会话，淘汰最久未访问的 b
+    assert "b" not in store and len(store) == 3 and store.stats.evictions == 1
+
+    path = str(tmp_path / "sessions.bin")
+    assert store.snapshot(path) == 3
+    # 成员检查不刷新访问时间，也不改变淘汰顺序
+    order = list(store._sessions)
+    assert "c" in store and list(store._sessions) == order and store._sessions["c"].last_access == 1000.0
+    # 最后一个会话ID被截断的快照
+    with open(path, "rb") as f:
+        (tmp_path / "short.bin").write_bytes(f.read()[:-1])
+    with pytest.raises(ValueError, match="不完整"):
+        SessionStore(ttl=60, clock=lambda: now[0]).restore(str(tmp_path / "short.bin"))
+    now[0] += 45                        # c 已有 75 秒未访问，a 和 d 为 45 秒
+    restored = SessionStore(ttl=60, clock=lambda: now[0])
+    assert restored.restore(path) == 2
+    assert restored.get("a").yes == first.yes and restored.get("a").answered == first.answered
+    assert "c" not in restored
+
+    now[0] += 61
+    assert store.expire() == 3 and len(store) == 0 and store.stats.expired == 3
+
+
+def test_session_store_restore_merges_by_access_time_before_expire(tmp_path):
+    """会话存储：恢复的会话按访问时间与现有会话合并，之后 expire() 能删除全部过期会话"""
+    now = [1000.0]
+    old = SessionStore(ttl=60, clock=lambda: now[0])
+    old.create("a")
+    now[0] += 10
+    old.create("b")
+    path = str(tmp_path / "sessions.bin")
+    old.snapshot(path)
+
+    now[0] += 20
+    store = SessionStore(ttl=60, max_bytes=3 * SESSION_BYTES, clock=lambda: now[0])
+    store.create("x")
+    now[0] += 5
+    store.create("y")
+    assert store.restore(path) == 2
+    assert list(store._sessions) == ["b", "x", "y"] and store.stats.evictions == 1
+
+    now[0] += 30                        # b 已有 55 秒未访问，x 和 y 未过期
+    assert store.expire() == 0
+    now[0] += 10
+    assert store.expire() == 1 and "b" not in store and len(store) == 2
+
+
+def test_results_store_queries_match_python_aggregates(tmp_path):
+    """列式结果存储：重新打开后分组、过滤和趋势查询与逐条统计一致，未提交的数据被截掉，无效的追加被拒绝"""
+    results = [score_test(answers) for answers in _random_answer_dicts(300, seed=11)]
+    timestamps = [1_700_000_000 + i * 3600 for i in range(len(results))]
+    store = ResultsStore(str(tmp_path / "db"))
+    store.append_results(results[:200], timestamps[:200], cohort="A")
+    matrix = answers_to_matrix(_random_answer_dicts(300, seed=11)[200:])
+    store.append_batch(score_batch(matrix), np.array(timestamps[200:]), cohort="B")
+    with open(tmp_path / "db" / "timestamp.i64", "ab") as f:
+        f.write(b"partial")
+
+    store = ResultsStore(str(tmp_path / "db"))
+    assert len(store) == 300
+    cohorts = ["A"] * 200 + ["B"] * 100
+
+    distribution = store.type_code_distribution(chunk_rows=64)
+    for cohort in ("A", "B"):
+        expected = {}
+        for result, c in zip(results, cohorts):
+            if c == cohort:
+                expected[result.type_combination] = expected.get(result.type_combination, 0) + 1
+        assert distribution[cohort] == expected
+
+    start = timestamps[150]
+    selected = [r for r, c, t in zip(results, cohorts, timestamps) if c == "A" and t >= start]
+    means = store.mean_percentages(cohort="A", start=start, chunk_rows=64)
+    for code in TYPE_CODES:
+        expected = sum(r.percentages[code] for r in selected) / len(selected)
+        assert abs(means[code] - expected) < 1e-9
+    assert store.count(cohort="A", start=start) == len(selected)
+
+    trend = store.trend(86400, chunk_rows=64)
+    assert trend["count"].sum() == 300
+    day = trend["start"][0]
+    first_day = [r for r, t in zip(results, timestamps) if day <= t < day + 86400]
+    assert trend["count"][0] == len(first_day)
+    share = sum(r.primary_type == "R" for r in first_day) / len(first_day)
+    assert abs(trend["primary_share"][0][TYPE_CODES.index("R")] - share) < 1e-12
+
+    scores = np.zeros((2, len(TYPE_CODES)))
+    for top_types in ([[0, 1, 2], [3, 3, 4]], [[0, 1, 6], [0, 1, 2]], [[-1, 1, 2], [0, 1, 2]]):
+        with pytest.raises(ValueError):
+            store.append(scores, top_types, timestamps[0])
+    # 超出 0-255 的得分不能按 uint8 回绕写入；其他题库的结果不能混入
+    for bad in (256, -1):
+        with pytest.raises(ValueError):
+            store.append(np.full((2, len(TYPE_CODES)), bad), [[0, 1, 2], [3, 4, 5]], timestamps[0])
+    with pytest.raises(ValueError):
+        store.append_results([results[0], replace(results[1], bank_version="0" * 16)], timestamps[0])
+    with pytest.raises(ValueError):
+        store.append_batch(replace(score_batch(matrix[:2]), bank_version="0" * 16), timestamps[0])
+    assert len(store) == 300 and store.trend(86400)["count"].sum() == 300
+
+
+def test_population_norms_merge_percentiles_and_batch_cli(tmp_path):
+    """人群常模：批量统计与逐个更新一致，多进程合并结果与单进程相同，百分位为中位秩"""
+    sheets = _random_answer_dicts(80, seed=12)
+    results = [score_test(answers) for answers in sheets]
+    single = PopulationNorms()
+    for result in results:
+        single.update(result, cohort="A")
+    batched = PopulationNorms()
+    batched.update_batch(score_batch(answers_to_matrix(sheets)).scores, cohort="A")
+    assert batched.to_dict() == single.to_dict()
+
+    scores = [r.scores["S"] for r in results]
+    target = results[0].scores["S"]
+    expected = (sum(s < target for s in scores) + sum(s == target for s in scores) / 2) / len(scores) * 100
+    assert abs(single.percentile("S", target, cohort="A") - expected) < 1e-9
+    assert single.percentiles(results[0]) == single.percentiles(results[0], cohort="A")
+
+    source = tmp_path / "answers.jsonl"
+    with open(source, "w", encoding="utf-8") as f:
+        for answers in sheets:
+            f.write(json.dumps({"answers": [int(answers[q.id]) for q in QUESTIONS]}) + "\n")
+    norms_path = str(tmp_path / "norms.json")
+    batch.run(str(source), str(tmp_path / "out.jsonl"), None, None, jobs=2, chunk_size=9,
+              norms_path=norms_path)
+    merged = PopulationNorms.load(norms_path)
+    assert merged.total() == len(sheets)
+    assert np.array_equal(merged.percentile_matrix([[5] * 6]), single.percentile_matrix([[5] * 6]))
+
+    report = generate_professional_report(results[0], norms=merged)
+    assert f"常模百分位（与{len(sheets)}名测试者相比）：" in report
+
+
+def test_psychometrics_matches_direct_formulas_and_streaming():
+    """信度分析：α 和校正题总相关与直接按定义计算一致，分块（压缩格式）与一次计算一致"""
+    rng = np.random.default_rng(13)
+    trait = rng.normal(size=(2000, len(TYPE_CODES)))
+    columns = np.array([TYPE_CODES.index(t) for t in QUESTION_BANK.types])
+    matrix = (rng.random((2000, len(QUESTIONS))) < 1 / (1 + np.exp(-trait[:, columns]))).astype(np.uint8)
+
+    report = analyze(matrix)
+    data = matrix.astype(float)
+    for code in TYPE_CODES:
+        cols = [QUESTION_BANK.index_of[qid] for qid in QUESTION_BANK.ids_by_type[code]]
+        scale = data[:, cols]
+        k = len(cols)
+        alpha = k / (k - 1) * (1 - scale.var(axis=0, ddof=1).sum() / scale.sum(axis=1).var(ddof=1))
+        assert abs(report.alpha[code] - alpha) < 1e-9
+        for col in cols[:3]:
+            rest = scale.sum(axis=1) - data[:, col]
+            assert abs(report.item_total_correlation[col] - np.corrcoef(data[:, col], rest)[0, 1]) < 1e-9
+    totals = data @ scorer.get_incidence_matrix()
+    assert np.allclose(report.scale_correlations, np.corrcoef(totals, rowvar=False))
+    first = QUESTIONS[0]
+    assert report.items[first.type][first.category][0].question_id == first.id
+
+    streamed = analyze_chunks(pack_matrix(matrix[i:i + 300]) for i in range(0, 2000, 300))
+    assert np.allclose(streamed.item_total_correlation, report.item_total_correlation)
+    assert np.allclose(streamed.endorsement, matrix.mean(axis=0))
+
+
+def test_irt_calibration_recovers_parameters_and_scores_theta(tmp_path):
+    """IRT：由已知 2PL 参数模拟的答卷可还原题目参数，θ 估计与查表结果一致，参数文件带题库版本"""
+    rng = np.random.default_rng(14)
+    a = rng.lognormal(0, 0.3, len(QUESTIONS))
+    b = rng.normal(0, 1, len(QUESTIONS))
+    columns = np.array([TYPE_CODES.index(t) for t in QUESTION_BANK.types])
+    theta = rng.normal(size=(20000, len(TYPE_CODES)))
+    matrix = (rng.random((20000, len(QUESTIONS))) < 1 / (1 + np.exp(-a * (theta[:, columns] - b)))).astype(np.uint8)
+
+    model = calibrate(matrix)
+    assert np.abs(model.discrimination - a).max() < 0.2
+    assert np.abs(model.difficulty - b).max() < 0.2
+
+    estimate, se = model.theta_matrix(pack_matrix(matrix[:2000]))
+    assert np.corrcoef(estimate[:, 0], theta[:2000, 0])[0, 1] > 0.85
+    assert ((se > 0.2) & (se < 1.0)).all()
+
+    path = str(tmp_path / "irt.json")
+    model.save(path)
+    loaded = IRTModel.load(path)
+    assert np.allclose(loaded.discrimination, model.discrimination)
+
+    result = score_batch(matrix[:5]).to_result(0)
+    by_score, _ = loaded.theta_for_scores(score_batch(matrix[:5]).scores)
+    assert loaded.theta_for_result(result)["R"][0] == by_score[0, 0]
+    table, _ = loaded.summed_score_table("R")
+    assert (np.diff(table) > 0).all()
+
+
+def test_irt_calibration_bounds_items_everyone_answers_alike():
+    """IRT：全部答"是"或全部答"否"的题目参数截断在有限范围内，不影响同一量表中其他题目的标定"""
+    rng = np.random.default_rng(15)
+    a = rng.uniform(0.8, 2.0, 20)
+    b = rng.normal(0, 1, 20)
+    theta = rng.normal(size=(5000, 1))
+    responses = (rng.random((5000, 20)) < 1 / (1 + np.exp(-a * (theta - b)))).astype(np.uint8)
+    expected_a, expected_b, _, _ = calibrate_scale(responses)
+    responses[:, 0], responses[:, 1] = 1, 0
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        discrimination, difficulty, loglik, _ = calibrate_scale(responses)
+    assert np.isfinite(discrimination).all() and np.isfinite(difficulty).all() and np.isfinite(loglik)
+    assert difficulty[0] < -4 < 4 < difficulty[1]
+    assert np.abs(discrimination[2:] - expected_a[2:]).max() < 0.1
+    assert np.abs(difficulty[2:] - expected_b[2:]).max() < 0.1
+
+
+def test_synthetic_generator_is_reproducible_across_formats(tmp_path):
+    """合成答卷：同一种子下与分块和起始位置无关，各输出格式一致，潜在剖面决定主要类型"""
+    simulator = RespondentSimulator(seed=21)
+    matrix, theta = simulator.generate_with_theta(40000)
+    assert (RespondentSimulator(seed=21).generate(100, start=16000) == matrix[16000:16100]).all()
+    assert (np.concatenate(list(simulator.iter_chunks(40000))) == matrix).all()
+    assert (simulator.generate(40000, packed=True) == pack_matrix(matrix)).all()
+    assert not (RespondentSimulator(seed=22).generate(100) == matrix[:100]).all()
+    # θ 越高，该类型得分越高
+    scores = score_batch(matrix).scores
+    assert all(np.corrcoef(theta[:, i], scores[:, i])[0, 1] > 0.8 for i in range(len(TYPE_CODES)))
+
+    path = str(tmp_path / "answers.npy")
+    simulator.save_npy(path, 5000)
+    assert (np.load(path, mmap_mode="r") == pack_matrix(matrix[:5000])).all()
+
+    source, output = tmp_path / "answers.jsonl", tmp_path / "results.jsonl"
+    with open(source, "w", encoding="utf-8") as f:
+        simulator.write_jsonl(f, 300)
+    assert batch.main([str(source), "-o", str(output)]) == 0
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [row["type_combination"] for row in rows] == score_batch(matrix[:300]).type_combinations()
+
+    social = RespondentSimulator([LatentProfile((0, 0, 0, 2.5, 0, 0))], seed=1).generate(2000)
+    assert (score_batch(social).top_types[:, 0] == TYPE_CODES.index("S")).mean() > 0.75
+
+
+def test_screening_flags_invalid_sheets_and_skips_their_reports(tmp_path):
+    """质量筛查：全是、全否、交替、过快的答卷被标记并给出原因，批量模式下不为其生成报告"""
+    n = len(QUESTIONS)
+    normal = RespondentSimulator(seed=22).generate(200)
+    crafted = np.array([[1] * n, [0] * n, [i % 2 for i in range(n)], normal[0]], dtype=np.uint8)
+    seconds = np.full((4, n), np.nan)
+    seconds[3] = 0.3
+    result = screen(crafted, item_seconds=seconds)
+    assert result.reasons(0) == ["high_endorsement", "long_run", "flat_scales"]
+    assert result.reasons(1) == ["low_endorsement", "long_run", "flat_scales"]
+    assert result.reasons(2) == ["alternating"]
+    assert result.reasons(3) == ["too_fast"]
+    assert screen(normal).passed.mean() > 0.95
+    assert screen(crafted[:1], ScreeningThresholds(max_endorsement=1.01, max_run=n + 1)).reasons(0) == ["flat_scales"]
+
+    source, output = tmp_path / "answers.jsonl", tmp_path / "reports.jsonl"
+    with open(source, "w", encoding="utf-8") as f:
+        for i, row in enumerate(crafted.tolist()):
+            record = {"id": i, "answers": row}
+            if i == 3:
+                record["item_seconds"] = seconds[3].tolist()
+            f.write(json.dumps(record) + "\n")
+        f.write(json.dumps({"id": 4, "answers": normal[1].tolist(), "item_seconds": [3] * n}) + "\n")
+    assert batch.main([str(source), "-o", str(output), "--report", "professional", "--screen"]) == 0
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [row["screening"] for row in rows[2:]] == [["alternating"], ["too_fast"], []]
+    assert ["report" in row for row in rows] == [False, False, False, False, True]
+
+
+def test_importer_maps_headers_normalizes_tokens_and_packs(tmp_path):
+    """导入：自定义表头映射和取值、按列归一化、压缩输出与 pack_matrix 一致、错误行带行号"""
+    n = len(QUESTIONS)
+    matrix = RespondentSimulator(seed=23).generate(50)
+    spellings = [("是", "否"), ("Y", "n"), (" yes ", "No"), ("1", "0"), ("符合", "不符合")]
+    header = ["答卷编号"] + [f"第{qid}题" for qid in reversed(QUESTION_BANK.ids)]
+    source = tmp_path / "export.csv"
+    with open(source, "w", encoding="utf-8-sig", newline="") as f:
+        f.write(",".join(header) + "\n")
+        for i, row in enumerate(matrix.tolist()):
+            yes, no = spellings[i % len(spellings)]
+            f.write(",".join([f"r{i}"] + [yes if value else no for value in reversed(row)]) + "\n")
+        f.write(",".join(["bad1"] + ["是"] * (n - 1) + ["也许"]) + "\n")
+        f.write(",".join(["bad2"] + ["否"] * (n - 2)) + "\n")
+
+    config = ImportConfig(columns={f"第{qid}题": qid for qid in QUESTION_BANK.ids},
+                          id_column="答卷编号", tokens={"符合": True, "不符合": False})
+    result = import_answers(str(source), config)
+    assert result.ids == [f"r{i}" for i in range(50)]
+    assert np.array_equal(result.answers, matrix)
+    assert [(line, record_id) for line, record_id, _ in result.errors] == [(52, "bad1"), (53, "bad2")]
+    assert "也许" in result.errors[0][2] and "缺少答案" in result.errors[1][2]
+
+    packed = import_answers(str(source), config, packed=True)
+    assert np.array_equal(packed.answers, pack_matrix(matrix))
+    blocks = list(iter_blocks(str(source), config, block_rows=16))
+    assert np.array_equal(np.concatenate([block.answers for block in blocks]), matrix)
+    assert [error[0] for block in blocks for error in block.errors] == [52, 53]
+
+    with pytest.raises(ValueError, match="缺少"):
+        import_answers(str(source), ImportConfig(columns={"第1题": 1}))
+
+    # 空行被跳过，带引号的字段可跨行：错误行号为记录在文件中的实际起始行
+    gappy = tmp_path / "gappy.csv"
+    with open(gappy, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(["id"] + [str(qid) for qid in QUESTION_BANK.ids]) + "\n\n")      # 行 1-2
+        f.write(",".join(["ok1"] + ["1"] * n) + "\n\n\n")                                   # 行 3-5
+        f.write(",".join(['"bad\nid"'] + ["1"] * (n - 1) + ["?"]) + "\n")                 # 行 6-7
+        f.write(",".join(["ok2"] + ["0"] * n) + "\n\n")                                      # 行 8-9
+        f.write(",".join(["bad2"] + ["0"] * (n - 1)) + "\n")                                # 行 10
+    gappy_config = ImportConfig(id_column="id")
+    for block_rows in (1, 2, 65536):
+        blocks = list(iter_blocks(str(gappy), gappy_config, block_rows=block_rows))
+        errors = [error[:2] for block in blocks for error in block.errors]
+        assert errors == [(6, "bad\nid"), (10, "bad2")]
+        assert [record_id for block in blocks for record_id in block.ids] == ["ok1", "ok2"]
+
+
+def test_cold_import_stays_within_budget():
+    """冷启动：导入 main 不加载 numpy、报告和自适应模块，耗时在预算内；职业目录在首次访问时加载"""
+    timing = measure_import_time("holland_test.main", repeat=3)
+    assert not [name for name in DEFERRED_IMPORTS if name in timing.modules]
+    assert timing.total_ms <= IMPORT_BUDGET_MS, f"导入耗时 {timing.total_ms:.1f} ms 超出预算"
+
+    assert analysis.CAREER_SUGGESTIONS is analysis._catalogs()["CAREER_SUGGESTIONS"]
+    assert set(analysis.TYPE_DESCRIPTIONS) == set(TYPE_CODES)
+    assert analysis.get_type_combination("RI")["name"] == "现实-研究型"
+    assert analysis.get_type_combination("RR") is None
+    with pytest.raises(AttributeError):
+        analysis.NOT_A_CATALOG
+
+
+def test_question_banks_load_by_version_and_locale_through_compiled_index(tmp_path, monkeypatch):
+    """题库：按版本和语言加载，二进制索引往返一致且能识别过期，评分结果记录题库版本"""
+    assert ("v1", "zh-CN") in available_banks() and ("v1", "en") in available_banks()
+    assert (QUESTION_BANK.label, QUESTION_BANK.locale) == ("v1", "zh-CN")
+    english = load_question_bank("v1", "en")
+    assert english.same_layout(QUESTION_BANK) and english.version == QUESTION_BANK.version
+    assert load_question_bank("v1", "en") is english
+    # 版本哈希只取决于题目ID、类型、维度及顺序，与题目文本无关
+    reworded = build_question_bank([replace(q, text=q.text + "。") for q in QUESTIONS])
+    assert reworded.version == QUESTION_BANK.version
+    swapped = [replace(q, category="value" if q.category == "skill" else q.category) for q in QUESTIONS]
+    assert build_question_bank(swapped).version != QUESTION_BANK.version
+    assert build_question_bank(QUESTIONS[1:] + QUESTIONS[:1]).version != QUESTION_BANK.version
+
+    data = compile_bank_index(english, 123, 456)
+    restored = read_bank_index(data, 123, 456)
+    assert restored == english
+    assert read_bank_index(data, 124, 456) is None
+    # 截断或损坏的索引视为缓存未命中
+    for broken in (data[:len(data) // 2], data[:-3], data[:4] + b"\xff\xff\xff\x7f" + data[8:],
+                   data[:-10] + b"\xff" * 10):
+        assert read_bank_index(broken, 123, 456) is None
+
+    answers = {q.id: i % 3 == 0 for i, q in enumerate(QUESTIONS)}
+    default = score_test(answers)
+    assert default.bank_version == QUESTION_BANK.version
+    assert score_test(AnswerVector.from_dict(answers), bank=english) == replace(default, bank_version=english.version)
+
+    # 顺序和维度不同的自定义题库：评分按题目ID查找，批量评分的列按该题库的题目顺序
+    monkeypatch.setenv("HOLLAND_BANK_CACHE", str(tmp_path / "cache"))
+    items = [{"id": q.id, "type": q.type, "category": CATEGORIES[q.id % 4], "text": q.text}
+             for q in reversed(QUESTIONS)]
+    (tmp_path / "v2").mkdir()
+    (tmp_path / "v2" / "zh-CN.json").write_text(
+        json.dumps({"version": "v2", "locale": "zh-CN", "questions": items}, ensure_ascii=False), encoding="utf-8")
+    custom = load_question_bank("v2", "zh-CN", bank_dir=str(tmp_path))
+    index_file = Path(questions._index_cache_path("v2", "zh-CN", str(tmp_path)))
+    assert index_file.parent == tmp_path / "cache" and index_file.exists() and not custom.same_layout(QUESTION_BANK)
+    # 缓存文件名包含题库目录的哈希，其他目录中的同名题库不会读到这份索引
+    assert questions._index_cache_path("v2", "zh-CN", str(tmp_path / "other")) != str(index_file)
+    index_file.write_bytes(index_file.read_bytes()[:-20])
+    monkeypatch.delitem(questions._LOADED_BANKS, (str(tmp_path), "v2", "zh-CN"))
+    assert load_question_bank("v2", "zh-CN", bank_dir=str(tmp_path)) == custom
+    assert read_bank_index(index_file.read_bytes()) == custom
+    # 从缓存加载时保留内存映射，题目文本在访问时才解码
+    monkeypatch.delitem(questions._LOADED_BANKS, (str(tmp_path), "v2", "zh-CN"))
+    mapped = load_question_bank("v2", "zh-CN", bank_dir=str(tmp_path))
+    assert isinstance(mapped.questions, questions._IndexedQuestions) and mapped.questions._decoded == [None] * 120
+    assert mapped.question(custom.ids[5]) == custom.questions[5] and mapped.questions._decoded.count(None) == 119
+    assert mapped == custom and list(mapped.questions[-2:]) == list(custom.questions[-2:])
+
+    # 未设置 HOLLAND_BANK_CACHE 时写入用户缓存目录，不写入题库目录；设为空字符串时不写入磁盘
+    monkeypatch.delenv("HOLLAND_BANK_CACHE")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    (tmp_path / "v4").mkdir()
+    (tmp_path / "v4" / "en.json").write_text(json.dumps({"version": "v4", "locale": "en", "questions": items}),
+                                             encoding="utf-8")
+    assert load_question_bank("v4", "en", bank_dir=str(tmp_path)).same_layout(custom)
+    assert sorted(p.name for p in (tmp_path / "v4").iterdir()) == ["en.json"]
+    assert [p.parent for p in (tmp_path / "xdg").rglob("*.idx")] == [tmp_path / "xdg" / "holland_test"]
+    monkeypatch.setenv("HOLLAND_BANK_CACHE", "")
+    (tmp_path / "v5").mkdir()
+    (tmp_path / "v5" / "en.json").write_bytes((tmp_path / "v4" / "en.json").read_bytes())
+    before = sorted(p for p in tmp_path.rglob("*"))
+    assert load_question_bank("v5", "en", bank_dir=str(tmp_path)).same_layout(custom)
+    assert sorted(p for p in tmp_path.rglob("*")) == before
+    result = score_test(answers, bank=custom)
+    assert (result.scores, result.bank_version) == (default.scores, custom.version)
+    assert result.subscores["R"] == {
+        category: sum(answers[q["id"]] for q in items if q["type"] == "R" and q["category"] == category)
+        for category in CATEGORIES}
+    matrix = RespondentSimulator(seed=25).generate(100)
+    batch_result = score_batch(matrix[:, ::-1], bank=custom)
+    assert np.array_equal(batch_result.scores, score_batch(matrix).scores)
+    assert batch_result.to_result(0) == score_test(
+        dict(zip(custom.ids, map(bool, matrix[0, ::-1].tolist()))), bank=custom)
+
+    # 报告按结果的题库版本取各维度题目数，类型名称取自传入的题库（未传入时为该版本的默认语言），
+    # 缓存（含 SQLite）按题库版本和语言区分
+    english_result = score_test(answers, bank=english)
+    assert generate_professional_report(english_result) == generate_professional_report(default)
+    english_report = generate_professional_report(english_result, bank=english)
+    assert f"主导倾向：{english.type_names[english_result.primary_type]}" in english_report
+    assert f"\n{english.type_names['R']:<20} {english_result.scores['R']:<10} 20" in english_report
+    custom_counts = {c: sum(q["category"] == c for q in items if q["type"] == "R") for c in CATEGORIES}
+    custom_row = " ".join(f"{str(result.subscores['R'][c]) + '/' + str(custom_counts[c]):<10}" for c in CATEGORIES)
+    assert f"\n{QUESTION_BANK.type_names['R']:<20} {custom_row}" in generate_professional_report(result)
+    with pytest.raises(ValueError):
+        generate_summary_report(default, bank=custom)
+    cache = ReportCache(db_path=str(tmp_path / "reports.sqlite"))
+    for kind in ("professional", "summary"):
+        for item, bank in ((default, None), (english_result, english), (result, None)):
+            assert cache.get_report(item, kind, bank=bank) == REPORT_KINDS[kind](item, bank=bank)
+    assert len({report_key(default, "summary"), report_key(english_result, "summary", english),
+                report_key(result, "summary")}) == 3
+    cache.clear()
+    assert cache.get_report(english_result, "summary", bank=english) == generate_summary_report(english_result, english)
+    assert cache.stats.disk_hits == 1
+    cache.close()
+
+    (tmp_path / "v3").mkdir()
+    (tmp_path / "v3" / "en.json").write_text(json.dumps({"version": "v3", "locale": "en", "questions": [
+        {"id": 1, "type": "X", "text": "?"}]}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_question_bank("v3", "en", bank_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        load_question_bank("v9", "en")
+
+
+# 报告回归测试的固定输入：(名称, 第 i 题的答案)，覆盖单一主导类型、多类型同分和全部答"否"
+_GOLDEN_CASES = (
+    ("social", lambda i, q: q.type == "S" or (q.type in "EA" and i % 2 == 0) or i % 7 == 0),
+    ("tied", lambda i, q: q.type in "RIC" and i % 4 != 0),
+    ("none", lambda i, q: False),
+)
+_GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_reports")
+
+
+def _golden_reports():
+    """固定输入的 (文件名, 报告文本)"""
+    reports = []
+    for name, answer in _GOLDEN_CASES:
+        result = score_test({q.id: answer(i, q) for i, q in enumerate(QUESTIONS)})
+        reports.append((f"{name}.professional.txt", generate_professional_report(result)))
+        reports.append((f"{name}.summary.txt", generate_summary_report(result)))
+    return reports
+
+
+def test_reports_match_golden_output_under_any_hash_seed():
+    """报告与存档的输出逐字节一致（UPDATE_GOLDEN_REPORTS=1 时重新生成存档），且与进程的哈希种子无关"""
+    reports = _golden_reports()
+    if os.environ.get("UPDATE_GOLDEN_REPORTS"):
+        os.makedirs(_GOLDEN_DIR, exist_ok=True)
+        for filename, text in reports:
+            with open(os.path.join(_GOLDEN_DIR, filename), "w", encoding="utf-8", newline="\n") as f:
+                f.write(text)
+    for filename, text in reports:
+        with open(os.path.join(_GOLDEN_DIR, filename), "r", encoding="utf-8", newline="") as f:
+            assert text == f.read(), f"{filename} 与存档不一致"
+
+    # 集合、字典的迭代顺序随哈希种子变化，用不同种子的新进程生成同样的报告
+    digest = hashlib.sha256("".join(text for _, text in reports).encode("utf-8")).hexdigest()
+    script = ("import hashlib, test_holland_test as t; "
+              "print(hashlib.sha256(''.join(text for _, text in t._golden_reports()).encode('utf-8')).hexdigest())")
+    for seed in ("0", "12345"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        output = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(_GOLDEN_DIR), env=env,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        assert output == digest, f"PYTHONHASHSEED={seed} 时报告不同"